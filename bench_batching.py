@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import redis.asyncio as redis
+from dotenv import load_dotenv
+
+from src.network.batcher import OutboundBatcher, unpack
+from src.utils.stats import summarize
+
+load_dotenv()
+
+
+async def receive(r, channels, expected, ready, latencies):
+    """Suscribirse a los canales vecinos y medir envío -> recepción por mensaje"""
+    received = 0
+    async with r.pubsub() as pubsub:
+        await pubsub.subscribe(*channels)
+        ready.set()
+        while received < expected:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=5.0)
+            if message is None:
+                break
+            now = time.time()
+            for item in unpack(json.loads(message["data"])):
+                latencies.append((now - item["ts"]) * 1000)
+                received += 1
+    return received
+
+
+async def run(window_ms, r, neighbors, rate, messages, max_messages):
+    """Enviar `messages` mensajes chicos a `rate` por segundo repartidos entre los vecinos"""
+    ready = asyncio.Event()
+    latencies = []
+    receiver = asyncio.create_task(receive(r, neighbors, messages, ready, latencies))
+    await ready.wait()
+
+    publishes = 0
+
+    async def publish(neighbor, data, batch):
+        nonlocal publishes
+        publishes += 1
+        await r.publish(neighbor, data)
+        return True
+
+    batcher = None
+    if window_ms:
+        batcher = OutboundBatcher(publish, "bench.batch.origen", window=window_ms / 1000,
+                                  max_messages=max_messages)
+
+    started = time.monotonic()
+    for i in range(messages):
+        # Lazo abierto: cada mensaje sale a su hora prevista aunque el anterior se demore
+        delay = started + i / rate - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        neighbor = neighbors[i % len(neighbors)]
+        message = {"type": "message", "from": "bench.batch.origen", "to": neighbor, "hops": i, "ts": time.time()}
+        data = json.dumps(message).encode()
+        if batcher:
+            await batcher.add(neighbor, message, data)
+        else:
+            await publish(neighbor, data, [message])
+    if batcher:
+        await batcher.close()
+
+    received = await receiver
+    latency = summarize([round(v, 3) for v in latencies])
+    label = f"{window_ms} ms" if window_ms else "sin batch"
+    print(f"{label:>10}  {publishes:7} PUBLISH ({publishes / messages * 100:5.1f}%)  "
+          f"latencia p50 {latency.get('p50')} p99 {latency.get('p99')} max {latency.get('max')} ms  "
+          f"entregados {received}/{messages}")
+    return received == messages
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='PUBLISH ahorrados vs latencia agregada por ventana de batching')
+    parser.add_argument('--neighbors', '-n', type=int, default=4, help='Vecinos destino')
+    parser.add_argument('--rate', '-r', type=float, default=2000, help='Mensajes por segundo (total)')
+    parser.add_argument('--messages', '-m', type=int, default=10000)
+    parser.add_argument('--windows', default='0,1,2,5,10', help='Ventanas en ms (0 = sin batching)')
+    parser.add_argument('--max-messages', type=int, default=32)
+    args = parser.parse_args()
+
+    r = redis.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        password=os.getenv("REDIS_PASSWORD")
+    )
+    neighbors = [f"bench.batch.vecino{i}" for i in range(args.neighbors)]
+
+    ok = True
+    for window in args.windows.split(','):
+        ok = await run(float(window), r, neighbors, args.rate, args.messages, args.max_messages) and ok
+    await r.close()
+    print("OK" if ok else "FALTARON MENSAJES")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
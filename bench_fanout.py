@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import os
+import time
+
+import redis.asyncio as redis
+from dotenv import load_dotenv
+
+from src.network.fanout import LuaFanout
+
+load_dotenv()
+
+
+async def count_deliveries(r, channels, expected, ready, done):
+    """Suscribirse a los canales vecinos y contar lo recibido"""
+    received = 0
+    async with r.pubsub() as pubsub:
+        await pubsub.subscribe(*channels)
+        ready.set()
+        while received < expected:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=5.0)
+            if message is None:
+                break
+            received += 1
+    done.set_result(received)
+
+
+async def run(mode, r, node_id, neighbors, payload, floods):
+    """Publicar `floods` floods y verificar que cada vecino recibió todos"""
+    ready = asyncio.Event()
+    done = asyncio.get_running_loop().create_future()
+    expected = floods * len(neighbors)
+    counter = asyncio.create_task(count_deliveries(r, neighbors, expected, ready, done))
+    await ready.wait()
+
+    fanout = LuaFanout(r, node_id, mode=mode) if mode != "publish" else None
+    if fanout:
+        await fanout.load()
+        await fanout.sync_adjacency(neighbors)
+
+    started = time.perf_counter()
+    for _ in range(floods):
+        if fanout:
+            await fanout.publish(payload, neighbors)
+        else:
+            for neighbor in neighbors:
+                await r.publish(neighbor, payload)
+    elapsed = time.perf_counter() - started
+
+    received = await done
+    await counter
+    print(f"{mode:8} {floods / elapsed:10.0f} floods/s  {elapsed * 1000 / floods:7.3f} ms/flood  "
+          f"entregados {received}/{expected}")
+    return received == expected
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Compara flooding por vecino vs fan-out Lua en un redis-server local')
+    parser.add_argument('--neighbors', '-n', type=int, default=16, help='Grado del nodo')
+    parser.add_argument('--floods', '-f', type=int, default=2000)
+    parser.add_argument('--size', '-s', type=int, default=512, help='Bytes de payload')
+    args = parser.parse_args()
+
+    r = redis.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        password=os.getenv("REDIS_PASSWORD")
+    )
+    node_id = "bench.fanout.origen"
+    neighbors = [f"bench.fanout.vecino{i}" for i in range(args.neighbors)]
+    payload = "x" * args.size
+
+    ok = True
+    for mode in ("publish", "list", "set"):
+        ok = await run(mode, r, node_id, neighbors, payload, args.floods) and ok
+    await r.delete(f"adj:{node_id}")
+    await r.close()
+    print("OK" if ok else "FALTARON MENSAJES")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
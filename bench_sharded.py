@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import os
+import time
+
+from redis.asyncio.cluster import RedisCluster
+from dotenv import load_dotenv
+
+from src.network.cluster import ShardedPubSub, shard_channel
+
+load_dotenv()
+
+
+async def count_deliveries(sharded, channel, ready, counts):
+    """SSUBSCRIBE a un canal y contar lo recibido hasta que se cancele"""
+    async with sharded.pubsub() as pubsub:
+        await pubsub.subscribe(channel)
+        ready.release()
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if message is not None:
+                counts[channel] += 1
+
+
+async def publisher(sharded, channels, payload, deadline, concurrency):
+    sent = 0
+    while time.monotonic() < deadline:
+        batch = [channels[(sent + i) % len(channels)] for i in range(concurrency)]
+        await asyncio.gather(*(sharded.publish(channel, payload) for channel in batch))
+        sent += len(batch)
+    return sent
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Throughput de SPUBLISH por shard en un Redis Cluster')
+    parser.add_argument('--groups', '-g', type=int, default=8, help='Grupos (un hash tag por grupo)')
+    parser.add_argument('--nodes', '-n', type=int, default=4, help='Nodos por grupo')
+    parser.add_argument('--duration', '-d', type=float, default=10.0, help='Segundos de publicación')
+    parser.add_argument('--publishers', '-p', type=int, default=4)
+    parser.add_argument('--concurrency', '-c', type=int, default=16, help='Publicaciones en vuelo por publicador')
+    parser.add_argument('--size', '-s', type=int, default=256, help='Bytes de payload')
+    args = parser.parse_args()
+
+    password = os.getenv("REDIS_PASSWORD")
+    cluster = RedisCluster(
+        host=os.getenv("REDIS_HOST", "127.0.0.1"),
+        port=int(os.getenv("REDIS_PORT", 7000)),
+        password=password
+    )
+    await cluster.initialize()
+    sharded = ShardedPubSub(cluster, password)
+
+    channels = [
+        shard_channel(f"bench{g}.grupo{g}.nodo{n}")
+        for g in range(args.groups) for n in range(args.nodes)
+    ]
+    counts = dict.fromkeys(channels, 0)
+    ready = asyncio.Semaphore(0)
+    subscribers = [asyncio.create_task(count_deliveries(sharded, ch, ready, counts)) for ch in channels]
+    for _ in channels:
+        await ready.acquire()
+
+    payload = "x" * args.size
+    deadline = time.monotonic() + args.duration
+    sharded.started = time.monotonic()
+    sent = sum(await asyncio.gather(*(
+        publisher(sharded, channels, payload, deadline, args.concurrency)
+        for _ in range(args.publishers)
+    )))
+    elapsed = time.monotonic() - sharded.started
+    await asyncio.sleep(1.0)
+
+    for task in subscribers:
+        task.cancel()
+    await asyncio.gather(*subscribers, return_exceptions=True)
+
+    by_shard = {}
+    for channel in channels:
+        by_shard.setdefault(cluster.get_node_from_key(channel).name, []).append(channel)
+
+    print(f"{'shard':22} {'canales':>8} {'msg/s':>10} {'MB/s':>8}")
+    for shard, stats in sorted(sharded.stats().items()):
+        print(f"{shard:22} {len(by_shard.get(shard, [])):8} {stats['published'] / elapsed:10.0f} "
+              f"{stats['bytes'] / elapsed / 1e6:8.2f}")
+    received = sum(counts.values())
+    print(f"{'total':22} {len(channels):8} {sent / elapsed:10.0f}   entregados {received}/{sent}")
+    await cluster.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import json
+import os
+
+import redis.asyncio as redis
+from dotenv import load_dotenv
+
+from src.utils.churn import ChurnHarness, git_commit, make_schedule
+from src.utils.config_loader import load_config
+from src.utils.launcher import HeadlessLauncher
+
+load_dotenv()
+
+
+def print_result(result):
+    if result["converged"]:
+        status = f"reconvergió en {result['reconvergence_s']} s"
+    else:
+        status = f"NO reconvergió ({len(result['not_converged'])} nodos con rutas distintas)"
+    print(
+        f"{result['kind']:9} {result['target']:45} {status:40} "
+        f"control {result['control_messages']:6}  spf {result['spf_runs']:4}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Inyección de fallas y medición de reconvergencia')
+    parser.add_argument('--config', default='config/topo-redis-test.json', help='Archivo de topología')
+    parser.add_argument('--algorithm', '-a', default='lsr_simple', choices=['dijkstra', 'lsr', 'lsr_simple', 'planb'])
+    parser.add_argument('--events', type=int, default=5, help='Fallas a inyectar (cada una con su restauración)')
+    parser.add_argument('--kinds', default='kill,pause,link_down',
+                        help='Tipos de falla separados por coma: kill, pause, link_down')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=30.0, help='Segundos máximos de espera por evento')
+    parser.add_argument('--settle', type=float, default=1.0, help='Pausa entre eventos')
+    parser.add_argument('--stats-interval', type=float, default=0.5)
+    parser.add_argument('--blocker-key', default='churn:blocked')
+    parser.add_argument('--log-dir', default='logs')
+    parser.add_argument('--max-concurrent', type=int, default=16)
+    parser.add_argument('--output', default=None, help='Guardar los resultados en JSON')
+    args, node_args = parser.parse_known_args()
+
+    config = load_config(args.config)['config']
+    schedule = make_schedule(config, args.events, seed=args.seed, kinds=args.kinds.split(','))
+
+    r = redis.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        password=os.getenv("REDIS_PASSWORD")
+    )
+    # Los argumentos que no son del benchmark se pasan tal cual a main_redis.py
+    launcher = HeadlessLauncher(
+        r, args.algorithm,
+        extra_args=['--config', args.config, '--stats-interval', str(args.stats_interval),
+                    '--link-blocker', args.blocker_key, *node_args],
+        log_dir=args.log_dir, max_concurrent=args.max_concurrent
+    )
+    harness = ChurnHarness(r, launcher, config, blocker_key=args.blocker_key)
+
+    try:
+        await r.delete(args.blocker_key)
+        report = await launcher.start_all(list(config))
+        if report["failed"]:
+            print(f"Nodos que no arrancaron: {report['failed']}")
+            return
+        print(f"{len(config)} nodos listos, {len(schedule)} eventos (semilla {args.seed})")
+        results = await harness.run(schedule, timeout=args.timeout, settle=args.settle, report=print_result)
+    finally:
+        await harness.cleanup()
+        launcher.stop_all()
+        await r.close()
+
+    print("\nResumen por tipo de evento:")
+    for kind, summary in results["summary"].items():
+        print(f"  {kind}: {json.dumps(summary)}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "algorithm": args.algorithm,
+                "node_args": node_args,
+                "config": args.config,
+                "seed": args.seed,
+                "commit": git_commit(),
+                "schedule": schedule,
+                **results
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
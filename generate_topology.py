@@ -0,0 +1,63 @@
+import argparse
+import json
+import sys
+import time
+
+from src.utils.topology_generator import generate, parse_edge_list, rename_nodes, to_topo_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generador de topologías para pruebas de carga')
+    parser.add_argument('model', choices=['geometric', 'ba', 'grid', 'torus', 'hierarchical', 'edgelist'],
+                        help='Modelo de topología (edgelist importa el formato de topology_11_nodes.txt)')
+    parser.add_argument('--nodes', '-n', type=int, default=100, help='Cantidad de nodos')
+    parser.add_argument('--seed', '-s', type=int, default=0, help='Semilla (misma semilla = misma topología)')
+    parser.add_argument('--output', '-o', default=None, help='Archivo de salida (stdout por defecto)')
+    parser.add_argument('--prefix', default='sec30.grupo1.nodo', help='Prefijo de los nombres de nodo')
+    parser.add_argument('--weights', default='uniform',
+                        choices=['uniform', 'normal', 'exponential', 'constant', 'distance'],
+                        help='Distribución de los pesos')
+    parser.add_argument('--weight-low', type=int, default=1)
+    parser.add_argument('--weight-high', type=int, default=20)
+    parser.add_argument('--radius', type=float, default=None, help='Radio del modelo geométrico')
+    parser.add_argument('--m', type=int, default=2, help='Enlaces por nodo nuevo (Barabási–Albert)')
+    parser.add_argument('--groups', type=int, default=10, help='Grupos por sección (jerárquico)')
+    parser.add_argument('--sections', type=int, default=1, help='Secciones (jerárquico)')
+    parser.add_argument('--gateways', type=int, default=2, help='Nodos frontera por grupo (jerárquico)')
+    parser.add_argument('--input', '-i', default='topology_11_nodes.txt', help='Lista de aristas a importar')
+    parser.add_argument('--rename-prefix', default=None,
+                        help='Prefijo para los nodos importados (ej: sec30.grupo5.)')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.model == 'edgelist':
+        with open(args.input) as f:
+            adjacency = parse_edge_list(f.read())
+        if args.rename_prefix:
+            adjacency = rename_nodes(adjacency, args.rename_prefix)
+    else:
+        try:
+            adjacency = generate(
+                args.model, nodes=args.nodes, seed=args.seed,
+                weight_distribution=args.weights, weight_low=args.weight_low,
+                weight_high=args.weight_high, prefix=args.prefix,
+                radius=args.radius, m=args.m, groups=args.groups,
+                sections=args.sections, gateways=args.gateways
+            )
+        except ValueError as e:
+            parser.error(str(e))
+    elapsed = time.perf_counter() - started
+
+    output = json.dumps(to_topo_config(adjacency), separators=(', ', ': '))
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    edges = sum(len(neighbors) for neighbors in adjacency.values()) // 2
+    print(f"{len(adjacency)} nodos, {edges} enlaces generados en {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import json
+import os
+
+import redis.asyncio as redis
+from dotenv import load_dotenv
+
+from src.utils.config_loader import load_config
+from src.utils.loadgen import LoadGenerator, parse_schedule
+
+load_dotenv()
+
+
+def print_result(result):
+    latency = result["latency_ms"]
+    status = "" if "ok" not in result else ("  OK" if result["ok"] else "  FUERA DE LÍMITE")
+    print(
+        f"{result['rate']:9.1f} msg/s  enviados {result['sent']:6} ({result['achieved_rate']:.1f}/s)  "
+        f"entregados {result['delivered']:6}  pérdida {result['loss'] * 100:5.2f}%  "
+        f"p50 {latency.get('p50')} p99 {latency.get('p99')} max {latency.get('max')} ms{status}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Generador de carga de lazo abierto para la red Redis')
+    parser.add_argument('--config', default='config/topo-redis-test.json', help='Topología (nodos a usar)')
+    # Solo estos entregan mensajes de datos y publican el recibo; los demás
+    # tratan type "message" como actualización de aristas
+    parser.add_argument('--algorithm', '-a', default='flooding', choices=['flooding', 'lsr'],
+                        help='Algoritmo de los nodos (valor de "proto" en los mensajes)')
+    parser.add_argument('--schedule', default='50:10',
+                        help='Pasos tasa:segundos separados por coma, ej: "50:10,100:10,200:10"')
+    parser.add_argument('--find-max', action='store_true',
+                        help='Buscar la tasa máxima que cumple --p99-limit-ms y --loss-limit')
+    parser.add_argument('--start-rate', type=float, default=25.0)
+    parser.add_argument('--step-duration', type=float, default=10.0)
+    parser.add_argument('--p99-limit-ms', type=float, default=500.0)
+    parser.add_argument('--loss-limit', type=float, default=0.01, help='Fracción de mensajes perdidos aceptada')
+    parser.add_argument('--drain', type=float, default=5.0, help='Segundos para esperar recibos después de cada paso')
+    parser.add_argument('--size', type=int, default=64, help='Bytes de payload')
+    parser.add_argument('--poisson', action='store_true', help='Llegadas Poisson en vez de tasa constante')
+    parser.add_argument('--pool-size', type=int, default=32, help='Conexiones a Redis para publicar')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', default=None, help='Guardar los resultados en JSON')
+    args = parser.parse_args()
+
+    nodes = list(load_config(args.config)['config'].keys())
+    host = os.getenv("REDIS_HOST", "localhost")
+    port = int(os.getenv("REDIS_PORT", 6379))
+    password = os.getenv("REDIS_PASSWORD")
+
+    if os.getenv("REDIS_CLUSTER", "").lower() in ("1", "true"):
+        from redis.asyncio.cluster import RedisCluster
+        from src.network.cluster import ShardedPubSub, shard_channel
+        r = RedisCluster(host=host, port=port, password=password)
+        await r.initialize()
+        sharded = ShardedPubSub(r, password)
+        publish, subscribe, channel_for = sharded.publish, sharded.pubsub, shard_channel
+    else:
+        # Pool bloqueante: si todas las conexiones están ocupadas se espera en vez de abrir más
+        pool = redis.BlockingConnectionPool(
+            host=host, port=port, password=password, max_connections=args.pool_size
+        )
+        r = redis.Redis(connection_pool=pool)
+        publish, subscribe, channel_for = r.publish, r.pubsub, None
+
+    generator = LoadGenerator(
+        publish, subscribe, nodes, payload_size=args.size, seed=args.seed,
+        poisson=args.poisson, proto=args.algorithm, channel_for=channel_for
+    )
+    await generator.start()
+    print(f"Generador {generator.run_id}: {len(nodes)} nodos, recibos en {generator.ack_channel}")
+
+    try:
+        if args.find_max:
+            summary = await generator.find_max_rate(
+                args.start_rate, args.step_duration, args.p99_limit_ms, args.loss_limit,
+                drain=args.drain, report=print_result
+            )
+            print(f"\n{args.algorithm}: tasa máxima sostenible {summary['max_rate']} msg/s "
+                  f"(p99 <= {args.p99_limit_ms} ms, pérdida <= {args.loss_limit * 100}%)")
+            results = summary
+        else:
+            results = []
+            for step, (rate, duration) in enumerate(parse_schedule(args.schedule)):
+                result = await generator.run_step(rate, duration, drain=args.drain, step=step)
+                print_result(result)
+                results.append(result)
+    finally:
+        await generator.stop()
+        await r.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"algorithm": args.algorithm, "results": results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
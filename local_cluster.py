@@ -0,0 +1,71 @@
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import time
+
+# Redis Cluster local para pruebas: N instancias redis-server en puertos
+# consecutivos, cada una con su directorio en --dir
+
+
+def start(args):
+    os.makedirs(args.dir, exist_ok=True)
+    ports = [args.port + i for i in range(args.shards)]
+    for port in ports:
+        workdir = os.path.join(args.dir, str(port))
+        os.makedirs(workdir, exist_ok=True)
+        subprocess.run([
+            "redis-server",
+            "--port", str(port),
+            "--cluster-enabled", "yes",
+            "--cluster-config-file", "nodes.conf",
+            "--appendonly", "no",
+            "--save", "",
+            "--dir", workdir,
+            "--daemonize", "yes",
+            "--pidfile", os.path.join(workdir, "redis.pid"),
+            "--logfile", os.path.join(workdir, "redis.log"),
+        ], check=True)
+    time.sleep(0.5)
+
+    subprocess.run(
+        ["redis-cli", "--cluster", "create"]
+        + [f"127.0.0.1:{port}" for port in ports]
+        + ["--cluster-replicas", "0", "--cluster-yes"],
+        check=True
+    )
+    print(f"Cluster listo: REDIS_CLUSTER=1 REDIS_HOST=127.0.0.1 REDIS_PORT={args.port}")
+
+
+def stop(args):
+    if not os.path.isdir(args.dir):
+        return
+    for name in os.listdir(args.dir):
+        pidfile = os.path.join(args.dir, name, "redis.pid")
+        try:
+            with open(pidfile) as f:
+                os.kill(int(f.read()), signal.SIGTERM)
+        except (OSError, ValueError):
+            pass
+    time.sleep(0.5)
+    shutil.rmtree(args.dir, ignore_errors=True)
+    print("Cluster detenido")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Levanta un Redis Cluster local para probar pub/sub por shard')
+    parser.add_argument('action', choices=['start', 'stop'])
+    parser.add_argument('--shards', type=int, default=3, help='Instancias maestras')
+    parser.add_argument('--port', type=int, default=7000, help='Puerto de la primera instancia')
+    parser.add_argument('--dir', default='/tmp/redis-cluster')
+    args = parser.parse_args()
+
+    if args.action == 'start':
+        start(args)
+    else:
+        stop(args)
+
+
+if __name__ == '__main__':
+    main()
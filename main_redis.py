@@ -1,19 +1,61 @@
 import asyncio
+import signal
 import sys
 import argparse
-from src.utils.config_loader import load_config, get_node_addresses, get_neighbors
+from src.utils.config_loader import load_config, get_node_addresses, get_neighbors, get_hello_config
 from src.network.node_redis import RedisNode
 from src.algorithms.flooding import Flooding
 from src.algorithms.dijkstra import Dijkstra
 from src.algorithms.link_state import LinkStateRouter
 from src.algorithms.simple_slr import SimpleLSR
+from src.algorithms.planb import SimpleLSR as PlanBLSR
 
 async def main():
     parser = argparse.ArgumentParser(description='Nodo de red con Redis')
     parser.add_argument('node_id', help='ID del nodo (ej: sec30.grupo5.nodo5')
     parser.add_argument('--algorithm', '-a', default='flooding', 
-                        choices=['flooding', 'dijkstra', 'lsr', 'lsr_simple'],
+                        choices=['flooding', 'dijkstra', 'lsr', 'lsr_simple', 'planb'],
                         help='Algoritmo de enrutamiento a usar')
+    parser.add_argument('--send-rate', type=float, default=None,
+                        help='Mensajes por segundo hacia cada vecino (sin límite por defecto)')
+    parser.add_argument('--send-burst', type=float, default=None,
+                        help='Tamaño de ráfaga del token bucket por vecino')
+    parser.add_argument('--snapshot-dir', default=None,
+                        help='Directorio para snapshots del estado de routing (reinicio en caliente)')
+    parser.add_argument('--dynamic-costs', action='store_true',
+                        help='Anunciar costos medidos por RTT en vez de los configurados')
+    parser.add_argument('--cost-unit-ms', type=float, default=1.0,
+                        help='Milisegundos de RTT por unidad de costo')
+    parser.add_argument('--blob-threshold', type=int, default=None,
+                        help='Bytes a partir de los cuales el payload viaja como blob en Redis')
+    parser.add_argument('--blob-compress-threshold', type=int, default=None,
+                        help='Bytes a partir de los cuales el blob se comprime con zlib')
+    parser.add_argument('--route-stream', default=None,
+                        help='Stream de Redis para eventos de rutas, ej: "routes:{node}"')
+    parser.add_argument('--learning', action='store_true',
+                        help='Flooding con aprendizaje hacia atrás (converge a unicast)')
+    parser.add_argument('--fanout', choices=['list', 'set'], default=None,
+                        help='Hacer el flooding con un script Lua en Redis (un round trip por flood)')
+    parser.add_argument('--areas', action='store_true',
+                        help='LSR por áreas (secXX.grupoY): LSAs solo dentro del área y resúmenes entre áreas')
+    parser.add_argument('--config', default='config/topo-redis-test.json',
+                        help='Archivo de topología')
+    parser.add_argument('--watch-config', action='store_true',
+                        help='Aplicar en caliente los cambios del archivo de topología')
+    parser.add_argument('--topology-key', default=None,
+                        help='Hash de Redis con la adyacencia por nodo (campo = id, valor = JSON)')
+    parser.add_argument('--stats-interval', type=float, default=None,
+                        help='Publicar el estado del nodo en el hash stats:<nodo> cada N segundos')
+    parser.add_argument('--link-blocker', default=None,
+                        help='Set de Redis con enlaces cortados ("a|b") para inyectar fallas')
+    parser.add_argument('--loop-monitor-interval', type=float, default=None,
+                        help='Medir el atraso del event loop cada N segundos (mínimo 1)')
+    parser.add_argument('--batch-window-ms', type=float, default=None,
+                        help='Juntar los mensajes a un mismo vecino durante N ms en un solo PUBLISH')
+    parser.add_argument('--batch-max-messages', type=int, default=None,
+                        help='Mensajes por sobre antes de publicar sin esperar la ventana (32 por defecto)')
+    parser.add_argument('--cluster', action='store_true',
+                        help='Usar Redis Cluster con pub/sub por shard (SPUBLISH/SSUBSCRIBE)')
     
     args = parser.parse_args()
     node_id = args.node_id
@@ -21,21 +63,24 @@ async def main():
     
     # Cargar configuración
     try:
-        topo_config = load_config('config/topo-redis-test.json')
+        topo_config = load_config(args.config)
     except Exception as e:
         print(f"Error cargando configuración: {e}")
         return
     
     # Obtener información del nodo
     neighbors = get_neighbors(topo_config, node_id)
+    hello_config = get_hello_config(topo_config, node_id)
     
     # Crear algoritmo de routing
     if algorithm_name == 'flooding':
-        routing_algorithm = Flooding()
+        routing_algorithm = Flooding(learning=args.learning)
     elif algorithm_name == 'lsr':
-        routing_algorithm = LinkStateRouter()
+        routing_algorithm = LinkStateRouter(areas=args.areas)
     elif algorithm_name == 'lsr_simple':
         routing_algorithm = SimpleLSR()  # el nuevo
+    elif algorithm_name == 'planb':
+        routing_algorithm = PlanBLSR()
     elif algorithm_name == 'dijkstra':
         routing_algorithm = Dijkstra() 
     else:
@@ -44,13 +89,31 @@ async def main():
 
     print(f"{neighbors}")
     # Crear el nodo
-    node = RedisNode(node_id, neighbors, routing_algorithm)
+    node = RedisNode(node_id, neighbors, routing_algorithm,
+                     send_rate=args.send_rate, send_burst=args.send_burst,
+                     hello_config=hello_config, snapshot_dir=args.snapshot_dir,
+                     dynamic_costs=args.dynamic_costs, cost_unit_ms=args.cost_unit_ms,
+                     blob_threshold=args.blob_threshold,
+                     blob_compress_threshold=args.blob_compress_threshold,
+                     route_stream=args.route_stream, fanout=args.fanout,
+                     cluster=args.cluster, config_path=args.config,
+                     watch_config=args.watch_config, topology_key=args.topology_key,
+                     stats_interval=args.stats_interval, link_blocker_key=args.link_blocker,
+                     loop_monitor_interval=args.loop_monitor_interval,
+                     batch_window_ms=args.batch_window_ms, batch_max_messages=args.batch_max_messages)
     
     # PARA DIJKSTRA: Ahora que el algoritmo tiene referencia al nodo (seteada en RedisNode.__init__),
     # podemos calcular las rutas
     if algorithm_name == 'dijkstra':
         routing_algorithm.calculate_routes()
     
+    # SIGTERM (launcher headless, kill): cerrar ordenadamente como con Ctrl+C
+    main_task = asyncio.current_task()
+    def terminate():
+        node.running = False
+        main_task.cancel()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, terminate)
+
     try:
         await node.start()
         print(f"Nodo {node_id} iniciado. Vecinos: {list(neighbors.keys())}")
@@ -61,6 +124,8 @@ async def main():
             
     except KeyboardInterrupt:
         print("Interrupción recibida, cerrando nodo")
+    except asyncio.CancelledError:
+        print("SIGTERM recibido, cerrando nodo")
     except Exception as e:
         print(f"Error iniciando nodo: {e}")
     finally:
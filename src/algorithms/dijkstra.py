@@ -1,13 +1,67 @@
 import heapq
 import json
-import asyncio
 from typing import Dict, List, Tuple
 
+
+def shortest_path_tree(graph: Dict[str, Dict[str, int]], source: str):
+    """Run Dijkstra from source keeping every equal-cost predecessor.
+
+    Returns (distances, predecessors, next_hops) where predecessors maps each
+    reachable node to the list of its equal-cost predecessors and next_hops
+    maps each destination to the sorted list of first hops that reach it at
+    minimum cost.
+    """
+    distances = {source: 0}
+    predecessors = {source: []}
+    settled = set()
+    order = []
+
+    priority_queue = [(0, source)]
+
+    while priority_queue:
+        current_distance, current_node = heapq.heappop(priority_queue)
+
+        if current_node in settled:
+            continue
+        settled.add(current_node)
+        order.append(current_node)
+
+        for neighbor, weight in graph.get(current_node, {}).items():
+            if neighbor in settled:
+                continue
+
+            distance = current_distance + weight
+            known = distances.get(neighbor)
+
+            if known is None or distance < known:
+                distances[neighbor] = distance
+                predecessors[neighbor] = [current_node]
+                heapq.heappush(priority_queue, (distance, neighbor))
+            elif distance == known and current_node not in predecessors[neighbor]:
+                predecessors[neighbor].append(current_node)
+
+    # Nodes are settled in distance order, so every predecessor already has
+    # its next hops resolved when we reach a node.
+    next_hops = {}
+    for node in order[1:]:
+        hops = set()
+        for predecessor in predecessors[node]:
+            if predecessor == source:
+                hops.add(node)
+            else:
+                hops.update(next_hops[predecessor])
+        next_hops[node] = sorted(hops)
+
+    return distances, predecessors, next_hops
+
+
 class Dijkstra:
     def __init__(self):
         self.node = None
         self.running = False
+        self.print_job = None
         self.graph = {}
+        self.next_hops = {}
         
     def set_node(self, node):
         self.node = node
@@ -33,79 +87,81 @@ class Dijkstra:
     def calculate_shortest_paths(self) -> Dict[str, Tuple[int, List[str]]]:
         """Calculate shortest paths from current node to all other nodes"""
         if self.node.node_id not in self.graph:
+            self.next_hops = {}
             return {}
-            
-        # Initialize distances and predecessors
-        distances = {node: float('infinity') for node in self.graph}
-        predecessors = {node: None for node in self.graph}
-        distances[self.node.node_id] = 0
-        
-        # Priority queue
-        priority_queue = [(0, self.node.node_id)]
-        
-        while priority_queue:
-            current_distance, current_node = heapq.heappop(priority_queue)
-            
-            if current_distance > distances[current_node]:
-                continue
-                
-            for neighbor, weight in self.graph[current_node].items():
-                distance = current_distance + weight
-                
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-                    predecessors[neighbor] = current_node
-                    heapq.heappush(priority_queue, (distance, neighbor))
-        
-        # Build paths
+
+        return self._paths_from_tree(shortest_path_tree(self.graph, self.node.node_id))
+
+    async def calculate_shortest_paths_async(self) -> Dict[str, Tuple[int, List[str]]]:
+        """Same as calculate_shortest_paths but runs SPF on the node's SPF executor"""
+        if self.node.node_id not in self.graph:
+            self.next_hops = {}
+            return {}
+
+        # build_graph_from_routing_table always builds a fresh dict, so it can
+        # be handed to the executor without another copy
+        tree = await self.node.spf_executor.compute(self.graph, self.node.node_id, snapshot=False)
+        if tree is None:
+            return None
+        return self._paths_from_tree(tree)
+
+    def _paths_from_tree(self, tree):
+        """Build one representative path per destination from an SPF tree"""
+        distances, predecessors, self.next_hops = tree
+
         paths = {}
-        for node in self.graph:
+        for node, distance in distances.items():
             if node == self.node.node_id:
                 continue
-                
-            if distances[node] == float('infinity'):
-                continue
-                
-            # Reconstruct path
+
             path = []
             current = node
             while current is not None:
                 path.insert(0, current)
-                current = predecessors[current]
-                
-            paths[node] = (distances[node], path)
-            
+                preds = predecessors[current]
+                current = preds[0] if preds else None
+
+            paths[node] = (distance, path)
+
         return paths
-    
-    async def print_shortest_paths_periodically(self):
-        """Periodically calculate and print shortest paths"""
-        while self.running:
-            await asyncio.sleep(15)  # Wait 15 seconds
-            
-            self.build_graph_from_routing_table()
-            paths = self.calculate_shortest_paths()
-            
-            # Format output
-            output = f"\nDIJKSTRA DEL NODO {self.node.node_id}:\n\n"
-            for target, (distance, path) in paths.items():
-                output += f"Camino más corto a {target} (distancia: {distance}):\n"
-                for node in path[1:]:  # Skip the first node (current node)
-                    output += f" -> pasar por {node}\n"
-                output += "\n"
-            
-            # Print to stdout (can be redirected to another terminal)
-            print(output, flush=True)
-    
+
+    async def print_shortest_paths(self):
+        """Recompute shortest paths and print only the routes that changed (every 15 seconds)"""
+        self.build_graph_from_routing_table()
+        paths = await self.calculate_shortest_paths_async()
+        if paths is None:
+            return  # Superseded by a newer computation
+
+        event = self.node.route_events.publish({
+            target: {"next_hops": self.next_hops[target], "cost": distance}
+            for target, (distance, path) in paths.items()
+        })
+        if event is None:
+            return
+
+        # Format output (only added/changed/removed destinations)
+        output = f"\nDIJKSTRA DEL NODO {self.node.node_id} (cambios #{event['seq']}):\n\n"
+        for target in list(event["added"]) + list(event["changed"]):
+            distance, path = paths[target]
+            output += f"Camino más corto a {target} (distancia: {distance}):\n"
+            for node in path[1:]:  # Skip the first node (current node)
+                output += f" -> pasar por {node}\n"
+            output += "\n"
+        for target in event["removed"]:
+            output += f"Sin ruta a {target}\n\n"
+
+        # Print to stdout (can be redirected to another terminal)
+        print(output, flush=True)
+
     async def start(self):
         """Start the Dijkstra algorithm"""
         self.running = True
         self.node.logger.info("Algoritmo Dijkstra iniciado")
         
-        # Start periodic printing
-        asyncio.create_task(self.print_shortest_paths_periodically())
-        
-        while self.running:
-            await asyncio.sleep(1)
+        # Periodic printing runs on the node scheduler
+        self.print_job = self.node.scheduler.call_every(15, self.print_shortest_paths, name="dijkstra_print")
     
     def shutdown(self):
-        self.running = False
\ No newline at end of file
+        self.running = False
+        if self.print_job:
+            self.print_job.cancel()
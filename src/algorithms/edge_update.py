@@ -0,0 +1,14 @@
+def announce_link_cost(node, neighbor, cost):
+    """Actualizar el costo de un enlace propio e inundarlo como arista (lsr_simple/planb)"""
+    own = node.routing_table.get(node.node_id, {})
+    if neighbor not in own:
+        return
+    own[neighbor]['weight'] = cost
+
+    message = {
+        "type": "message",
+        "from": node.node_id,
+        "to": neighbor,
+        "hops": cost
+    }
+    node.spawn(node.flood_message(message))
@@ -1,49 +1,147 @@
-import asyncio
 import time
+from collections import OrderedDict
+from src.utils.tracing import is_traced, record_receive, format_trace
+from src.network.messages import replace
 
 class Flooding:
-    def __init__(self):
+    def __init__(self, learning=False, max_learned=10000, learned_ttl=60):
         self.node = None
         self.seen_messages = set()
         self.running = False
+        self.report_job = None
+
+        # Aprendizaje hacia atrás: origen -> (vecino, ttl recibido, momento)
+        self.learning = learning
+        self.max_learned = max_learned
+        self.learned_ttl = learned_ttl
+        self.learned = OrderedDict()
+
+        # Métricas
+        self.stats = {"received": 0, "duplicates": 0, "flooded": 0, "unicast": 0}
 
     def set_node(self, node):
         self.node = node
 
     def handle_message(self, message):
+        self.stats["received"] += 1
+
         # Crear ID único para el mensaje
-        message_id = f"{message.get('from', '')}_{message.get('to', '')}_{message.get('payload', '')}_{message.get('timestamp', 0)}"
+        payload_key = message.get('payload', message.get('payload_ref', {}).get('hash', ''))
+        message_id = f"{message.get('from', '')}_{message.get('to', '')}_{payload_key}_{message.get('timestamp', 0)}"
     
         # Verificar si ya se vio este mensaje
         if message_id in self.seen_messages:
+            self.stats["duplicates"] += 1
             self.node.logger.info(f" MENSAJE DUPLICADO, IGNORADO: {message.get('payload')}")
             return
         
         self.seen_messages.add(message_id)
+
+        if is_traced(message):
+            message = record_receive(message, self.node.node_id, self.node.last_receive_ts)
         
+        # Vecino que nos entregó el mensaje (from es el origen)
+        via = message.get('via')
+        if self.learning and via in self.node.neighbors:
+            self._learn(message.get('from'), via, message.get('ttl', 10))
+
         # Manejar TTL
         ttl = message.get('ttl', 10) - 1
         if ttl <= 0:
             self.node.logger.debug("TTL agotado")
             return
         
-        message['ttl'] = ttl
+        # Copia con el TTL nuevo: el mensaje recibido no se modifica
+        message = replace(message, ttl=ttl)
         
         # Verificar si es para este nodo
         if message.get('to') == self.node.node_id:
-            self.node.logger.info(f"MENSAJE RECIBIDO, LLEGO AL DESTINO: {message.get('payload')}")
+            self.node.acknowledge(message)
+            if "payload_ref" in message:
+                self.node.spawn(self._deliver_blob(message))
+            else:
+                self.node.logger.info(f"MENSAJE RECIBIDO, LLEGO AL DESTINO: {message.get('payload')}")
+            if is_traced(message):
+                self.node.logger.info(format_trace(message))
         else:
-            # Reenviar a todos los vecinos excepto al remitente
-            asyncio.create_task(
-                self.node.flood_message(message, exclude_neighbor=message.get('from'))
-            )
+            arrived_from = via or message.get('from')
+            next_hop = self._lookup(message.get('to')) if self.learning else None
+            if next_hop is not None and next_hop != arrived_from:
+                self.stats["unicast"] += 1
+                self.node.spawn(self._forward_learned(message, next_hop, arrived_from))
+            else:
+                # Reenviar a todos los vecinos excepto al que lo entregó
+                self.stats["flooded"] += 1
+                self.node.spawn(
+                    self.node.flood_message(message, exclude_neighbor=arrived_from)
+                )
+
+    def _learn(self, origin, neighbor, ttl):
+        """Aprender que origin se alcanza por neighbor (más TTL = menos saltos)"""
+        if not origin or origin == self.node.node_id:
+            return
+        now = time.monotonic()
+        entry = self.learned.get(origin)
+        if (entry is None or entry[0] == neighbor or ttl > entry[1]
+                or now - entry[2] > self.learned_ttl):
+            self.learned[origin] = (neighbor, ttl, now)
+            self.learned.move_to_end(origin)
+            if len(self.learned) > self.max_learned:
+                self.learned.popitem(last=False)
+
+    def _lookup(self, destination):
+        """Vecino aprendido para destination, o None si no hay o expiró"""
+        entry = self.learned.get(destination)
+        if entry is None:
+            return None
+        neighbor, _, learned_at = entry
+        if time.monotonic() - learned_at > self.learned_ttl or neighbor not in self.node.neighbors:
+            # Expiró: volver a flooding hasta reaprender
+            del self.learned[destination]
+            return None
+        return neighbor
+
+    async def _forward_learned(self, message, neighbor, arrived_from):
+        """Unicast por el vecino aprendido; si falla se olvida y se hace flooding.
+
+        Un PUBLISH sin suscriptores (vecino caído) cuenta como falla; con
+        límite de tasa se espera a que el mensaje salga de la cola.
+        """
+        if await self.node.send_message(message, neighbor, confirm=True):
+            return
+        self.learned.pop(message.get('to'), None)
+        self.stats["flooded"] += 1
+        await self.node.flood_message(message, exclude_neighbor=arrived_from)
+
+    async def _deliver_blob(self, message):
+        """Descargar un payload grande solo en el destino final"""
+        payload = await self.node.resolve_payload(message)
+        if payload is None:
+            self.node.logger.warning(f"Blob expirado: {message['payload_ref']['hash']}")
+            return
+        self.node.logger.info(
+            f"MENSAJE RECIBIDO, LLEGO AL DESTINO: {len(payload)} bytes "
+            f"({bytes(payload[:80]).decode(errors='replace')}...)"
+        )
+
+    def export_state(self):
+        """Mensajes vistos (deduplicación) para el snapshot"""
+        return {"seen_messages": list(self.seen_messages)}
+
+    def import_state(self, state):
+        self.seen_messages.update(state["seen_messages"])
 
     async def start(self):
         self.running = True
-        self.node.logger.info("Algoritmo de flooding iniciado")
-        
-        while self.running:
-            await asyncio.sleep(1)
+        self.node.logger.info(
+            "Algoritmo de flooding iniciado" + (" (con aprendizaje)" if self.learning else "")
+        )
+        self.report_job = self.node.scheduler.call_every(60, self._report_stats, name="flooding_stats")
+
+    def _report_stats(self):
+        self.node.logger.info(f"Flooding: {self.stats}, aprendidos: {len(self.learned)}")
 
     def shutdown(self):
-        self.running = False
\ No newline at end of file
+        self.running = False
+        if self.report_job:
+            self.report_job.cancel()
\ No newline at end of file
@@ -1,34 +1,98 @@
-import heapq
-import asyncio
 import time
 from src.utils.logger import setup_logger
-from src.algorithms.dijkstra import Dijkstra
+from src.utils.flow_hash import select_next_hop
+from src.utils.tracing import is_traced, record_receive, format_trace
+from src.network.fib import ForwardingTable, area_of
+from src.algorithms.dijkstra import Dijkstra, shortest_path_tree
 
 class LinkStateRouter:
-    def __init__(self):
+    # Segundos para revalidar lo restaurado de un snapshot (dos LSAs periódicas)
+    stale_timeout = 720
+
+    def __init__(self, areas=False, area_depth=2):
         self.node = None
         self.lsa_seen = set()
         self.topology = {}
+        # LSDB: última LSA de cada origen; "seq" ordena las versiones
+        self.lsdb = {}
+        self.synced_neighbors = set()
         self.routing_table = {}
+
+        # Modo por áreas: LSAs completas solo dentro del área (prefijo del
+        # id, ej: "sec30.grupo5") y resúmenes por área entre áreas
+        self.areas = areas
+        self.area_depth = area_depth
+        self.area = None
+        self.area_table = {}
+        self.area_summaries = {}     # borde del área -> {área: [costo, camino]}
+        self.foreign_summaries = {}  # vecino de otra área -> {área: [costo, camino]}
+        self.summary_seq = {}        # origen -> último seq visto
+        self.sent_summaries = {}     # destino ("area" o vecino) -> último contenido enviado
+        self.last_tree = None
+
+        self.fib = ForwardingTable(area_of=self.area_of if areas else None)
+        self.stale_origins = set()
+        self.spf_task = None
+        self.routes_dirty = False
         self.logger = setup_logger("LSR")
         self.running = True
+        self.refresh_job = None
+        self.hello_job = None
         self.dijkstra = Dijkstra()
 
     def set_node(self, node):
         self.node = node
+        if self.areas:
+            self.area = self.area_of(node.node_id)
+
+    def area_of(self, node_id):
+        return area_of(node_id, self.area_depth)
+
+    def _flood_scope(self):
+        """Vecinos a los que se inundan las LSAs (los de la misma área en modo áreas)"""
+        if not self.areas:
+            return None
+        return [n for n in self.node.neighbors if self.area_of(n) == self.area]
 
     async def send_lsa(self):
         """Enviar LSA de este nodo a todos los vecinos"""
+        neighbors = {n: self.node.get_link_cost(n) for n in self.node.neighbors}
+        seq = time.time_ns()
         lsa = {
             "type": "lsa",
             "from": self.node.node_id,
-            "neighbors": self.node.neighbors,
+            "neighbors": neighbors,
             "timestamp": int(time.time()),
-            "id": f"{self.node.node_id}_{int(time.time())}"
+            "seq": seq,
+            "id": f"{self.node.node_id}_{seq}"
         }
         self.lsa_seen.add(lsa["id"])
+        self.lsdb[self.node.node_id] = lsa
+
+        # La propia adyacencia también forma parte de la RIB
+        if self.topology.get(self.node.node_id) != neighbors:
+            self.topology[self.node.node_id] = neighbors
+            self.request_routes()
+
         self.logger.info(f"Enviando LSA: {lsa}")
-        await self.node.flood_message(lsa)
+        await self.node.flood_message(lsa, neighbors=self._flood_scope())
+        if self.areas:
+            await self.send_summaries(force=True)
+
+    def on_link_cost_change(self, neighbor, cost):
+        """Costo medido (RTT) cambió más allá de la histéresis: nueva LSA"""
+        self.node.spawn(self.send_lsa())
+
+    def on_neighbors_changed(self, added, removed, changed):
+        """Topología recargada: una sola LSA nueva y sincronizar con los vecinos nuevos"""
+        for neighbor in removed:
+            self.synced_neighbors.discard(neighbor)
+            self.sent_summaries.pop(neighbor, None)
+            self.foreign_summaries.pop(neighbor, None)
+        self.node.spawn(self.send_lsa())
+        for neighbor in added:
+            self.synced_neighbors.add(neighbor)
+            self.node.spawn(self.send_dbd(neighbor))
 
     async def handle_message_async(self, message):
         """Maneja los mensajes recibidos según su tipo"""
@@ -36,8 +100,18 @@ class LinkStateRouter:
 
         if msg_type == "lsa":
             await self.handle_lsa(message)
+        elif msg_type == "dbd":
+            await self.handle_dbd(message)
+        elif msg_type == "lsreq":
+            await self.handle_lsreq(message)
+        elif msg_type == "lsu":
+            await self.handle_lsu(message)
+        elif msg_type == "summary" and self.areas:
+            await self.handle_summary(message)
         elif msg_type == "message":
             await self.handle_forwarding(message)
+        elif msg_type == "hello":
+            pass  # Solo sirven para medir RTT, eso lo hace RedisNode
         else:
             self.node.logger.debug(f"Ignorando mensaje de tipo {msg_type}")
 
@@ -48,86 +122,379 @@ class LinkStateRouter:
             return
 
         self.lsa_seen.add(lsa_id)
+        if not self._install_lsa(lsa):
+            return
+        await self.node.flood_message(
+            lsa, exclude_neighbor=lsa.get("from"), neighbors=self._flood_scope()
+        )
+
+    @staticmethod
+    def _lsa_seq(lsa):
+        # LSAs sin "seq" (versiones anteriores): ordenar por timestamp
+        return lsa.get("seq", lsa.get("timestamp", 0) * 10**9)
+
+    def _install_lsa(self, lsa):
+        """Guardar la LSA si es más nueva que la del LSDB; True si se instaló"""
         sender = lsa["from"]
         neighbors = lsa["neighbors"]
+        if self.areas and self.area_of(sender) != self.area:
+            return False
+        current = self.lsdb.get(sender)
+        if current is not None and self._lsa_seq(lsa) <= self._lsa_seq(current):
+            # La misma LSA que se restauró del snapshot: queda confirmada
+            if self._lsa_seq(lsa) == self._lsa_seq(current):
+                self.stale_origins.discard(sender)
+            return False
+        self.lsdb[sender] = {k: v for k, v in lsa.items() if k != "via"}
+        self.stale_origins.discard(sender)
 
-        self.topology[sender] = neighbors
-        self.node.logger.info(f"LSA recibida de {sender}: {neighbors}")
+        # LSA periódica sin cambios: no hace falta recalcular RIB ni FIB
+        if self.topology.get(sender) != neighbors:
+            self.topology[sender] = neighbors
+            self.node.logger.info(f"LSA recibida de {sender}: {neighbors}")
+            self.request_routes()
+        return True
 
-        self.calculate_routes()
-        await self.node.flood_message(lsa, exclude_neighbor=lsa.get("from"))
+    def on_neighbor_activity(self, neighbor):
+        """Primera señal de un vecino (o de vuelta tras reiniciar): sincronizar LSDB"""
+        if neighbor not in self.synced_neighbors:
+            self.synced_neighbors.add(neighbor)
+            self.node.spawn(self.send_dbd(neighbor))
 
-    def calculate_routes(self):
-        """Recalcula la tabla de rutas usando Dijkstra"""
-        if not self.topology:
+    def _sync_scope(self):
+        scope = self._flood_scope()
+        return list(self.node.neighbors) if scope is None else scope
+
+    async def send_dbd(self, neighbor):
+        """Enviar el resumen del LSDB: pares (origen, seq).
+
+        Tras un reinicio en caliente también van los orígenes restaurados
+        que siguen stale, para que el vecino los reenvíe aunque tenga el
+        mismo seq y así queden confirmados.
+        """
+        self.synced_neighbors.add(neighbor)
+        if neighbor not in self._sync_scope():
+            # Vecino de otra área: alcanza con reenviarle el resumen de áreas
+            self.sent_summaries.pop(neighbor, None)
+            await self.send_summaries()
             return
+        dbd = {
+            "type": "dbd",
+            "from": self.node.node_id,
+            "to": neighbor,
+            "digest": {origin: self._lsa_seq(lsa) for origin, lsa in self.lsdb.items()}
+        }
+        stale = sorted(origin for origin in self.stale_origins if origin in self.lsdb)
+        if stale:
+            dbd["stale"] = stale
+        await self.node.send_message(dbd, neighbor)
+
+    async def handle_dbd(self, dbd):
+        """Comparar el resumen del vecino con el LSDB propio.
+
+        Lo que el vecino no tiene o tiene más viejo se le manda de una vez
+        en un lsu; lo que nos falta se le pide en un lsreq.
+        """
+        neighbor = dbd["from"]
+        if neighbor not in self._sync_scope():
+            return
+        digest = dbd["digest"]
+        stale = set(dbd.get("stale", ()))
+
+        newer_here = [
+            lsa for origin, lsa in self.lsdb.items()
+            if self._lsa_seq(lsa) > digest.get(origin, -1)
+            or (origin in stale and self._lsa_seq(lsa) == digest.get(origin))
+        ]
+        missing_here = [
+            origin for origin, seq in digest.items()
+            if origin not in self.lsdb or seq > self._lsa_seq(self.lsdb[origin])
+        ]
+
+        if newer_here:
+            await self._send_lsu(neighbor, newer_here)
+        if missing_here:
+            await self.node.send_message({
+                "type": "lsreq",
+                "from": self.node.node_id,
+                "to": neighbor,
+                "origins": missing_here
+            }, neighbor)
+        # Con esto ambos lados quedan sincronizados: no hace falta un dbd de vuelta
+        self.synced_neighbors.add(neighbor)
+
+    async def handle_lsreq(self, lsreq):
+        lsas = [self.lsdb[origin] for origin in lsreq["origins"] if origin in self.lsdb]
+        if lsas:
+            await self._send_lsu(lsreq["from"], lsas)
+
+    async def _send_lsu(self, neighbor, lsas):
+        await self.node.send_message({
+            "type": "lsu",
+            "from": self.node.node_id,
+            "to": neighbor,
+            "lsas": lsas
+        }, neighbor)
+
+    async def handle_lsu(self, lsu):
+        """Instalar las LSAs recibidas en bloque e inundar las que eran nuevas"""
+        neighbor = lsu["from"]
+        for lsa in lsu["lsas"]:
+            self.lsa_seen.add(lsa.get("id"))
+            if self._install_lsa(lsa):
+                await self.node.flood_message(
+                    lsa, exclude_neighbor=neighbor, neighbors=self._flood_scope()
+                )
+
+    async def handle_summary(self, summary):
+        """Resumen de áreas alcanzables.
 
-        start_node = self.node.node_id
-        distances = {n: float('inf') for n in self.topology}
-        previous = {n: None for n in self.topology}
-        distances[start_node] = 0
+        Si viene de un borde de la propia área se guarda y se inunda dentro
+        del área; si viene de un vecino de otra área (enlace entre áreas) se
+        guarda sin reenviar.
+        """
+        origin = summary["from"]
+        if summary["seq"] <= self.summary_seq.get(origin, -1):
+            return
+        self.summary_seq[origin] = summary["seq"]
 
-        pq = [(0, start_node)]
+        if self.area_of(origin) == self.area:
+            if origin == self.node.node_id:
+                return
+            self.area_summaries[origin] = summary["reach"]
+            await self.node.flood_message(
+                summary, exclude_neighbor=summary.get("via"), neighbors=self._flood_scope()
+            )
+        elif origin in self.node.neighbors:
+            self.foreign_summaries[origin] = summary["reach"]
+        else:
+            return
+        self._install_area_routes()
+        await self.send_summaries()
 
-        while pq:
-            dist, current = heapq.heappop(pq)
-            if dist > distances[current]:
+    def _foreign_reach(self):
+        """Áreas alcanzables saliendo por enlaces propios: {área: (costo, camino, vecino)}"""
+        reach = {}
+        for neighbor in self.node.neighbors:
+            neighbor_area = self.area_of(neighbor)
+            if neighbor_area == self.area:
                 continue
+            cost = self.node.get_link_cost(neighbor)
+            candidates = [(neighbor_area, cost, [neighbor_area])]
+            for dest_area, (dest_cost, path) in self.foreign_summaries.get(neighbor, {}).items():
+                # Vector de áreas: descartar lo que vuelve a pasar por la nuestra
+                if dest_area == self.area or self.area in path:
+                    continue
+                candidates.append((dest_area, cost + dest_cost, [neighbor_area] + path))
+            for dest_area, total, path in candidates:
+                if dest_area not in reach or total < reach[dest_area][0]:
+                    reach[dest_area] = (total, path, neighbor)
+        return reach
+
+    def _install_area_routes(self):
+        """Rutas a otras áreas: distancia a cada borde + lo que ese borde anuncia"""
+        if self.last_tree is None:
+            return
+        distances, _, next_hops = self.last_tree
 
-            for neighbor, cost in self.topology.get(current, {}).items():
-                d = dist + cost
-                if d < distances[neighbor]:
-                    distances[neighbor] = d
-                    previous[neighbor] = current
-                    heapq.heappush(pq, (d, neighbor))
+        area_table = {}
 
-        self.routing_table = {}
-        for node in self.topology:
-            if node == start_node:
+        def offer(dest_area, cost, hops, path):
+            route = area_table.get(dest_area)
+            if route is None or cost < route["cost"]:
+                area_table[dest_area] = {"next_hops": list(hops), "cost": cost, "path": path}
+            elif cost == route["cost"]:
+                route["next_hops"] = sorted(set(route["next_hops"]) | set(hops))
+
+        for border, reach in self.area_summaries.items():
+            if border not in next_hops:
                 continue
+            for dest_area, (cost, path) in reach.items():
+                if dest_area != self.area:
+                    offer(dest_area, distances[border] + cost, next_hops[border], path)
+        for dest_area, (cost, path, neighbor) in self._foreign_reach().items():
+            offer(dest_area, cost, [neighbor], path)
+
+        self.area_table = area_table
+        self.fib.install(self.routing_table, self.area_table)
+        self._publish_routes()
+
+    async def send_summaries(self, force=False):
+        """Anunciar las áreas alcanzables (solo nodos borde, y solo si cambió algo)"""
+        foreign = [n for n in self.node.neighbors if self.area_of(n) != self.area]
+        if not foreign:
+            return
+
+        # Dentro del área: solo lo aprendido por enlaces propios a otras áreas
+        # (lo aprendido de otros bordes ya lo anuncian ellos)
+        internal = {area: [cost, path] for area, (cost, path, _) in self._foreign_reach().items()}
+        await self._send_summary("area", internal, force)
+
+        # Hacia cada vecino de otra área: todo lo conocido más el área propia
+        for neighbor in foreign:
+            neighbor_area = self.area_of(neighbor)
+            reach = {self.area: [0, []]}
+            for area, route in self.area_table.items():
+                if area != neighbor_area and neighbor_area not in route["path"]:
+                    reach[area] = [route["cost"], route["path"]]
+            await self._send_summary(neighbor, reach, force)
+
+    async def _send_summary(self, target, reach, force):
+        if not force and self.sent_summaries.get(target) == reach:
+            return
+        self.sent_summaries[target] = reach
+        summary = {
+            "type": "summary",
+            "from": self.node.node_id,
+            "area": self.area,
+            "reach": reach,
+            "seq": time.time_ns()
+        }
+        if target == "area":
+            await self.node.flood_message(summary, neighbors=self._flood_scope())
+        else:
+            await self.node.send_message(summary, target)
+
+    def calculate_routes(self):
+        """Recalcula la tabla de rutas usando Dijkstra (con ECMP) en el loop"""
+        if not self.topology:
+            return
+        self._install_routes(shortest_path_tree(self.topology, self.node.node_id))
 
+    def request_routes(self):
+        """Recalcular en el SPFExecutor sin bloquear el listener.
+
+        Hay como mucho un cálculo en curso: los pedidos que llegan mientras
+        tanto se juntan en uno solo sobre la topología más reciente.
+        """
+        self.routes_dirty = True
+        if self.spf_task is None or self.spf_task.done():
+            self.spf_task = self.node.spawn(self.recalculate_routes())
+
+    async def recalculate_routes(self):
+        while self.routes_dirty and self.topology:
+            self.routes_dirty = False
+            tree = await self.node.spf_executor.compute(self.topology, self.node.node_id)
+            if tree is not None:
+                self._install_routes(tree)
+
+    def _install_routes(self, tree):
+        """Construir la RIB desde el árbol de Dijkstra e instalar la FIB"""
+        self.last_tree = tree
+        distances, predecessors, next_hops = tree
+
+        routing_table = {}
+        for node, hops in next_hops.items():
+            # Camino representativo siguiendo el primer predecesor
             path = []
             cur = node
             while cur is not None:
                 path.append(cur)
-                cur = previous[cur]
+                preds = predecessors[cur]
+                cur = preds[0] if preds else None
             path.reverse()
 
-            if len(path) > 1:
-                self.routing_table[node] = {
-                    "next_hop": path[1],
-                    "cost": distances[node],
-                    "path": path
-                }
+            routing_table[node] = {
+                "next_hop": hops[0],
+                "next_hops": hops,
+                "cost": distances[node],
+                "path": path
+            }
 
-        self.node.logger.info(f"Tabla de routing recalculada: {self.routing_table}")
+        self.routing_table = routing_table
+        if self.areas:
+            # La distancia a los bordes cambió: recalcular también las áreas
+            self._install_area_routes()
+            self.node.spawn(self.send_summaries())
+            return
+        self.fib.install(self.routing_table)
+        self._publish_routes()
+
+    def _publish_routes(self):
+        routes = {
+            dest: {"next_hops": route["next_hops"], "cost": route["cost"]}
+            for dest, route in self.routing_table.items()
+        }
+        for area, route in self.area_table.items():
+            routes[f"{area}.*"] = {"next_hops": route["next_hops"], "cost": route["cost"]}
+        self.node.route_events.publish(routes)
 
-    def get_next_hop(self, destination):
-        """Obtiene el próximo salto para un destino"""
-        if destination in self.routing_table:
-            return self.routing_table[destination]['next_hop']
+    def get_next_hop(self, destination, message=None):
+        """Obtiene el próximo salto para un destino.
 
-        self.logger.warning(f"No hay ruta conocida para {destination}")
-        return None
+        Si hay varios caminos de igual costo se elige uno por hash del flujo
+        (from, to, flow_id) para mantener el orden dentro de cada flujo.
+        """
+        next_hops = self.fib.lookup(destination)
+        if next_hops is None:
+            return None
+        if message is None:
+            return next_hops[0]
+        return select_next_hop(next_hops, message, salt=self.node.node_id)
 
     async def handle_forwarding(self, message):
         """Encargado de reenviar o entregar mensajes"""
         destination = message.get("to")
-        self.calculate_routes()
+        if is_traced(message):
+            message = record_receive(message, self.node.node_id, self.node.last_receive_ts)
 
         if destination == self.node.node_id:
             if message.get("type") != "lsa":
-                self.node.logger.info(f"Mensaje recibido: {message.get('payload')}")
+                self.node.acknowledge(message)
+                payload = await self.node.resolve_payload(message)
+                if isinstance(payload, bytes):
+                    payload = f"{len(payload)} bytes"
+                self.node.logger.info(f"Mensaje recibido: {payload}")
+                if is_traced(message):
+                    self.node.logger.info(format_trace(message))
         else:
-            next_hop = self.get_next_hop(destination)
+            next_hop = self.get_next_hop(destination, message)
             if next_hop:
-                self.node.send_message(message, next_hop)
+                await self.node.send_message(message, next_hop)
                 self.node.logger.info(
                     f"Forwardeando mensaje a {next_hop} para {destination}"
                 )
             else:
                 self.node.logger.warning(f"No hay ruta para {destination}")
 
+    def export_state(self):
+        """Copia del LSDB, la tabla de rutas y los LSAs vistos para el snapshot"""
+        return {
+            "topology": {origin: dict(neighbors) for origin, neighbors in self.topology.items()},
+            # La LSA propia se vuelve a generar al arrancar, con un seq nuevo
+            "lsdb": {origin: dict(lsa) for origin, lsa in self.lsdb.items() if origin != self.node.node_id},
+            "routing_table": {dest: dict(route) for dest, route in self.routing_table.items()},
+            "lsa_seen": list(self.lsa_seen),
+            "area_table": {area: dict(route) for area, route in self.area_table.items()}
+        }
+
+    def import_state(self, state):
+        """Restaurar un snapshot; las entradas quedan stale hasta recibir su LSA"""
+        self.topology.update(state["topology"])
+        self.topology[self.node.node_id] = dict(self.node.neighbors)
+        self.lsa_seen.update(state["lsa_seen"])
+        # Con los seq restaurados el intercambio de dbd solo trae lo que cambió
+        for origin, lsa in state.get("lsdb", {}).items():
+            if origin != self.node.node_id:
+                self.lsdb.setdefault(origin, lsa)
+        self.stale_origins = (set(state["topology"]) | set(state.get("lsdb", {}))) - {self.node.node_id}
+
+        # Se reenvía de inmediato con la tabla guardada, sin esperar a Dijkstra
+        self.routing_table = state["routing_table"]
+        self.area_table = state.get("area_table", {}) if self.areas else {}
+        self.fib.install(self.routing_table, self.area_table)
+
+    def purge_stale(self):
+        """Eliminar los orígenes restaurados que nadie volvió a anunciar"""
+        if not self.stale_origins:
+            return
+        for origin in self.stale_origins:
+            self.topology.pop(origin, None)
+            self.lsdb.pop(origin, None)
+        self.node.logger.info(f"Eliminadas entradas stale sin revalidar: {sorted(self.stale_origins)}")
+        self.stale_origins = set()
+        self.request_routes()
+
     async def start(self):
         """Bucle principal del algoritmo LSR"""
         self.logger.info(self.topology)
@@ -136,6 +503,25 @@ class LinkStateRouter:
         else:
             self.logger.warning("Algoritmo LSR iniciado sin referencia a nodo")
 
-        while self.running:
-            await self.send_lsa()
-            await asyncio.sleep(360)
\ No newline at end of file
+        # Nodo nuevo o reiniciado: pedir el LSDB a los vecinos en vez de
+        # esperar la próxima LSA periódica de cada router
+        await self.send_lsa()
+        for neighbor in list(self.node.neighbors):
+            await self.send_dbd(neighbor)
+
+        # Refresco periódico de la LSA propia, con jitter para que los routers
+        # no inunden todos en el mismo instante
+        self.refresh_job = self.node.scheduler.call_every(
+            360, self._refresh, name="lsa_refresh", jitter=0.1
+        )
+
+        # LSR no usa hellos para detectar vecinos, pero con costos dinámicos
+        # hacen falta para medir el RTT de cada enlace
+        if self.node.dynamic_costs:
+            self.hello_job = self.node.scheduler.call_every(
+                lambda: self.node.hello_scheduler.tick, self.node.send_hello, name="hello", delay=0
+            )
+
+    async def _refresh(self):
+        self.logger.info(f"Estadísticas FIB: {self.fib.stats()}")
+        await self.send_lsa()
\ No newline at end of file
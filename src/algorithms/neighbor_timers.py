@@ -0,0 +1,54 @@
+import time
+
+
+class NeighborTimers:
+    """
+    Timeout de cada vecino directo como un deadline en el scheduler del nodo.
+
+    reset() solo anota cuándo se escuchó al vecino; el trabajo de cada
+    vecino vence una vez por timeout y, si hubo actividad mientras tanto,
+    se vuelve a programar para lo que falta. Un nodo inactivo no despierta
+    por los timers más que una vez cada timeout por vecino.
+    """
+
+    def __init__(self, node, on_expire, timeout=15):
+        self.node = node
+        self.on_expire = on_expire  # función(vecino) al vencer sin noticias
+        self.timeout = timeout
+        self.last_seen = {}
+        self.jobs = {}
+
+    def reset(self, neighbor):
+        """Se escuchó al vecino: su deadline pasa a ser ahora + timeout"""
+        self.last_seen[neighbor] = time.monotonic()
+        if neighbor not in self.jobs:
+            self._schedule(neighbor, self.timeout)
+
+    def _schedule(self, neighbor, delay):
+        self.jobs[neighbor] = self.node.scheduler.call_later(
+            delay, lambda: self._check(neighbor), name="neighbor_timeout"
+        )
+
+    def _check(self, neighbor):
+        self.jobs.pop(neighbor, None)
+        last_seen = self.last_seen.get(neighbor)
+        if last_seen is None:
+            return
+        remaining = last_seen + self.timeout - time.monotonic()
+        if remaining > 0:
+            self._schedule(neighbor, remaining)
+            return
+        del self.last_seen[neighbor]
+        self.on_expire(neighbor)
+
+    def cancel(self, neighbor):
+        """Olvidar al vecino (quitado de la topología)"""
+        self.last_seen.pop(neighbor, None)
+        job = self.jobs.pop(neighbor, None)
+        if job:
+            job.cancel()
+
+    def cancel_all(self):
+        for neighbor in list(self.jobs):
+            self.cancel(neighbor)
+        self.last_seen.clear()
@@ -1,18 +1,27 @@
-import asyncio
-import time
-import json
 from src.algorithms.dijkstra import Dijkstra
+from src.algorithms.edge_update import announce_link_cost
+from src.algorithms.neighbor_timers import NeighborTimers
 
 class SimpleLSR:
+    # Segundos para revalidar las aristas restauradas de un snapshot
+    stale_timeout = 30
+
     def __init__(self):
         self.node = None
         self.running = False
+        self.jobs = []
         self.seen_messages = set()
         self.dijkstra = Dijkstra()
+        self.timers = None
+
+        # Reinicio en caliente: pedir a cada vecino su tabla para revalidar lo restaurado
+        self.revalidate = False
+        self.sync_requested = set()
 
     def set_node(self, node):
         self.node = node
         self.dijkstra.set_node(node)
+        self.timers = NeighborTimers(node, self._expire_neighbor)
 
     def handle_message(self, message):
         """Manejar mensajes recibidos"""
@@ -22,6 +31,8 @@ class SimpleLSR:
             self._handle_hello(message)
         elif message_type == 'message':
             self._handle_routing_message(message)
+        elif message_type == 'sync_request':
+            self._handle_sync_request(message)
 
     def _handle_hello(self, message):
         """Manejar mensajes hello - resetear timer"""
@@ -34,50 +45,116 @@ class SimpleLSR:
             #if to_node != self.node.node_id:
             #    return
 
-            self.node.logger.info(f"Hello recibido de nodo: {from_node}")
+            # Solo vecinos configurados: tras una recarga que quitó el enlace,
+            # un hello del otro extremo no debe volver a agregarlo
+            if from_node not in self.node.neighbors:
+                self.node.logger.debug(f"Hello ignorado de {from_node}: no es vecino")
+                return
 
-            # Asegurarnos de que la estructura de la tabla exista
-            if self.node.node_id not in self.node.routing_table:
-                self.node.routing_table[self.node.node_id] = {}
-
-            # Verificar si es una reconexión (nuevo vecino o reconexión)
-            was_reconnection = from_node not in self.node.routing_table[self.node.node_id]
-
-            # Actualizar timer en la tabla de routing
-            if from_node in self.node.routing_table[self.node.node_id]:
-                self.node.routing_table[self.node.node_id][from_node]['time'] = 15
-                self.node.logger.debug(f"Timer resetado para {from_node}")
-            else:
-                # Agregar nuevo vecino (recuperar conexión)
-                self.node.routing_table[self.node.node_id][from_node] = {
-                    "weight": hops,
-                    "time": 15
-                }
-                self.node.logger.info(f"Vecino reconectado: {from_node}")
-
-            # PROPAGAR INFORMACIÓN SI FUE UNA RECONEXIÓN
-            if was_reconnection:
-                self.node.logger.info(f"Propagando información de reconexión: {from_node}")
-                self._propagate_routing_info()
+            self.node.logger.info(f"Hello recibido de nodo: {from_node}")
+            self._refresh_neighbor(from_node, hops)
 
         except Exception as e:
             self.node.logger.error(f"Error procesando hello: {e}")
 
 
+    def on_neighbor_activity(self, neighbor):
+        """Cualquier mensaje recibido de un vecino cuenta como hello"""
+        self._refresh_neighbor(neighbor, self.node.get_link_cost(neighbor))
+
+        # El vecino ya nos puede contestar (y nosotros ya escuchamos): pedirle su tabla
+        if self.revalidate and neighbor not in self.sync_requested:
+            self.sync_requested.add(neighbor)
+            self.node.spawn(self.node.send_message({
+                "type": "sync_request",
+                "from": self.node.node_id,
+                "to": neighbor
+            }, neighbor))
+
+    def _handle_sync_request(self, message):
+        """Un vecino reinició con un snapshot: mandarle todas las aristas conocidas"""
+        requester = message['from']
+        for origin, neighbors in list(self.node.routing_table.items()):
+            if origin == requester:
+                continue  # su propia adyacencia la conoce de la configuración
+            for target, info in neighbors.items():
+                if info.get("stale"):
+                    continue  # no confirmar lo que nosotros tampoco revalidamos
+                self.node.spawn(self.node.send_message({
+                    "type": "message",
+                    "from": origin,
+                    "to": target,
+                    "hops": info["weight"]
+                }, requester))
+
+    def on_link_cost_change(self, neighbor, cost):
+        """Anunciar el costo medido (RTT) de un enlace propio"""
+        announce_link_cost(self.node, neighbor, cost)
+
+    def on_neighbors_changed(self, added, removed, changed):
+        """Topología recargada: anunciar solo las aristas propias que cambiaron.
+
+        RedisNode ya actualizó la fila propia de la tabla; una arista quitada
+        se anuncia con hops = -1.
+        """
+        for neighbor in added:
+            self.timers.reset(neighbor)
+        for neighbor, cost in {**added, **changed}.items():
+            self.on_link_cost_change(neighbor, cost)
+        for neighbor in removed:
+            self.timers.cancel(neighbor)
+            message = {
+                "type": "message",
+                "from": self.node.node_id,
+                "to": neighbor,
+                "hops": -1
+            }
+            self.node.spawn(self.node.flood_message(message))
+
+    def _refresh_neighbor(self, from_node, hops):
+        """Resetear el timer del vecino o agregarlo si se reconectó"""
+        # Asegurarnos de que la estructura de la tabla exista
+        if self.node.node_id not in self.node.routing_table:
+            self.node.routing_table[self.node.node_id] = {}
+
+        # Verificar si es una reconexión (nuevo vecino o reconexión)
+        was_reconnection = from_node not in self.node.routing_table[self.node.node_id]
+
+        # Correr el deadline del vecino
+        self.timers.reset(from_node)
+        if was_reconnection:
+            # Agregar nuevo vecino (recuperar conexión)
+            self.node.routing_table[self.node.node_id][from_node] = {"weight": hops}
+            self.node.logger.info(f"Vecino reconectado: {from_node}")
+
+        # PROPAGAR INFORMACIÓN SI FUE UNA RECONEXIÓN
+        if was_reconnection:
+            self.node.hello_scheduler.note_flap(from_node)
+            self.node.logger.info(f"Propagando información de reconexión: {from_node}")
+            self._propagate_routing_info()
+
     def _handle_routing_message(self, message):
         """Manejar mensajes de routing - actualizar tabla"""
         from_node = message['from']
         to_node = message['to']
         hops = message['hops']
 
+        # hops negativo: la arista from -> to ya no existe
+        if hops < 0:
+            if self.node.routing_table.get(from_node, {}).pop(to_node, None) is not None:
+                self.node.logger.info(f"Arista eliminada: {from_node}->{to_node}")
+                self.node.spawn(
+                    self.node.flood_message(message, exclude_neighbor=from_node)
+                )
+            return
+
         # En vez de solo ignorar por duplicado, verificamos si hay cambio real
-        current_weight = (
-            self.node.routing_table.get(from_node, {})
-            .get(to_node, {})
-            .get("weight")
-        )
+        current = self.node.routing_table.get(from_node, {}).get(to_node, {})
+        current_weight = current.get("weight")
 
         if current_weight == hops:
+            # Arista restaurada de un snapshot confirmada por la red
+            current.pop("stale", None)
             # No hay cambio, ignoramos flooding
             self.node.logger.debug(
                 f"Mensaje repetido sin cambios ignorado: {from_node}->{to_node} ({hops})"
@@ -94,12 +171,8 @@ class SimpleLSR:
             "weight": hops
         }
 
-        self.node.logger.info(
-            f"---- Tabla inicializada:\n{json.dumps(self.node.routing_table, indent=2)}"
-        )
-
         # Hacer flooding a todos los vecinos excepto al remitente
-        asyncio.create_task(
+        self.node.spawn(
             self.node.flood_message(message, exclude_neighbor=from_node)
         )
 
@@ -110,66 +183,38 @@ class SimpleLSR:
 
         self._propagate_routing_info()
 
-        dijkstra_task = asyncio.create_task(self.dijkstra.start())
-
-        # Tarea para enviar hellos periódicamente
-        async def hello_task():
-            while self.running:
-                await self.node.send_hello()
-                await asyncio.sleep(3)  # Hello cada 3 segundos
-
-        # Tarea para decrementar timers
-        async def timer_task():
-            while self.running:
-                await asyncio.sleep(1)
-                self._decrement_timers()
-
-        # Iniciar ambas tareas
-        hello_task_obj = asyncio.create_task(hello_task())
-        timer_task_obj = asyncio.create_task(timer_task())
+        await self.dijkstra.start()
+
+        # Hellos y reporte en el scheduler del nodo. El HelloScheduler decide
+        # a quién toca; aquí solo se consulta cada tick. Cada vecino tiene su
+        # propio deadline (NeighborTimers) en vez de un conteo por segundo.
+        scheduler = self.node.scheduler
+        self.jobs = [
+            scheduler.call_every(lambda: self.node.hello_scheduler.tick, self.node.send_hello,
+                                 name="hello", delay=0),
+            scheduler.call_every(60, self._report_hellos, name="hello_stats"),
+        ]
+        for neighbor in self.node.routing_table.get(self.node.node_id, {}):
+            self.timers.reset(neighbor)
+
+    def _report_hellos(self):
+        self.node.logger.info(f"Hellos: {self.node.hello_scheduler.stats()}")
+
+    def _expire_neighbor(self, dead):
+        """Venció el deadline del vecino: eliminar el nodo y todas sus aristas"""
+        if dead not in self.node.routing_table.get(self.node.node_id, {}):
+            return
+        self.node.hello_scheduler.note_flap(dead)
 
-        try:
-            await asyncio.gather(hello_task_obj, timer_task_obj)
-        except asyncio.CancelledError:
-            self.node.logger.info("SimpleLSR detenido")
-
-    def _decrement_timers(self):
-        """Decrementar timers de los vecinos y eliminar nodos expirados de la tabla"""
-        expired_nodes = []
-
-        # recorrer toda la tabla y bajar los timers
-        for from_node, neighbors in list(self.node.routing_table.items()):
-            for to_node, info in list(neighbors.items()):
-                if "time" in info:
-                    info["time"] -= 1
-                    if info["time"] <= 0:
-                        expired_nodes.append(to_node)
-
-        # eliminar nodos expirados y todas las rutas asociadas
-        for dead in expired_nodes:
-            # 1. Eliminar la entrada principal del nodo muerto
-            if dead in self.node.routing_table:
-                del self.node.routing_table[dead]
-
-            # 2. Eliminar referencias hacia el nodo muerto desde cualquier otro
-            for from_node, neighbors in list(self.node.routing_table.items()):
-                if dead in neighbors:
-                    del neighbors[dead]
-
-        # limpiar nodos que se queden sin vecinos
-        for node in list(self.node.routing_table.keys()):
-            if not self.node.routing_table[node]:  # Diccionario vacío
-                self.node.routing_table[node] = {}
-
-        # logging
-        if expired_nodes:
-            self.node.logger.info(
-                f"Nodos eliminados por timeout: {expired_nodes}\n"
-                f"Tabla actual:\n{json.dumps(self.node.routing_table, indent=2)}"
-            )
-            self._propagate_routing_info()
+        # 1. Eliminar la entrada principal del nodo muerto
+        self.node.routing_table.pop(dead, None)
 
+        # 2. Eliminar referencias hacia el nodo muerto desde cualquier otro
+        for neighbors in self.node.routing_table.values():
+            neighbors.pop(dead, None)
 
+        self.node.logger.info(f"Nodo eliminado por timeout: {dead}")
+        self._propagate_routing_info()
 
     def _propagate_routing_info(self):
         """Propagar información de routing a vecinos"""
@@ -187,12 +232,48 @@ class SimpleLSR:
             }
             # ✅ Agregar logging para debugging
             self.node.logger.info(f"Propagando: {self.node.node_id} -> {neighbor} (peso: {data['weight']})")
-            self.node.logger.info(
-                f"---- Tabla actualizada:\n{json.dumps(self.node.routing_table, indent=2)}"
-            )
 
-            asyncio.create_task(self.node.send_message(message, neighbor))
+            self.node.spawn(self.node.send_message(message, neighbor))
+
+    def export_state(self):
+        """Copia de la tabla de routing para el snapshot"""
+        return {
+            "routing_table": {
+                origin: {target: dict(info) for target, info in neighbors.items()}
+                for origin, neighbors in self.node.routing_table.items()
+            }
+        }
+
+    def import_state(self, state):
+        """Restaurar aristas de un snapshot marcándolas como stale.
+
+        La adyacencia propia sale de la configuración y de los hellos, no del
+        snapshot.
+        """
+        for origin, neighbors in state["routing_table"].items():
+            if origin == self.node.node_id:
+                continue
+            table = self.node.routing_table.setdefault(origin, {})
+            for target, info in neighbors.items():
+                if target not in table:
+                    table[target] = {"weight": info["weight"], "stale": True}
+                    self.revalidate = True
+
+    def purge_stale(self):
+        """Eliminar aristas restauradas que ningún vecino confirmó"""
+        self.revalidate = False
+        removed = []
+        for origin, neighbors in self.node.routing_table.items():
+            for target, info in list(neighbors.items()):
+                if info.get("stale"):
+                    del neighbors[target]
+                    removed.append(f"{origin}->{target}")
+        if removed:
+            self.node.logger.info(f"Eliminadas aristas stale sin revalidar: {removed}")
 
     def shutdown(self):
         self.running = False
+        for job in self.jobs:
+            job.cancel()
+        self.timers.cancel_all()
         self.dijkstra.shutdown()
\ No newline at end of file
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from src.algorithms.dijkstra import shortest_path_tree
+
+
+class SPFExecutor:
+    """
+    Ejecuta Dijkstra fuera del event loop sobre una copia inmutable del grafo.
+
+    - Grafos chicos (menos de inline_threshold nodos) se calculan en el loop:
+      mandar el trabajo a otro hilo cuesta más que hacerlo.
+    - Cada pedido tiene un número de generación. Si llega una topología más
+      nueva, el cálculo anterior se cancela (si no empezó) o su resultado se
+      descarta, así nunca se instala una tabla vieja.
+    - Se mide cuánto tiempo bloqueó el loop cada pedido (copia + cálculo
+      inline) y cuánto tardó el cálculo en el pool.
+    """
+
+    def __init__(self, mode="thread", max_workers=1, inline_threshold=500):
+        self.mode = mode
+        self.inline_threshold = inline_threshold
+        if mode == "process":
+            self.pool = ProcessPoolExecutor(max_workers=max_workers)
+        elif mode == "thread":
+            self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spf")
+        else:
+            self.pool = None
+        self.generation = 0
+        self.pending = None
+
+        # Métricas
+        self.runs = 0
+        self.superseded = 0
+        self.last_blocked_ms = 0.0
+        self.max_blocked_ms = 0.0
+        self.last_compute_ms = 0.0
+
+    async def compute(self, graph, source, snapshot=True):
+        """
+        Devuelve (distances, predecessors, next_hops) o None si mientras se
+        calculaba llegó un pedido más nuevo.
+        """
+        self.generation += 1
+        generation = self.generation
+
+        started = time.perf_counter()
+        if snapshot:
+            graph = {node: dict(neighbors) for node, neighbors in graph.items()}
+
+        if self.pool is None or len(graph) < self.inline_threshold:
+            result = shortest_path_tree(graph, source)
+            self._record(started, time.perf_counter() - started, blocked_until=time.perf_counter())
+            self.runs += 1
+            return result
+
+        blocked_until = time.perf_counter()
+        if self.pending is not None:
+            # Si todavía no empezó, el cálculo anterior ya no sirve
+            self.pending.cancel()
+
+        future = self.pool.submit(shortest_path_tree, graph, source)
+        self.pending = future
+        compute_started = time.perf_counter()
+        try:
+            result = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if future.cancelled() and generation != self.generation:
+                self.superseded += 1
+                return None
+            raise
+
+        self._record(started, time.perf_counter() - compute_started, blocked_until=blocked_until)
+        self.runs += 1
+        if generation != self.generation:
+            self.superseded += 1
+            return None
+        return result
+
+    def _record(self, started, compute_seconds, blocked_until):
+        self.last_blocked_ms = (blocked_until - started) * 1000
+        self.max_blocked_ms = max(self.max_blocked_ms, self.last_blocked_ms)
+        self.last_compute_ms = compute_seconds * 1000
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "runs": self.runs,
+            "superseded": self.superseded,
+            "last_blocked_ms": round(self.last_blocked_ms, 3),
+            "max_blocked_ms": round(self.max_blocked_ms, 3),
+            "last_compute_ms": round(self.last_compute_ms, 3)
+        }
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def executor_from_env():
+    """SPF_EXECUTOR=thread|process|inline y SPF_INLINE_THRESHOLD=nodos"""
+    return SPFExecutor(
+        mode=os.getenv("SPF_EXECUTOR", "thread"),
+        inline_threshold=int(os.getenv("SPF_INLINE_THRESHOLD", 500))
+    )
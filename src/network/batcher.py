@@ -0,0 +1,119 @@
+import asyncio
+import json
+import time
+from collections import deque
+
+from src.utils.stats import summarize
+
+
+def unpack(payload):
+    """Mensajes de un payload recibido: los del sobre "batch" o el payload solo"""
+    if isinstance(payload, dict) and payload.get("type") == "batch":
+        return payload["messages"]
+    return [payload]
+
+
+class OutboundBatcher:
+    """
+    Junta los mensajes chicos hacia un mismo vecino en un solo PUBLISH.
+
+    El primer mensaje hacia un vecino abre una ventana de `window` segundos;
+    al vencer (o al llegar a max_messages / max_bytes) se publica todo junto
+    en un sobre {"type": "batch", "via": ..., "messages": [...]} que el
+    listener desarma. Si en la ventana hubo un solo mensaje se publica tal
+    cual. Los mensajes ya vienen serializados, así que el sobre se arma
+    concatenando bytes sin volver a codificar.
+
+    Se mide cuántos PUBLISH se ahorran y cuánto espera cada mensaje en la
+    ventana (latencia agregada).
+    """
+
+    def __init__(self, publish, via, window=0.005, max_messages=32, max_bytes=65536):
+        self.publish = publish  # corrutina (vecino, bytes, [mensajes]) -> bool
+        self.window = window
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.header = b'{"type": "batch", "via": ' + json.dumps(via).encode() + b', "messages": ['
+        self.pending = {}       # vecino -> [(momento, mensaje, bytes)]
+        self.pending_bytes = {}
+        self.timers = {}
+        self.tasks = set()
+
+        # Métricas
+        self.messages = 0
+        self.publishes = 0
+        self.envelopes = 0
+        self.delays = deque(maxlen=10000)
+
+    async def add(self, neighbor_id, message, data):
+        """Agregar un mensaje ya serializado a la ventana del vecino"""
+        if isinstance(data, str):
+            data = data.encode()
+        if len(data) + len(self.header) >= self.max_bytes:
+            # No entra en un sobre: se publica solo, sin esperar
+            self.messages += 1
+            self.publishes += 1
+            self.delays.append(0.0)
+            return await self.publish(neighbor_id, data, [message])
+
+        entries = self.pending.setdefault(neighbor_id, [])
+        if self.pending_bytes.get(neighbor_id, 0) + len(data) + len(self.header) >= self.max_bytes:
+            await self.flush(neighbor_id)
+            entries = self.pending.setdefault(neighbor_id, [])
+
+        entries.append((time.monotonic(), message, data))
+        self.pending_bytes[neighbor_id] = self.pending_bytes.get(neighbor_id, 0) + len(data) + 1
+
+        if len(entries) >= self.max_messages:
+            return await self.flush(neighbor_id)
+        if neighbor_id not in self.timers:
+            self.timers[neighbor_id] = asyncio.get_running_loop().call_later(
+                self.window, self._flush_due, neighbor_id
+            )
+        return True
+
+    def _flush_due(self, neighbor_id):
+        self.timers.pop(neighbor_id, None)
+        task = asyncio.create_task(self.flush(neighbor_id))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def flush(self, neighbor_id):
+        """Publicar lo pendiente hacia un vecino (un mensaje solo o un sobre)"""
+        timer = self.timers.pop(neighbor_id, None)
+        if timer is not None:
+            timer.cancel()
+        entries = self.pending.pop(neighbor_id, None)
+        self.pending_bytes.pop(neighbor_id, None)
+        if not entries:
+            return True
+
+        now = time.monotonic()
+        for enqueued_at, _, _ in entries:
+            self.delays.append(now - enqueued_at)
+        self.messages += len(entries)
+        self.publishes += 1
+
+        if len(entries) == 1:
+            data = entries[0][2]
+        else:
+            self.envelopes += 1
+            data = self.header + b",".join(entry[2] for entry in entries) + b"]}"
+        return await self.publish(neighbor_id, data, [entry[1] for entry in entries])
+
+    def stats(self):
+        return {
+            "messages": self.messages,
+            "publishes": self.publishes,
+            "envelopes": self.envelopes,
+            "avg_batch": round(self.messages / self.publishes, 2) if self.publishes else 0.0,
+            "publish_reduction": round(1 - self.publishes / self.messages, 3) if self.messages else 0.0,
+            "added_delay_ms": summarize([round(d * 1000, 3) for d in self.delays])
+        }
+
+    async def close(self):
+        """Publicar todo lo pendiente (al detener el nodo)"""
+        for neighbor_id in list(self.pending):
+            await self.flush(neighbor_id)
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
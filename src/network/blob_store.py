@@ -0,0 +1,74 @@
+import hashlib
+import zlib
+
+
+class BlobStore:
+    """
+    Payloads grandes guardados una sola vez en Redis por hash de contenido.
+
+    El mensaje viaja con "payload_ref" ({hash, size, enc}) en lugar de
+    "payload" y solo el destinatario final lo descarga. Por encima de
+    compress_threshold el blob se guarda comprimido con zlib.
+    """
+
+    def __init__(self, redis_client, threshold, compress_threshold=None, ttl=300, prefix="blob:"):
+        self.redis = redis_client
+        self.threshold = threshold
+        self.compress_threshold = compress_threshold
+        self.ttl = ttl
+        self.prefix = prefix
+
+        # Métricas
+        self.stored = 0
+        self.stored_bytes = 0
+        self.fetched = 0
+
+    def should_externalize(self, message):
+        payload = message.get("payload")
+        return (
+            message.get("type") == "message"
+            and isinstance(payload, (str, bytes))
+            and len(payload) > self.threshold
+        )
+
+    async def externalize(self, message):
+        """Guardar el payload en Redis y devolver una copia con la referencia"""
+        payload = message["payload"]
+        data = payload.encode() if isinstance(payload, str) else payload
+        digest = hashlib.sha256(data).hexdigest()
+
+        body = data
+        encoding = None
+        if self.compress_threshold is not None and len(data) > self.compress_threshold:
+            compressed = zlib.compress(data, 1)
+            if len(compressed) < len(data):
+                body = compressed
+                encoding = "zlib"
+
+        key = self.prefix + digest
+        # Mismo contenido = misma clave: si ya existe solo se renueva el TTL
+        if await self.redis.set(key, body, ex=self.ttl, nx=True):
+            self.stored += 1
+            self.stored_bytes += len(body)
+        else:
+            await self.redis.expire(key, self.ttl)
+
+        ref = {"hash": digest, "size": len(data), "enc": encoding}
+        externalized = {k: v for k, v in message.items() if k != "payload"}
+        externalized["payload_ref"] = ref
+        return externalized
+
+    async def resolve(self, message):
+        """Descargar el payload referenciado (bytes) o None si expiró"""
+        ref = message["payload_ref"]
+        body = await self.redis.get(self.prefix + ref["hash"])
+        if body is None:
+            return None
+
+        if ref.get("enc") == "zlib":
+            body = zlib.decompress(memoryview(body))
+        if hashlib.sha256(body).hexdigest() != ref["hash"]:
+            raise ValueError(f"Blob {ref['hash']} corrupto")
+
+        self.fetched += 1
+        return body
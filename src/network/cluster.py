@@ -0,0 +1,128 @@
+import time
+from collections import Counter
+
+import redis.asyncio as redis
+
+
+def shard_channel(node_id, depth=2):
+    """
+    Canal con hash tag para Redis Cluster: "sec30.grupo5.nodo5" ->
+    "{sec30.grupo5}.nodo5". Todo el grupo cae en el mismo slot, así que
+    los vecinos que más se hablan comparten shard.
+    """
+    parts = node_id.split(".")
+    if len(parts) <= depth:
+        return "{" + node_id + "}"
+    return "{" + ".".join(parts[:depth]) + "}." + ".".join(parts[depth:])
+
+
+class ShardedSubscription:
+    """
+    Suscripción SSUBSCRIBE a un canal en el shard dueño de su slot.
+
+    Expone la misma interfaz que usa RedisNode.listener del PubSub normal
+    (async with, subscribe, get_message) y entrega los "smessage" como
+    mensajes de tipo "message".
+    """
+
+    def __init__(self, cluster, password=None):
+        self.cluster = cluster
+        self.password = password
+        self.client = None
+        self.pubsub = None
+        self.channel = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def subscribe(self, channel):
+        self.channel = channel
+        node = self.cluster.get_node_from_key(channel)
+        self.client = redis.Redis(host=node.host, port=node.port, password=self.password)
+        self.pubsub = self.client.pubsub()
+        await self.pubsub.execute_command("SSUBSCRIBE", channel)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        # El PubSub async no lleva registro de SSUBSCRIBE, así que se lee la
+        # respuesta cruda en vez de pasar por get_message()
+        response = await self.pubsub.parse_response(block=False, timeout=timeout)
+        if not response:
+            return None
+
+        message_type = response[0].decode() if isinstance(response[0], bytes) else response[0]
+        if message_type == "smessage":
+            return {"type": "message", "channel": response[1], "data": response[2]}
+        if message_type == "sunsubscribe":
+            # El slot se movió a otro shard (resharding): volver a suscribirse
+            await self.close()
+            await self.cluster.initialize()
+            await self.subscribe(self.channel)
+        if ignore_subscribe_messages:
+            return None
+        return {"type": message_type, "channel": response[1], "data": response[2]}
+
+    async def close(self):
+        if self.pubsub is not None:
+            await self.pubsub.aclose() if hasattr(self.pubsub, "aclose") else await self.pubsub.close()
+            self.pubsub = None
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+
+async def ssubscribe_channels(cluster, channels, password=None):
+    """
+    SSUBSCRIBE a muchos canales a la vez: una conexión por shard y un
+    comando por slot (SSUBSCRIBE con varios canales exige que compartan
+    slot). Devuelve [(cliente, pubsub)] para leer con parse_response().
+    """
+    by_shard = {}
+    for channel in channels:
+        node = cluster.get_node_from_key(channel)
+        slots = by_shard.setdefault((node.host, node.port), {})
+        slots.setdefault(cluster.keyslot(channel), []).append(channel)
+
+    subscriptions = []
+    for (host, port), slots in by_shard.items():
+        client = redis.Redis(host=host, port=port, password=password)
+        pubsub = client.pubsub()
+        for slot_channels in slots.values():
+            await pubsub.execute_command("SSUBSCRIBE", *slot_channels)
+        subscriptions.append((client, pubsub))
+    return subscriptions
+
+
+class ShardedPubSub:
+    """SPUBLISH al shard dueño de cada canal, con conteo por shard"""
+
+    def __init__(self, cluster, password=None):
+        self.cluster = cluster
+        self.password = password
+        self.started = time.monotonic()
+        self.published = Counter()
+        self.published_bytes = Counter()
+
+    async def publish(self, channel, data):
+        node = self.cluster.get_node_from_key(channel)
+        receivers = await self.cluster.execute_command("SPUBLISH", channel, data, target_nodes=node)
+        self.published[node.name] += 1
+        self.published_bytes[node.name] += len(data)
+        return receivers
+
+    def pubsub(self):
+        return ShardedSubscription(self.cluster, self.password)
+
+    def stats(self):
+        """Mensajes y bytes por shard, y tasa promedio desde el arranque"""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            shard: {
+                "published": count,
+                "bytes": self.published_bytes[shard],
+                "msg_per_s": round(count / elapsed, 1)
+            }
+            for shard, count in self.published.items()
+        }
@@ -0,0 +1,151 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+# Errores que indican que se cayó la conexión (no un error del mensaje)
+CONNECTION_ERRORS = (RedisConnectionError, RedisTimeoutError, ConnectionError, OSError)
+
+
+class ConnectionManager:
+    """
+    Reconexión a Redis con backoff exponencial con jitter.
+
+    Mientras la conexión está caída los mensajes salientes se guardan en un
+    buffer acotado y se reenvían en orden al reconectar. Los hellos no se
+    guardan: uno viejo no sirve y el siguiente sale en el próximo tick.
+    El listener vuelve a suscribirse solo cuando wait_connected() termina.
+    """
+
+    def __init__(self, node, base_delay=0.05, max_delay=5.0, buffer_size=1000):
+        self.node = node
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.buffer = deque()
+        self.buffer_size = buffer_size
+        self.connected = asyncio.Event()
+        self.connected.set()
+        self.reconnect_task = None
+        self.down_since = None
+
+        # Métricas
+        self.reconnects = 0
+        self.attempts = 0
+        self.last_reconnect_ms = 0.0
+        self.max_reconnect_ms = 0.0
+        self.total_reconnect_ms = 0.0
+        self.buffered = 0
+        self.replayed = 0
+        self.lost = 0
+        self.hellos_skipped = 0
+
+    @property
+    def is_connected(self):
+        return self.connected.is_set()
+
+    def backoff(self, attempt):
+        """Full jitter: uniforme entre 0 y base * 2^attempt (con tope)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def connection_lost(self, error):
+        """Marcar la conexión como caída y lanzar la reconexión (una sola a la vez)"""
+        if self.connected.is_set():
+            self.connected.clear()
+            self.down_since = time.monotonic()
+            self.node.logger.warning(f"Conexión con Redis perdida: {error}")
+        if self.reconnect_task is None or self.reconnect_task.done():
+            self.reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def wait_connected(self):
+        await self.connected.wait()
+
+    def hold(self, message, neighbor_id):
+        """Guardar un mensaje para reenviarlo al reconectar; False si se pierde"""
+        if message.get("type") == "hello":
+            self.hellos_skipped += 1
+            return False
+        if len(self.buffer) >= self.buffer_size:
+            # Se descarta el más viejo: el más nuevo tiene el estado más reciente
+            self.buffer.popleft()
+            self.lost += 1
+        self.buffer.append((message, neighbor_id))
+        self.buffered += 1
+        return True
+
+    async def _reconnect(self):
+        attempt = 0
+        while self.node.running:
+            await asyncio.sleep(self.backoff(attempt))
+            self.attempts += 1
+            try:
+                await self.node.redis.ping()
+                break
+            except CONNECTION_ERRORS:
+                attempt += 1
+        else:
+            return
+
+        elapsed_ms = (time.monotonic() - self.down_since) * 1000
+        self.reconnects += 1
+        self.last_reconnect_ms = elapsed_ms
+        self.max_reconnect_ms = max(self.max_reconnect_ms, elapsed_ms)
+        self.total_reconnect_ms += elapsed_ms
+        self.node.logger.info(f"Reconectado a Redis en {elapsed_ms:.0f} ms ({attempt + 1} intentos)")
+
+        self.connected.set()
+        await self._replay()
+
+    async def _replay(self):
+        """Reenviar lo acumulado en orden; si se vuelve a caer lo que falta sigue en el buffer.
+
+        Cada mensaje sale solo (sin batching) y se saca del buffer recién
+        cuando el PUBLISH se confirmó. Si la conexión se cae en el medio,
+        hold() lo vuelve a guardar al final: esa copia se descarta y el
+        original queda al frente, delante de los mensajes más nuevos.
+        """
+        pending = len(self.buffer)
+        while self.buffer and self.connected.is_set():
+            message, neighbor_id = self.buffer[0]
+            delivered = await self.node._publish(message, neighbor_id, batch=False)
+            if not self.buffer or self.buffer[0][0] is not message:
+                # hold() descartó el más viejo por buffer lleno: la copia nueva es la única
+                continue
+            if not self.connected.is_set():
+                self._drop_requeued(message)
+                break
+            self.buffer.popleft()
+            if delivered:
+                self.replayed += 1
+        if pending:
+            self.node.logger.info(f"Reenviados {pending - len(self.buffer)} mensajes retenidos")
+
+    def _drop_requeued(self, message):
+        """Quitar la copia de message que hold() agregó al final durante el reenvío"""
+        for index in range(len(self.buffer) - 1, 0, -1):
+            if self.buffer[index][0] is message:
+                del self.buffer[index]
+                self.buffered -= 1
+                return
+
+    def stats(self):
+        return {
+            "connected": self.is_connected,
+            "reconnects": self.reconnects,
+            "attempts": self.attempts,
+            "last_reconnect_ms": round(self.last_reconnect_ms, 1),
+            "avg_reconnect_ms": round(self.total_reconnect_ms / self.reconnects, 1) if self.reconnects else 0.0,
+            "max_reconnect_ms": round(self.max_reconnect_ms, 1),
+            "buffered": self.buffered,
+            "replayed": self.replayed,
+            "lost": self.lost,
+            "hellos_skipped": self.hellos_skipped,
+            "pending": len(self.buffer)
+        }
+
+    def close(self):
+        if self.reconnect_task is not None:
+            self.reconnect_task.cancel()
+            self.reconnect_task = None
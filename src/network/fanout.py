@@ -0,0 +1,80 @@
+from redis.exceptions import NoScriptError
+
+# ARGV[1] = payload, ARGV[2..n] = canales destino
+LIST_FANOUT_SCRIPT = """
+for i = 2, #ARGV do
+  redis.call('PUBLISH', ARGV[i], ARGV[1])
+end
+return #ARGV - 1
+"""
+
+# KEYS[1] = set con la adyacencia del nodo, ARGV[1] = payload,
+# ARGV[2] = vecino a excluir ('' si ninguno)
+SET_FANOUT_SCRIPT = """
+local n = 0
+for _, channel in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+  if channel ~= ARGV[2] then
+    redis.call('PUBLISH', channel, ARGV[1])
+    n = n + 1
+  end
+end
+return n
+"""
+
+
+class LuaFanout:
+    """
+    Fan-out del lado del servidor: un solo EVALSHA con una copia del payload
+    publica en todos los canales vecinos.
+
+    En modo "set" la lista de vecinos vive en Redis (adj:<nodo>) y no viaja
+    en cada flood.
+    """
+
+    def __init__(self, redis_client, node_id, mode="list"):
+        self.redis = redis_client
+        self.mode = mode
+        self.adjacency_key = f"adj:{node_id}"
+        self.list_sha = None
+        self.set_sha = None
+
+        # Métricas
+        self.calls = 0
+        self.publishes = 0
+
+    async def load(self):
+        """Registrar los scripts con SCRIPT LOAD"""
+        self.list_sha = await self.redis.script_load(LIST_FANOUT_SCRIPT)
+        self.set_sha = await self.redis.script_load(SET_FANOUT_SCRIPT)
+
+    async def sync_adjacency(self, neighbors):
+        """Reemplazar el set de adyacencia con los vecinos actuales"""
+        if self.mode != "set":
+            return
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(self.adjacency_key)
+        if neighbors:
+            pipe.sadd(self.adjacency_key, *neighbors)
+        await pipe.execute()
+
+    async def publish(self, payload, neighbors, exclude_neighbor=None):
+        """Publicar payload en todos los vecinos (menos exclude_neighbor)"""
+        try:
+            count = await self._evalsha(payload, neighbors, exclude_neighbor)
+        except NoScriptError:
+            # Redis reiniciado o SCRIPT FLUSH: volver a cargar y reintentar
+            await self.load()
+            count = await self._evalsha(payload, neighbors, exclude_neighbor)
+        self.calls += 1
+        self.publishes += count
+        return count
+
+    async def _evalsha(self, payload, neighbors, exclude_neighbor):
+        if self.mode == "set":
+            return await self.redis.evalsha(
+                self.set_sha, 1, self.adjacency_key, payload, exclude_neighbor or ""
+            )
+        channels = [n for n in neighbors if n != exclude_neighbor]
+        if not channels:
+            return 0
+        return await self.redis.evalsha(self.list_sha, 0, payload, *channels)
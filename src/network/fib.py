@@ -0,0 +1,61 @@
+from collections import Counter
+
+
+def area_of(node_id, depth=2):
+    """Área de un nodo según su nombre: sec30.grupo5.nodo5 -> sec30.grupo5"""
+    return ".".join(node_id.split(".")[:depth])
+
+
+class ForwardingTable:
+    """
+    Forwarding information base (FIB): mapa plano destino -> próximos saltos.
+
+    Se reconstruye solo cuando cambia la tabla de routing (RIB) y se
+    reemplaza de una sola vez, así el reenvío por paquete es un único
+    lookup en un diccionario. Con áreas, un destino sin entrada exacta se
+    busca por el prefijo de su área (rutas resumidas entre áreas).
+    """
+
+    def __init__(self, area_of=None):
+        self.entries = {}
+        self.area_of = area_of
+        self.area_entries = {}
+        self.version = 0
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def install(self, routing_table, area_table=None):
+        """Construir la FIB desde la RIB e instalarla de forma atómica"""
+        entries = {
+            destination: tuple(route["next_hops"])
+            for destination, route in routing_table.items()
+        }
+        area_entries = {
+            area: tuple(route["next_hops"])
+            for area, route in (area_table or {}).items()
+        }
+        # Sin awaits de por medio: los lectores ven la FIB vieja o la nueva
+        self.entries = entries
+        self.area_entries = area_entries
+        self.version += 1
+
+    def lookup(self, destination):
+        """Devuelve la tupla de próximos saltos o None si no hay ruta"""
+        next_hops = self.entries.get(destination)
+        if next_hops is None and self.area_entries:
+            next_hops = self.area_entries.get(self.area_of(destination))
+        if next_hops is None:
+            self.misses[destination] += 1
+        else:
+            self.hits[destination] += 1
+        return next_hops
+
+    def stats(self, top=10):
+        """Destinos más usados y destinos sin ruta"""
+        return {
+            "version": self.version,
+            "size": len(self.entries),
+            "areas": len(self.area_entries),
+            "hot": self.hits.most_common(top),
+            "unroutable": self.misses.most_common(top)
+        }
@@ -0,0 +1,125 @@
+import time
+
+# Valores por defecto: hello cada 3 s como antes, pero puede bajar a 1 s
+# después de un flap o subir hasta 6 s en enlaces estables (el timeout de
+# vecino es de 15 s, así que caben al menos dos hellos perdidos).
+DEFAULT_HELLO_CONFIG = {
+    "interval": 3.0,
+    "min_interval": 1.0,
+    "max_interval": 6.0,
+    "stable_after": 30.0,
+    "probe_interval": 30.0
+}
+
+
+class LinkHelloState:
+    """Estado de hellos de un enlace"""
+
+    def __init__(self, params, now):
+        self.base = float(params["interval"])
+        self.min_interval = float(params["min_interval"])
+        self.max_interval = float(params["max_interval"])
+        self.stable_after = float(params["stable_after"])
+        self.probe_interval = float(params["probe_interval"])
+        self.interval = self.base
+        self.next_due = now
+        self.last_sent = 0.0
+        self.last_hello = 0.0
+        self.last_flap = now
+        self.hellos_sent = 0
+        self.suppressed = 0
+
+
+class HelloScheduler:
+    """
+    Decide a qué vecinos mandar hello en cada tick.
+
+    - Cualquier mensaje enviado al vecino cuenta como prueba de vida, así
+      que en enlaces con tráfico el hello se suprime.
+    - En enlaces estables el intervalo se duplica hasta max_interval.
+    - Después de un flap el intervalo vuelve a min_interval.
+    """
+
+    def __init__(self, neighbors, config=None):
+        config = config or {}
+        self.defaults = {**DEFAULT_HELLO_CONFIG, **{
+            k: v for k, v in config.items() if k in DEFAULT_HELLO_CONFIG
+        }}
+        self.link_config = config.get("links", {})
+        self.started = time.monotonic()
+        self.links = {}
+        for neighbor in neighbors:
+            self.add_link(neighbor)
+
+    @property
+    def tick(self):
+        """Cada cuánto hay que consultar due()"""
+        if not self.links:
+            return self.defaults["min_interval"]
+        return min(state.min_interval for state in self.links.values())
+
+    def add_link(self, neighbor):
+        params = {**self.defaults, **self.link_config.get(neighbor, {})}
+        self.links[neighbor] = LinkHelloState(params, time.monotonic())
+
+    def remove_link(self, neighbor):
+        self.links.pop(neighbor, None)
+
+    def due(self):
+        """Vecinos a los que hay que mandar hello ahora"""
+        now = time.monotonic()
+        due = []
+        for neighbor, state in self.links.items():
+            if now < state.next_due:
+                continue
+
+            # Ya le mandamos algo dentro del intervalo: sirve como hello.
+            # Cada probe_interval se manda igual para seguir midiendo RTT.
+            if (now - state.last_sent < state.interval
+                    and now - state.last_hello < state.probe_interval):
+                state.suppressed += 1
+                state.next_due = state.last_sent + state.interval
+                continue
+
+            due.append(neighbor)
+        return due
+
+    def note_sent(self, neighbor, is_hello):
+        """Registrar un envío (hello o cualquier otro mensaje) al vecino"""
+        state = self.links.get(neighbor)
+        if state is None:
+            return
+
+        now = time.monotonic()
+        state.last_sent = now
+        if not is_hello:
+            return
+
+        state.hellos_sent += 1
+        state.last_hello = now
+        if now - state.last_flap >= state.stable_after:
+            state.interval = min(state.max_interval, state.interval * 2)
+        state.next_due = now + state.interval
+
+    def note_flap(self, neighbor):
+        """El vecino se cayó o se reconectó: volver a hellos frecuentes"""
+        state = self.links.get(neighbor)
+        if state is None:
+            return
+        now = time.monotonic()
+        state.last_flap = now
+        state.interval = state.min_interval
+        state.next_due = now
+
+    def stats(self):
+        """Hellos enviados y suprimidos frente al esquema fijo de 3 s"""
+        elapsed = time.monotonic() - self.started
+        sent = sum(state.hellos_sent for state in self.links.values())
+        baseline = sum(int(elapsed // state.base) + 1 for state in self.links.values())
+        return {
+            "hellos_sent": sent,
+            "hellos_suppressed": sum(state.suppressed for state in self.links.values()),
+            "fixed_schedule_hellos": baseline,
+            "savings_pct": round(100 * (1 - sent / baseline), 1) if baseline else 0.0,
+            "intervals": {n: state.interval for n, state in self.links.items()}
+        }
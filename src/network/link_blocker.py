@@ -0,0 +1,37 @@
+def link_id(a, b):
+    """Id de un enlace sin dirección: "a|b" con los extremos ordenados"""
+    return "|".join(sorted((a, b)))
+
+
+class LinkBlocker:
+    """
+    Bloqueo de enlaces a nivel de transporte para pruebas de fallas.
+
+    Los enlaces bloqueados están en un set de Redis (ej. SADD blocked_links
+    "nodoA|nodoB"). Mientras un enlace está en el set, el nodo descarta lo
+    que envía y lo que recibe por él, como si el cable estuviera cortado.
+    """
+
+    def __init__(self, node, key, interval=0.5):
+        self.node = node
+        self.key = key
+        self.interval = interval
+        self.blocked = set()
+        self.dropped_out = 0
+        self.dropped_in = 0
+
+    def start(self):
+        self.node.scheduler.call_every(self.interval, self.refresh, name="link_blocker", delay=0)
+
+    async def refresh(self):
+        members = await self.node.redis.smembers(self.key)
+        blocked = {m.decode() if isinstance(m, bytes) else m for m in members}
+        if blocked != self.blocked:
+            self.node.logger.info(f"Enlaces bloqueados: {sorted(blocked)}")
+        self.blocked = blocked
+
+    def is_blocked(self, neighbor):
+        return bool(self.blocked) and link_id(self.node.node_id, neighbor) in self.blocked
+
+    def stats(self):
+        return {"blocked": len(self.blocked), "dropped_out": self.dropped_out, "dropped_in": self.dropped_in}
@@ -0,0 +1,168 @@
+import json
+
+
+class MessageError(ValueError):
+    """Mensaje recibido que no tiene los campos obligatorios de su tipo"""
+
+
+class Message:
+    """
+    Mensaje inmutable decodificado una sola vez en el listener.
+
+    Los campos obligatorios del tipo quedan en slots (ej. Hello.source) y el
+    resto en `extra`. Se lee como un dict (message["from"], message.get(...),
+    {**message}) para que los algoritmos no cambien, pero no se puede
+    modificar: replace() devuelve una copia con los campos cambiados. Los
+    bytes serializados se guardan, así un reenvío sin cambios a varios
+    vecinos se codifica una sola vez.
+
+    Esta clase base sirve para los tipos sin campos propios (dbd, lsreq,
+    lsu, summary, ...).
+    """
+
+    __slots__ = ("type", "extra", "_encoded", "_encoded_via")
+
+    # clave JSON -> atributo, solo los campos obligatorios del tipo
+    FIELDS = {}
+    _attrs = {"type": "type"}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._attrs = {"type": "type", **cls.FIELDS}
+
+    def __init__(self, data):
+        init = object.__setattr__
+        extra = dict(data)
+        init(self, "type", extra.pop("type", None))
+        for key, attr in self.FIELDS.items():
+            if key not in extra:
+                raise MessageError(f"{type(self).__name__} sin el campo '{key}'")
+            init(self, attr, extra.pop(key))
+        init(self, "extra", extra)
+        init(self, "_encoded", None)
+        init(self, "_encoded_via", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} es inmutable, usar replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} es inmutable, usar replace()")
+
+    # Lectura como dict
+
+    def __getitem__(self, key):
+        attr = self._attrs.get(key)
+        if attr is not None:
+            return getattr(self, attr)
+        return self.extra[key]
+
+    def get(self, key, default=None):
+        attr = self._attrs.get(key)
+        if attr is not None:
+            return getattr(self, attr)
+        return self.extra.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._attrs or key in self.extra
+
+    def keys(self):
+        return [*self._attrs, *self.extra]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._attrs) + len(self.extra)
+
+    def items(self):
+        return self.to_dict().items()
+
+    def to_dict(self):
+        data = {key: getattr(self, attr) for key, attr in self._attrs.items()}
+        data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+    # Copia al reenviar y serialización
+
+    def replace(self, **changes):
+        """Copia del mismo tipo con los campos cambiados (sin los bytes guardados)"""
+        copy = object.__new__(type(self))
+        init = object.__setattr__
+        extra = dict(self.extra)
+        for attr in self._attrs.values():
+            init(copy, attr, getattr(self, attr))
+        for key, value in changes.items():
+            attr = self._attrs.get(key)
+            if attr is not None:
+                init(copy, attr, value)
+            else:
+                extra[key] = value
+        init(copy, "extra", extra)
+        init(copy, "_encoded", None)
+        init(copy, "_encoded_via", None)
+        return copy
+
+    def encode(self, via):
+        """JSON en bytes con "via" = nodo que lo envía; se calcula una vez por nodo"""
+        if self._encoded_via != via:
+            data = self.to_dict()
+            data["via"] = via
+            object.__setattr__(self, "_encoded", json.dumps(data).encode())
+            object.__setattr__(self, "_encoded_via", via)
+        return self._encoded
+
+
+class Hello(Message):
+    __slots__ = ("source", "target", "hops")
+    FIELDS = {"from": "source", "to": "target", "hops": "hops"}
+
+
+class LSA(Message):
+    __slots__ = ("source", "neighbors", "id")
+    FIELDS = {"from": "source", "neighbors": "neighbors", "id": "id"}
+
+
+class EdgeUpdate(Message):
+    """Arista from -> to con costo hops (lsr_simple/planb, type "message" sin payload)"""
+    __slots__ = ("source", "target", "hops")
+    FIELDS = {"from": "source", "to": "target", "hops": "hops"}
+
+
+class Data(Message):
+    """Mensaje de usuario (payload o payload_ref); ttl, headers, etc. quedan en extra"""
+    __slots__ = ("source", "target")
+    FIELDS = {"from": "source", "to": "target"}
+
+
+TYPES = {"hello": Hello, "lsa": LSA}
+
+
+def from_dict(data):
+    """Construir el mensaje tipado que corresponde a un dict decodificado"""
+    if not isinstance(data, dict):
+        raise MessageError("El mensaje no es un objeto JSON")
+    kind = data.get("type")
+    if kind == "message":
+        is_edge = "hops" in data and "payload" not in data and "payload_ref" not in data
+        return EdgeUpdate(data) if is_edge else Data(data)
+    return TYPES.get(kind, Message)(data)
+
+
+def parse(raw):
+    """Decodificar y validar un mensaje recibido (str o bytes)"""
+    return from_dict(json.loads(raw))
+
+
+def as_message(message):
+    """El mismo mensaje si ya es un Message, si no la versión tipada del dict"""
+    return message if isinstance(message, Message) else from_dict(message)
+
+
+def replace(message, **changes):
+    """Copia con campos cambiados, para Message o dict"""
+    if isinstance(message, Message):
+        return message.replace(**changes)
+    return {**message, **changes}
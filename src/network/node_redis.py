@@ -1,16 +1,51 @@
 import asyncio
 import os
 import redis.asyncio as redis
+from redis.asyncio.cluster import RedisCluster
 import json
 import time
+from collections import Counter
 from src.utils.logger import setup_logger
+from src.network.rate_limiter import NeighborSendQueue, is_control_message
+from src.network.hello import HelloScheduler
+from src.network.snapshot import SnapshotManager
+from src.network.rtt import LinkCostTracker
+from src.network.blob_store import BlobStore
+from src.network.fanout import LuaFanout
+from src.network.cluster import ShardedPubSub, shard_channel
+from src.network.connection import ConnectionManager, CONNECTION_ERRORS
+from src.network.scheduler import Scheduler
+from src.network.topology_watcher import TopologyWatcher
+from src.network.link_blocker import LinkBlocker
+from src.network.node_stats import NodeStatsPublisher
+from src.network.messages import Message, MessageError, from_dict, as_message
+from src.network.batcher import OutboundBatcher, unpack
+from src.utils.tracing import is_traced, record_send
+from src.utils.route_events import RouteEventPublisher, diff_routes
+from src.utils.loop_monitor import LoopLagMonitor
+from src.algorithms.spf_executor import executor_from_env
 from dotenv import load_dotenv
 from dotenv import find_dotenv
 
 load_dotenv(find_dotenv())
 
+# Detectar conexiones muertas rápido: keepalive TCP y PING periódico en pub/sub
+REDIS_CONNECTION_OPTIONS = {
+    "socket_keepalive": True,
+    "socket_connect_timeout": 2,
+    "health_check_interval": 5
+}
+
 class RedisNode:
-    def __init__(self, node_id, neighbors, routing_algorithm):
+    def __init__(self, node_id, neighbors, routing_algorithm,
+                 send_rate=None, send_burst=None, send_queue_size=1000,
+                 hello_config=None, snapshot_dir=None, snapshot_interval=30,
+                 dynamic_costs=False, cost_unit_ms=1.0,
+                 blob_threshold=None, blob_compress_threshold=None, blob_ttl=300,
+                 route_stream=None, fanout=None, cluster=False,
+                 config_path=None, watch_config=False, topology_key=None,
+                 stats_interval=None, link_blocker_key=None, loop_monitor_interval=None,
+                 batch_window_ms=None, batch_max_messages=None, batch_max_bytes=65536):
         self.node_id = node_id
         self.neighbors = neighbors  # Diccionario de {vecino: costo}
         self.routing_algorithm = routing_algorithm
@@ -21,12 +56,106 @@ class RedisNode:
         self.host = os.getenv("REDIS_HOST", "localhost")
         self.port = os.getenv("REDIS_PORT", 6379)
         self.password = os.getenv("REDIS_PASSWORD", None)
+
+        # Redis Cluster con pub/sub por shard (SPUBLISH/SSUBSCRIBE)
+        self.cluster = cluster or os.getenv("REDIS_CLUSTER", "").lower() in ("1", "true")
+        self.sharded = None
+
+        # Limitación de tasa por vecino (None = publicar sin control de flujo)
+        send_rate = send_rate or os.getenv("SEND_RATE")
+        self.send_rate = float(send_rate) if send_rate else None
+        send_burst = send_burst or os.getenv("SEND_BURST")
+        self.send_burst = float(send_burst) if send_burst else self.send_rate
+        self.send_queue_size = send_queue_size
+        self.send_queues = {}
+
+        # Hellos adaptativos por enlace
+        self.hello_scheduler = HelloScheduler(neighbors, hello_config)
+
+        # RTT medido con los hellos (timestamp + eco). Con dynamic_costs los
+        # costos medidos reemplazan a los de la configuración.
+        self.dynamic_costs = dynamic_costs or os.getenv("DYNAMIC_COSTS", "").lower() in ("1", "true")
+        self.link_costs = LinkCostTracker(cost_unit_ms=cost_unit_ms)
+        self.hello_echo = {}  # vecino -> (timestamp del vecino, momento de recepción)
+
+        # Payloads grandes por referencia a un blob en Redis (None = desactivado)
+        blob_threshold = blob_threshold or os.getenv("BLOB_THRESHOLD")
+        self.blob_threshold = int(blob_threshold) if blob_threshold else None
+        blob_compress_threshold = blob_compress_threshold or os.getenv("BLOB_COMPRESS_THRESHOLD")
+        self.blob_compress_threshold = int(blob_compress_threshold) if blob_compress_threshold else None
+        self.blob_ttl = blob_ttl
+        self.blobs = None
+
+        # Eventos de cambio de rutas (API local y opcionalmente un stream de Redis)
+        route_stream = route_stream or os.getenv("ROUTE_EVENTS_STREAM")
+        self.route_events = RouteEventPublisher(
+            self, stream=route_stream.format(node=node_id) if route_stream else None
+        )
+
+        # Fan-out de floods en el servidor con Lua: None, "list" o "set"
+        self.fanout_mode = fanout or os.getenv("FANOUT_MODE") or None
+        self.fanout = None
+
+        # Reconexión con backoff y buffer de salida mientras no hay conexión
+        self.connection = ConnectionManager(self)
+
+        # Planificador único para trabajos periódicos, diferidos y tareas sueltas
+        self.scheduler = Scheduler(self.logger)
+
+        # SPF fuera del event loop; la medición de bloqueos del loop es opcional
+        # (cada tick despierta al nodo) y no baja de 1 s
+        self.spf_executor = executor_from_env()
+        loop_monitor_interval = loop_monitor_interval or os.getenv("LOOP_MONITOR_INTERVAL")
+        self.loop_monitor = (
+            LoopLagMonitor(self.logger, interval=max(1.0, float(loop_monitor_interval)))
+            if loop_monitor_interval else None
+        )
+
+        # Momento de recepción del mensaje en proceso (para el trazado por salto)
+        self.last_receive_ts = time.time()
+
+        # Recarga en caliente de la adyacencia (archivo de topología o hash de Redis)
+        topology_key = topology_key or os.getenv("TOPOLOGY_KEY")
+        if topology_key or (watch_config and config_path):
+            self.topology_watcher = TopologyWatcher(self, config_path=config_path, redis_key=topology_key)
+        else:
+            self.topology_watcher = None
+
+        # Juntar los mensajes chicos hacia un mismo vecino en un solo PUBLISH (None = desactivado)
+        batch_window_ms = batch_window_ms or os.getenv("BATCH_WINDOW_MS")
+        batch_max_messages = batch_max_messages or os.getenv("BATCH_MAX_MESSAGES") or 32
+        if batch_window_ms:
+            self.batcher = OutboundBatcher(
+                self._publish_encoded, node_id,
+                window=float(batch_window_ms) / 1000,
+                max_messages=int(batch_max_messages),
+                max_bytes=batch_max_bytes
+            )
+        else:
+            self.batcher = None
+
+        # Mensajes publicados por tipo (para medir el costo de control)
+        self.sent_by_type = Counter()
+        self.unreceived = 0  # PUBLISH que no le llegaron a nadie (0 suscriptores)
+        self.started_at = time.time()
+
+        # Estado del nodo publicado en stats:<nodo> cada stats_interval s (None = desactivado)
+        stats_interval = stats_interval or os.getenv("NODE_STATS_INTERVAL")
+        self.stats_publisher = NodeStatsPublisher(self, float(stats_interval)) if stats_interval else None
+
+        # Enlaces cortados a propósito (set de Redis "a|b") para pruebas de fallas
+        link_blocker_key = link_blocker_key or os.getenv("LINK_BLOCKER_KEY")
+        self.link_blocker = LinkBlocker(self, link_blocker_key) if link_blocker_key else None
+
+        # Snapshots del estado de routing para reinicio en caliente
+        snapshot_dir = snapshot_dir or os.getenv("SNAPSHOT_DIR")
+        self.snapshots = SnapshotManager(self, snapshot_dir, snapshot_interval) if snapshot_dir else None
         
         # Canal propio del nodo (usando el nuevo formato)
-        self.my_channel = node_id  # ej: "sec30.grupo1.nodo1"
+        self.my_channel = self.channel_for(node_id)  # ej: "sec30.grupo1.nodo1"
         
         # Canales a los que suscribirse (vecinos)
-        self.neighbor_channels = list(neighbors.keys())
+        self.neighbor_channels = [self.channel_for(n) for n in neighbors]
         
         # Tabla de routing interna (nueva)
         self.routing_table = {}
@@ -40,29 +169,57 @@ class RedisNode:
         """Inicializar la tabla de routing con vecinos directos"""
         self.routing_table[self.node_id] = {}
         for neighbor, cost in self.neighbors.items():
-            self.routing_table[self.node_id][neighbor] = {
-                "weight": cost,
-                "time": 15  # Valor inicial del timer
-            }
+            self.routing_table[self.node_id][neighbor] = {"weight": cost}
     
+    def channel_for(self, node_id):
+        """Canal de un nodo; en cluster lleva hash tag del grupo (ej: "{sec30.grupo1}.nodo1")"""
+        return shard_channel(node_id) if self.cluster else node_id
+
     async def connect_redis(self):
         """Conectar a Redis"""
         try:
-            if self.password:
+            if self.cluster:
+                # Los nodos del cluster se descubren a partir de REDIS_HOST:REDIS_PORT
+                self.redis = RedisCluster(
+                    host=self.host,
+                    port=int(self.port),
+                    password=self.password,
+                    socket_keepalive=True
+                )
+                await self.redis.initialize()
+                self.sharded = ShardedPubSub(self.redis, self.password)
+            elif self.password:
                 self.redis = redis.Redis(
                     host=self.host, 
                     port=self.port, 
-                    password=self.password
+                    password=self.password,
+                    **REDIS_CONNECTION_OPTIONS
                 )
             else:
                 self.redis = redis.Redis(
                     host=self.host, 
-                    port=self.port
+                    port=self.port,
+                    **REDIS_CONNECTION_OPTIONS
                 )
             
             # Probar conexión
             await self.redis.ping()
-            self.logger.info(f"Conectado a Redis en {self.host}:{self.port}")
+
+            if self.fanout_mode and self.cluster:
+                # EVALSHA con PUBLISH no sabe de shards: en cluster se publica por vecino
+                self.logger.warning("Fan-out Lua no disponible con Redis Cluster, se ignora")
+            elif self.fanout_mode:
+                self.fanout = LuaFanout(self.redis, self.node_id, mode=self.fanout_mode)
+                await self.fanout.load()
+                await self.fanout.sync_adjacency(list(self.neighbors))
+
+            if self.blob_threshold:
+                self.blobs = BlobStore(
+                    self.redis, self.blob_threshold,
+                    compress_threshold=self.blob_compress_threshold,
+                    ttl=self.blob_ttl
+                )
+            self.logger.info(f"Conectado a Redis{' Cluster' if self.cluster else ''} en {self.host}:{self.port}")
             return True
             
         except Exception as e:
@@ -70,8 +227,17 @@ class RedisNode:
             return False
     
     async def listener(self):
-        """Escuchar mensajes en el canal propio"""
-        async with self.redis.pubsub() as pubsub:
+        """Escuchar mensajes en el canal propio (se vuelve a suscribir si se cae la conexión)"""
+        while self.running:
+            await self.connection.wait_connected()
+            try:
+                await self._listen()
+            except CONNECTION_ERRORS as e:
+                self.connection.connection_lost(e)
+
+    async def _listen(self):
+        pubsub = self.sharded.pubsub() if self.sharded else self.redis.pubsub()
+        async with pubsub:
             # Suscribirse al canal propio
             await pubsub.subscribe(self.my_channel)
             self.logger.info(f"Suscrito al canal: {self.my_channel}")
@@ -84,58 +250,287 @@ class RedisNode:
                     )
                     
                     if message and message["type"] == "message":
-                        # Decodificar mensaje JSON
+                        self.last_receive_ts = time.time()
                         try:
-                            message_data = json.loads(message["data"].decode())
-                            #self.logger.info(f"Mensaje recibido: {message_data}")
-                            
-                            # Procesar con el algoritmo de routing
-                            if hasattr(self.routing_algorithm, 'handle_message_async'):
-                                await self.routing_algorithm.handle_message_async(message_data)
-                            else:
-                                # Fallback al método síncrono
-                                self.routing_algorithm.handle_message(message_data)
-                            
+                            # json.loads acepta bytes: no hace falta decodificar a str
+                            items = unpack(json.loads(message["data"]))
                         except json.JSONDecodeError:
                             self.logger.error("Mensaje JSON mal formado")
-                        except Exception as e:
-                            self.logger.error(f"Error procesando mensaje: {e}")
-                            
+                            continue
+
+                        # Un sobre "batch" trae varios mensajes; cada uno se procesa por separado
+                        for item in items:
+                            try:
+                                # Se valida una sola vez: los algoritmos reciben un Message inmutable
+                                await self._dispatch(from_dict(item))
+                            except MessageError as e:
+                                self.logger.error(f"Mensaje inválido: {e}")
+                            except Exception as e:
+                                self.logger.error(f"Error procesando mensaje: {e}")
+
+                except CONNECTION_ERRORS:
+                    raise
                 except Exception as e:
                     self.logger.error(f"Error en listener: {e}")
                     await asyncio.sleep(1)
     
-    async def send_message(self, message, neighbor_id):
-        """Enviar mensaje a un vecino específico"""
+    async def _dispatch(self, message_data):
+        """Procesar un mensaje recibido con el algoritmo de routing"""
+        via = message_data.get("via")
+        if self.link_blocker and self.link_blocker.is_blocked(via):
+            # Enlace cortado: el mensaje nunca llegó
+            self.link_blocker.dropped_in += 1
+            return
+
+        # Cualquier mensaje de un vecino prueba que está vivo
+        if via in self.neighbors and hasattr(self.routing_algorithm, 'on_neighbor_activity'):
+            self.routing_algorithm.on_neighbor_activity(via)
+
+        if message_data.get("type") == "hello" and via in self.neighbors:
+            self._observe_hello(via, message_data)
+
+        # Procesar con el algoritmo de routing
+        if hasattr(self.routing_algorithm, 'handle_message_async'):
+            await self.routing_algorithm.handle_message_async(message_data)
+        else:
+            # Fallback al método síncrono
+            self.routing_algorithm.handle_message(message_data)
+
+    async def send_message(self, message, neighbor_id, confirm=False):
+        """Enviar mensaje a un vecino específico.
+
+        Con límite de tasa el mensaje se encola y se devuelve si entró en la
+        cola; con confirm=True se espera a que salga y se devuelve el
+        resultado del PUBLISH.
+        """
+        if self.blobs and self.blobs.should_externalize(message):
+            message = await self.blobs.externalize(message)
+        if self.send_rate:
+            queue = self._get_send_queue(neighbor_id)
+            if not confirm:
+                return queue.enqueue(message)
+            result = asyncio.get_running_loop().create_future()
+            if not queue.enqueue(message, result):
+                return False
+            return await result
+        return await self._publish(message, neighbor_id)
+
+    def _get_send_queue(self, neighbor_id):
+        """Cola de salida (creada bajo demanda) para un vecino"""
+        queue = self.send_queues.get(neighbor_id)
+        if queue is None:
+            queue = NeighborSendQueue(
+                neighbor_id, self._publish,
+                rate=self.send_rate,
+                burst=self.send_burst,
+                max_queue=self.send_queue_size
+            )
+            self.send_queues[neighbor_id] = queue
+        return queue
+
+    def get_send_stats(self):
+        """Descartes y retardo de encolamiento por vecino"""
+        return {neighbor: queue.stats() for neighbor, queue in self.send_queues.items()}
+
+    async def _publish(self, message, neighbor_id, batch=True):
+        """Publicar en el canal del vecino (batch=False: sin pasar por el batcher)"""
+        if self.link_blocker and self.link_blocker.is_blocked(neighbor_id):
+            self.link_blocker.dropped_out += 1
+            return False
+        if not self.connection.is_connected:
+            return self.connection.hold(message, neighbor_id)
         try:
-            target_channel = neighbor_id  # Usar el ID directo del nodo
-            message_str = json.dumps(message)
-            await self.redis.publish(target_channel, message_str)
-            self.logger.debug(f"Mensaje enviado a {neighbor_id}: {message}")
+            data = self._encode(message)
+        except Exception as e:
+            self.logger.error(f"Error enviando mensaje a {neighbor_id}: {e}")
+            return False
+        # Solo se agrupa el control: los datos salen solos para saber si el
+        # vecino los recibió, los trazados para que el tx de cada salto sea el
+        # real y los hellos para que la espera en la ventana no se sume al RTT
+        if (batch and self.batcher and is_control_message(message) and not is_traced(message)
+                and message.get("type") != "hello"):
+            return await self.batcher.add(neighbor_id, message, data)
+        return await self._publish_encoded(neighbor_id, data, [message])
+
+    async def _publish_encoded(self, neighbor_id, data, messages):
+        """PUBLISH de un mensaje ya serializado (o de un sobre con varios)"""
+        try:
+            target_channel = self.channel_for(neighbor_id)
+            if self.sharded:
+                receivers = await self.sharded.publish(target_channel, data)
+            else:
+                receivers = await self.redis.publish(target_channel, data)
+            for message in messages:
+                self.hello_scheduler.note_sent(neighbor_id, message.get("type") == "hello")
+                self.sent_by_type[message.get("type", "unknown")] += 1
+            if receivers == 0:
+                # Nadie escucha el canal: el vecino está caído o todavía no se suscribió
+                self.unreceived += 1
+                self.logger.debug(f"Sin suscriptores en el canal de {neighbor_id}")
+                return False
+            self.logger.debug(f"Mensaje enviado a {neighbor_id}: {messages}")
             return True
+        except CONNECTION_ERRORS as e:
+            self.connection.connection_lost(e)
+            return all([self.connection.hold(message, neighbor_id) for message in messages])
         except Exception as e:
             self.logger.error(f"Error enviando mensaje a {neighbor_id}: {e}")
             return False
     
-    async def flood_message(self, message, exclude_neighbor=None):
-        """Enviar mensaje a todos los vecinos"""
+    def _encode(self, message):
+        """Serializar un mensaje para publicarlo"""
+        if is_traced(message):
+            # Cada envío lleva su propio tx: no se puede reutilizar la serialización
+            message = record_send(message, self.node_id, time.time())
+        elif isinstance(message, Message):
+            return message.encode(self.node_id)
+        # "via" indica el vecino que entregó el mensaje (from es el origen)
+        return json.dumps({**message, "via": self.node_id})
+
+    async def flood_message(self, message, exclude_neighbor=None, neighbors=None):
+        """Enviar mensaje a todos los vecinos (o solo a `neighbors` si se indica)"""
+        targets = list(self.neighbors) if neighbors is None else list(neighbors)
+
+        # El payload grande se guarda una sola vez, no una vez por vecino
+        if self.blobs and self.blobs.should_externalize(message):
+            message = await self.blobs.externalize(message)
+        # Inmutable y con la serialización guardada: una sola codificación para todos los vecinos
+        message = as_message(message)
+
+        # Con colas por vecino el fan-out en el servidor no aplica: cada
+        # vecino tiene su propio límite de tasa. El modo "set" usa la adyacencia
+        # completa guardada en Redis, así que no sirve para un subconjunto.
+        # Con enlaces bloqueados se publica por vecino para poder descartar.
+        use_fanout = neighbors is None or (self.fanout and self.fanout.mode == "list")
+        if self.link_blocker and self.link_blocker.blocked:
+            use_fanout = False
+        if self.fanout and use_fanout and not self.send_rate and self.connection.is_connected:
+            try:
+                count = await self.fanout.publish(
+                    self._encode(message), targets, exclude_neighbor
+                )
+                for neighbor_id in targets:
+                    if neighbor_id != exclude_neighbor:
+                        self.hello_scheduler.note_sent(neighbor_id, False)
+                        self.sent_by_type[message.get("type", "unknown")] += 1
+                return count
+            except Exception as e:
+                self.logger.error(f"Error en fan-out Lua, enviando por vecino: {e}")
+
         sent_count = 0
-        for neighbor_id in self.neighbors:
+        for neighbor_id in targets:
             if neighbor_id != exclude_neighbor:
                 if await self.send_message(message, neighbor_id):
                     sent_count += 1
         return sent_count
     
+    async def resolve_payload(self, message):
+        """Payload del mensaje; si viene por referencia se descarga del blob"""
+        if "payload_ref" not in message:
+            return message.get("payload")
+        if self.blobs is None:
+            self.blobs = BlobStore(self.redis, threshold=float("inf"))
+        return await self.blobs.resolve(message)
+
+    def acknowledge(self, message):
+        """Recibo de entrega para el generador de carga, si el mensaje trae ack_channel"""
+        channel = message.get("ack_channel")
+        if not channel:
+            return
+        receipt = json.dumps({
+            "id": message.get("load_id"),
+            "node": self.node_id,
+            "rx": self.last_receive_ts
+        })
+        self.spawn(self._publish_receipt(channel, receipt))
+
+    async def _publish_receipt(self, channel, receipt):
+        try:
+            if self.sharded:
+                await self.sharded.publish(channel, receipt)
+            else:
+                await self.redis.publish(channel, receipt)
+        except Exception as e:
+            self.logger.debug(f"Error publicando recibo en {channel}: {e}")
+
     async def send_hello(self):
-        """Enviar mensajes hello a todos los vecinos"""
-        for neighbor_id in self.neighbors:
+        """Enviar hello a los vecinos que lo necesiten según el HelloScheduler"""
+        for neighbor_id in self.hello_scheduler.due():
+            now = time.monotonic()
             hello_message = {
                 "type": "hello",
                 "from": self.node_id,
                 "to": neighbor_id,
-                "hops": self.neighbors[neighbor_id]
+                "hops": self.get_link_cost(neighbor_id),
+                "ts": now
             }
+            # Eco del último hello del vecino con el tiempo que lo retuvimos
+            echo = self.hello_echo.pop(neighbor_id, None)
+            if echo:
+                peer_ts, received_at = echo
+                hello_message["echo"] = [peer_ts, now - received_at]
             await self.send_message(hello_message, neighbor_id)
+
+    def _observe_hello(self, neighbor_id, message):
+        """Guardar el timestamp para el eco y medir RTT si el hello trae uno"""
+        now = time.monotonic()
+        if "ts" in message:
+            self.hello_echo[neighbor_id] = (message["ts"], now)
+
+        echo = message.get("echo")
+        if not echo:
+            return
+        sent_at, held = echo
+        rtt = now - sent_at - held
+        if rtt < 0:
+            return
+
+        cost = self.link_costs.add_sample(neighbor_id, rtt)
+        if cost is not None and self.dynamic_costs:
+            self.logger.info(f"Costo medido hacia {neighbor_id}: {cost} ({self.link_costs.stats()[neighbor_id]})")
+            if hasattr(self.routing_algorithm, 'on_link_cost_change'):
+                self.routing_algorithm.on_link_cost_change(neighbor_id, cost)
+
+    def apply_neighbors(self, new_neighbors):
+        """Aplicar una adyacencia nueva sin reiniciar: solo las aristas que cambiaron"""
+        added, removed, changed = diff_routes(self.neighbors, new_neighbors)
+        own = self.routing_table.setdefault(self.node_id, {})
+
+        for neighbor in removed:
+            del self.neighbors[neighbor]
+            own.pop(neighbor, None)
+            self.hello_scheduler.remove_link(neighbor)
+            self.hello_echo.pop(neighbor, None)
+            queue = self.send_queues.pop(neighbor, None)
+            if queue:
+                queue.close()
+        for neighbor, cost in added.items():
+            self.neighbors[neighbor] = cost
+            own[neighbor] = {"weight": cost}
+            self.hello_scheduler.add_link(neighbor)
+        for neighbor, cost in changed.items():
+            self.neighbors[neighbor] = cost
+            if neighbor in own:
+                own[neighbor]["weight"] = cost
+        self.neighbor_channels = [self.channel_for(n) for n in self.neighbors]
+
+        self.logger.info(
+            f"Topología recargada: +{sorted(added)} -{sorted(removed)} ~{sorted(changed)}"
+        )
+        if self.fanout and self.fanout.mode == "set":
+            self.spawn(self.fanout.sync_adjacency(list(self.neighbors)))
+        if hasattr(self.routing_algorithm, 'on_neighbors_changed'):
+            self.routing_algorithm.on_neighbors_changed(added, removed, changed)
+
+    def spawn(self, coro, name=None):
+        """Crear una tarea suelta con referencia (se cancela al detener el nodo)"""
+        return self.scheduler.spawn(coro, name)
+
+    def get_link_cost(self, neighbor_id):
+        """Costo del enlace: el medido si dynamic_costs está activo, si no el configurado"""
+        if self.dynamic_costs and neighbor_id in self.link_costs.advertised:
+            return self.link_costs.advertised[neighbor_id]
+        return self.neighbors[neighbor_id]
     
     async def start(self):
         """Iniciar el nodo"""
@@ -145,16 +540,36 @@ class RedisNode:
             return False
         
         self.logger.info(f"Nodo {self.node_id} iniciado. Vecinos: {self.neighbors}")
+
+        if self.loop_monitor:
+            self.scheduler.call_every(
+                self.loop_monitor.interval, self.loop_monitor.tick, name="loop_monitor", delay=0
+            )
+
+        if self.topology_watcher:
+            self.topology_watcher.start()
+
+        if self.link_blocker:
+            self.link_blocker.start()
+
+        if self.stats_publisher:
+            self.stats_publisher.start()
+
+        if self.snapshots:
+            # Reinicio en caliente: se reenvía con el estado viejo mientras se revalida
+            self.snapshots.restore()
+            self.scheduler.call_every(self.snapshots.interval, self.snapshots.checkpoint, name="snapshot")
         
-        # Iniciar algoritmo de routing
+        # Iniciar algoritmo de routing (registra sus trabajos en el scheduler)
         routing_task = asyncio.create_task(self.routing_algorithm.start())
         
         # Iniciar listener
         listener_task = asyncio.create_task(self.listener())
+        scheduler_task = asyncio.create_task(self.scheduler.run())
         
         # Esperar a que terminen (o hasta que se detenga)
         try:
-            await asyncio.gather(routing_task, listener_task)
+            await asyncio.gather(routing_task, listener_task, scheduler_task)
         except asyncio.CancelledError:
             self.logger.info("Nodo detenido")
         except Exception as e:
@@ -163,6 +578,26 @@ class RedisNode:
     async def stop(self):
         """Detener el nodo"""
         self.running = False
+        for queue in self.send_queues.values():
+            queue.close()
+        if self.snapshots:
+            await self.snapshots.checkpoint()
+        if self.batcher:
+            await self.batcher.close()
+            self.logger.info(f"Batching: {self.batcher.stats()}")
+        self.spf_executor.shutdown()
+        self.connection.close()
+        self.logger.info(f"Conexión: {self.connection.stats()}")
+        self.logger.info(f"Enviados por tipo: {dict(self.sent_by_type)}, sin receptor: {self.unreceived}")
+        if self.link_blocker:
+            self.logger.info(f"Enlaces bloqueados: {self.link_blocker.stats()}")
+        self.logger.info(f"Scheduler: {self.scheduler.stats()}")
+        self.scheduler.shutdown()
+        self.logger.info(f"SPF: {self.spf_executor.stats()}")
+        if self.loop_monitor:
+            self.logger.info(f"Loop: {self.loop_monitor.stats()}")
+        if self.sharded:
+            self.logger.info(f"Publicaciones por shard: {self.sharded.stats()}")
         if hasattr(self, 'redis'):
             await self.redis.close()
         self.logger.info("Nodo detenido")
\ No newline at end of file
@@ -0,0 +1,45 @@
+import json
+import time
+
+
+class NodeStatsPublisher:
+    """
+    Publica periódicamente el estado del nodo en el hash stats:<nodo> para
+    herramientas externas (churn_bench.py): mensajes enviados por tipo,
+    cálculos de SPF, rutas actuales y la hora exacta del último cambio de
+    rutas (tomada del evento de RouteEventPublisher, no del tick).
+    """
+
+    def __init__(self, node, interval=1.0, prefix="stats:"):
+        self.node = node
+        self.interval = interval
+        self.key = prefix + node.node_id
+        self.last_route_change = None
+
+    def start(self):
+        self.node.route_events.subscribe(self._on_route_event)
+        self.node.scheduler.call_every(self.interval, self.publish, name="node_stats", delay=0)
+
+    def _on_route_event(self, event):
+        self.last_route_change = event["ts"]
+        # Publicar ya para que el observador no espere un intervalo completo
+        self.node.spawn(self.publish())
+
+    async def publish(self):
+        route_events = self.node.route_events
+        try:
+            mapping = {
+                "ts": time.time(),
+                "started_at": self.node.started_at,
+                "sent": json.dumps(self.node.sent_by_type),
+                "spf": json.dumps(self.node.spf_executor.stats()),
+                "routes": json.dumps(route_events.routes, separators=(",", ":")),
+                "route_seq": route_events.sequence,
+                "last_route_change": self.last_route_change or 0
+            }
+            if self.node.batcher:
+                mapping["batch"] = json.dumps(self.node.batcher.stats())
+            await self.node.redis.hset(self.key, mapping=mapping)
+            await self.node.redis.expire(self.key, max(60, int(self.interval * 10)))
+        except Exception as e:
+            self.node.logger.debug(f"Error publicando estadísticas: {e}")
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections import deque
+
+
+def is_control_message(message):
+    """
+    Hello, LSA y actualizaciones de aristas son control; solo los mensajes
+    con payload son datos de usuario.
+    """
+    return not (
+        message.get("type") == "message"
+        and ("payload" in message or "payload_ref" in message)
+    )
+
+
+class TokenBucket:
+    """Token bucket clásico: `rate` tokens por segundo con ráfagas de `burst`"""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    def time_until_token(self):
+        """Segundos hasta que haya un token disponible (0 si ya hay)"""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self.tokens -= 1
+
+
+class NeighborSendQueue:
+    """
+    Cola de salida hacia un vecino con limitación de tasa.
+
+    Hay una cola de control y otra de datos; el control siempre sale
+    primero para que una ráfaga de datos no deje sin hellos ni LSAs al
+    vecino.
+    """
+
+    def __init__(self, neighbor_id, publish, rate, burst, max_queue=1000):
+        self.neighbor_id = neighbor_id
+        self.publish = publish
+        self.bucket = TokenBucket(rate, burst)
+        self.max_queue = max_queue
+        self.control = deque()
+        self.data = deque()
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+        # Métricas
+        self.sent = 0
+        self.dropped = 0
+        self.total_delay = 0.0
+        self.max_delay = 0.0
+
+    def enqueue(self, message, result=None):
+        """Encolar un mensaje; devuelve False si la cola está llena.
+
+        result (un Future, opcional) recibe el resultado del PUBLISH cuando
+        el mensaje sale de la cola.
+        """
+        queue = self.control if is_control_message(message) else self.data
+        if len(queue) >= self.max_queue:
+            self.dropped += 1
+            return False
+
+        queue.append((time.monotonic(), message, result))
+        self.wakeup.set()
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        return True
+
+    async def run(self):
+        """Drenar las colas respetando el token bucket"""
+        while True:
+            if not self.control and not self.data:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+
+            wait = self.bucket.time_until_token()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            self.bucket.consume()
+
+            queue = self.control if self.control else self.data
+            enqueued_at, message, result = queue.popleft()
+
+            delay = time.monotonic() - enqueued_at
+            self.total_delay += delay
+            self.max_delay = max(self.max_delay, delay)
+            self.sent += 1
+
+            delivered = await self.publish(message, self.neighbor_id)
+            if result is not None and not result.done():
+                result.set_result(bool(delivered))
+
+    def stats(self):
+        return {
+            "queued_control": len(self.control),
+            "queued_data": len(self.data),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "avg_delay_ms": round(self.total_delay / self.sent * 1000, 3) if self.sent else 0.0,
+            "max_delay_ms": round(self.max_delay * 1000, 3)
+        }
+
+    def close(self):
+        # Los que esperaban el resultado de un mensaje que ya no va a salir
+        for _, _, result in (*self.control, *self.data):
+            if result is not None and not result.done():
+                result.set_result(False)
+        self.control.clear()
+        self.data.clear()
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
@@ -0,0 +1,71 @@
+class RttEstimator:
+    """
+    RTT suavizado por vecino (EWMA al estilo RFC 6298): srtt sigue la media
+    y rttvar la variación (jitter).
+    """
+
+    def __init__(self, alpha=0.125, beta=0.25):
+        self.alpha = alpha
+        self.beta = beta
+        self.srtt = None
+        self.rttvar = None
+        self.samples = 0
+
+    def update(self, sample):
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar = (1 - self.beta) * self.rttvar + self.beta * abs(self.srtt - sample)
+            self.srtt = (1 - self.alpha) * self.srtt + self.alpha * sample
+        self.samples += 1
+
+    def stats(self):
+        return {
+            "srtt_ms": round(self.srtt * 1000, 3) if self.srtt is not None else None,
+            "rttvar_ms": round(self.rttvar * 1000, 3) if self.rttvar is not None else None,
+            "samples": self.samples
+        }
+
+
+class LinkCostTracker:
+    """
+    Convierte RTT medidos en costos de enlace con histéresis: el costo
+    anunciado solo cambia si la diferencia supera un umbral absoluto y uno
+    relativo, así pequeñas variaciones no disparan SPF en toda la red.
+    """
+
+    def __init__(self, cost_unit_ms=1.0, min_samples=3, hysteresis_abs=2, hysteresis_pct=0.25):
+        self.cost_unit_ms = cost_unit_ms
+        self.min_samples = min_samples
+        self.hysteresis_abs = hysteresis_abs
+        self.hysteresis_pct = hysteresis_pct
+        self.estimators = {}
+        self.advertised = {}
+
+    def add_sample(self, neighbor, rtt):
+        """
+        Registrar una muestra de RTT (segundos). Devuelve el nuevo costo si
+        hay que anunciarlo, o None si no cambia lo suficiente.
+        """
+        estimator = self.estimators.setdefault(neighbor, RttEstimator())
+        estimator.update(rtt)
+        if estimator.samples < self.min_samples:
+            return None
+
+        # Penalizar el jitter: un enlace inestable cuesta más
+        cost = max(1, round((estimator.srtt + estimator.rttvar) * 1000 / self.cost_unit_ms))
+        current = self.advertised.get(neighbor)
+        if current is not None:
+            delta = abs(cost - current)
+            if delta < self.hysteresis_abs or delta < current * self.hysteresis_pct:
+                return None
+
+        self.advertised[neighbor] = cost
+        return cost
+
+    def stats(self):
+        return {
+            neighbor: {**estimator.stats(), "cost": self.advertised.get(neighbor)}
+            for neighbor, estimator in self.estimators.items()
+        }
@@ -0,0 +1,165 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+
+
+class Job:
+    """Trabajo programado: periódico (interval) o de una sola vez"""
+
+    def __init__(self, name, callback, interval=None, jitter=0.0):
+        self.name = name
+        self.callback = callback
+        self.interval = interval  # número, función sin argumentos o None
+        self.jitter = jitter
+        self.next_run = 0.0
+        self.cancelled = False
+
+        # Métricas
+        self.runs = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def cancel(self):
+        self.cancelled = True
+
+    def next_delay(self):
+        interval = self.interval() if callable(self.interval) else self.interval
+        if self.jitter:
+            interval *= 1 + random.uniform(-self.jitter, self.jitter)
+        return interval
+
+    def stats(self):
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "avg_ms": round(self.total_time / self.runs * 1000, 3) if self.runs else 0.0,
+            "max_ms": round(self.max_time * 1000, 3)
+        }
+
+
+class Scheduler:
+    """
+    Un solo planificador por nodo para todos los trabajos periódicos y
+    diferidos (hellos, timers, LSAs, checkpoints, reportes).
+
+    Los trabajos viven en un heap ordenado por vencimiento y una sola tarea
+    duerme hasta el próximo; un nodo inactivo no despierta más que eso. Un
+    trabajo periódico se vuelve a programar cuando termina, así nunca hay
+    dos ejecuciones del mismo trabajo a la vez. Las tareas sueltas se crean
+    con spawn() para que quede una referencia y se cancelen al detener.
+    """
+
+    def __init__(self, logger):
+        self.logger = logger
+        self.heap = []
+        self.jobs = []
+        self.counter = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.tasks = set()
+        self.spawned = 0
+        self.closed = False
+
+    def call_every(self, interval, callback, name=None, jitter=0.0, delay=None):
+        """Ejecutar callback (función o corrutina) cada interval segundos.
+
+        interval puede ser una función para intervalos que cambian (ej. el
+        tick del HelloScheduler). delay es la espera antes de la primera
+        ejecución (por defecto, un intervalo).
+        """
+        job = Job(name or getattr(callback, "__name__", "job"), callback, interval, jitter)
+        self.jobs.append(job)
+        self._push(job, job.next_delay() if delay is None else delay)
+        return job
+
+    def call_later(self, delay, callback, name=None):
+        """Ejecutar callback una sola vez dentro de delay segundos"""
+        job = Job(name or getattr(callback, "__name__", "job"), callback)
+        self.jobs.append(job)
+        self._push(job, delay)
+        return job
+
+    def spawn(self, coro, name=None):
+        """create_task guardando la referencia hasta que termine"""
+        task = asyncio.create_task(coro, name=name)
+        self.tasks.add(task)
+        self.spawned += 1
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Error en tarea {task.get_name()}: {task.exception()}")
+
+    def _push(self, job, delay):
+        job.next_run = time.monotonic() + delay
+        heapq.heappush(self.heap, (job.next_run, next(self.counter), job))
+        # Despertar al bucle por si este vence antes que el que esperaba
+        self.wakeup.set()
+
+    async def run(self):
+        while not self.closed:
+            while self.heap and self.heap[0][2].cancelled:
+                self._discard(heapq.heappop(self.heap)[2])
+
+            timeout = self.heap[0][0] - time.monotonic() if self.heap else None
+            if timeout is None or timeout > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, job = heapq.heappop(self.heap)
+            if asyncio.iscoroutinefunction(job.callback):
+                self.spawn(self._run_async(job), name=job.name)
+            else:
+                started = time.perf_counter()
+                try:
+                    job.callback()
+                except Exception as e:
+                    job.errors += 1
+                    self.logger.error(f"Error en trabajo {job.name}: {e}")
+                self._finish(job, time.perf_counter() - started)
+
+    async def _run_async(self, job):
+        started = time.perf_counter()
+        try:
+            await job.callback()
+        except Exception as e:
+            job.errors += 1
+            self.logger.error(f"Error en trabajo {job.name}: {e}")
+        finally:
+            self._finish(job, time.perf_counter() - started)
+
+    def _finish(self, job, elapsed):
+        job.runs += 1
+        job.total_time += elapsed
+        job.max_time = max(job.max_time, elapsed)
+        if job.interval is not None and not job.cancelled:
+            self._push(job, job.next_delay())
+        else:
+            self._discard(job)
+
+    def _discard(self, job):
+        if job in self.jobs:
+            self.jobs.remove(job)
+
+    def stats(self):
+        """Ejecuciones y duración por trabajo, más las tareas sueltas vivas"""
+        per_job = {job.name: job.stats() for job in self.jobs if not job.cancelled}
+        return {"jobs": per_job, "tasks": len(self.tasks), "spawned": self.spawned}
+
+    def shutdown(self):
+        self.closed = True
+        self.wakeup.set()
+        for job in self.jobs:
+            job.cancel()
+        self.jobs.clear()
+        self.heap.clear()
+        for task in list(self.tasks):
+            task.cancel()
@@ -0,0 +1,130 @@
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import time
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_path(directory, node_id):
+    return os.path.join(directory, f"{node_id}.snapshot.json.gz")
+
+
+def write_snapshot(path, state):
+    """
+    Escribir el snapshot de forma atómica: archivo temporal en el mismo
+    directorio, fsync y rename. Un lector nunca ve un archivo a medias.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    data = gzip.compress(
+        json.dumps(state, separators=(",", ":")).encode(),
+        compresslevel=1
+    )
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(data)
+
+
+def algorithm_name(algorithm):
+    """Nombre con módulo: lsr_simple y planb tienen las dos una clase SimpleLSR"""
+    return f"{type(algorithm).__module__}.{type(algorithm).__name__}"
+
+
+def read_snapshot(path):
+    """Leer un snapshot; None si no existe o está dañado"""
+    try:
+        with open(path, "rb") as f:
+            state = json.loads(gzip.decompress(f.read()))
+    except (OSError, ValueError):
+        return None
+    if state.get("version") != SNAPSHOT_VERSION:
+        return None
+    return state
+
+
+class SnapshotManager:
+    """
+    Checkpoints periódicos del estado de routing para reinicio en caliente.
+
+    El algoritmo expone export_state() (copia barata tomada en el event loop)
+    e import_state(state) (carga marcando las entradas como stale). La
+    serialización y la escritura a disco se hacen en un hilo.
+    """
+
+    def __init__(self, node, directory, interval=30):
+        self.node = node
+        self.path = snapshot_path(directory, node.node_id)
+        self.interval = interval
+
+    @property
+    def supported(self):
+        return hasattr(self.node.routing_algorithm, "export_state")
+
+    def restore(self):
+        """Cargar el snapshot (si existe) en el algoritmo de routing"""
+        if not self.supported:
+            return False
+
+        state = read_snapshot(self.path)
+        if state is None:
+            return False
+
+        # El nodo pudo reiniciar con otro -a y el mismo --snapshot-dir
+        algorithm = self.node.routing_algorithm
+        if state.get("algorithm") != algorithm_name(algorithm):
+            self.node.logger.warning(
+                f"Snapshot {self.path} de otro algoritmo ({state.get('algorithm')}), "
+                f"se arranca sin estado previo"
+            )
+            return False
+
+        age = time.time() - state["saved_at"]
+        try:
+            algorithm.import_state(state["routing"])
+        except Exception as e:
+            self.node.logger.warning(f"Snapshot {self.path} inválido ({e!r}), se arranca sin estado previo")
+            # Descartar lo que se haya cargado a medias
+            if hasattr(algorithm, "purge_stale"):
+                algorithm.purge_stale()
+            return False
+        self.node.logger.info(
+            f"Snapshot restaurado desde {self.path} (antigüedad {age:.1f}s), "
+            f"entradas marcadas como stale hasta revalidar"
+        )
+
+        stale_timeout = getattr(self.node.routing_algorithm, "stale_timeout", None)
+        if stale_timeout:
+            self.node.scheduler.call_later(
+                stale_timeout, self.node.routing_algorithm.purge_stale, name="purge_stale"
+            )
+        return True
+
+    async def checkpoint(self):
+        """Guardar un snapshot sin bloquear el event loop"""
+        if not self.supported:
+            return
+        state = {
+            "version": SNAPSHOT_VERSION,
+            "node_id": self.node.node_id,
+            "algorithm": algorithm_name(self.node.routing_algorithm),
+            "saved_at": time.time(),
+            "routing": self.node.routing_algorithm.export_state()
+        }
+        try:
+            size = await asyncio.to_thread(write_snapshot, self.path, state)
+            self.node.logger.debug(f"Snapshot guardado en {self.path} ({size} bytes)")
+        except OSError as e:
+            self.node.logger.error(f"Error guardando snapshot: {e}")
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+
+from src.utils.config_loader import load_config, get_neighbors
+from src.utils.route_events import diff_routes
+
+
+class TopologyWatcher:
+    """
+    Recarga en caliente la adyacencia propia desde el archivo de topología
+    o desde un hash de Redis (campo = id del nodo, valor = JSON {vecino: costo}).
+
+    Solo cuando la adyacencia cambió se llama a RedisNode.apply_neighbors,
+    que aplica las aristas agregadas, quitadas o con otro costo sin
+    reiniciar el nodo.
+    """
+
+    def __init__(self, node, config_path=None, redis_key=None, interval=2.0):
+        self.node = node
+        self.config_path = config_path
+        self.redis_key = redis_key
+        self.interval = interval
+        self.last_mtime = None
+        self.last_raw = None
+        self.job = None
+        self.reloads = 0
+
+        if config_path and os.path.exists(config_path):
+            self.last_mtime = os.stat(config_path).st_mtime_ns
+
+    def start(self):
+        source = f"hash {self.redis_key}" if self.redis_key else self.config_path
+        self.node.logger.info(f"Vigilando cambios de topología en {source}")
+        self.job = self.node.scheduler.call_every(self.interval, self.check, name="topology_watch")
+
+    async def _load(self):
+        """Adyacencia propia si la fuente cambió desde la última vez, si no None"""
+        if self.redis_key:
+            raw = await self.node.redis.hget(self.redis_key, self.node.node_id)
+            if raw is None or raw == self.last_raw:
+                return None
+            neighbors = json.loads(raw)
+            self.last_raw = raw
+            return neighbors
+
+        mtime = os.stat(self.config_path).st_mtime_ns
+        if mtime == self.last_mtime:
+            return None
+        topo_config = await asyncio.to_thread(load_config, self.config_path)
+        self.last_mtime = mtime
+        return get_neighbors(topo_config, self.node.node_id)
+
+    async def check(self):
+        try:
+            neighbors = await self._load()
+        except (OSError, ValueError) as e:
+            # Archivo a medio escribir o JSON inválido: se reintenta en el próximo tick
+            self.node.logger.error(f"Error leyendo topología: {e}")
+            return
+        if neighbors is None:
+            return
+
+        added, removed, changed = diff_routes(self.node.neighbors, neighbors)
+        if added or removed or changed:
+            self.reloads += 1
+            self.node.apply_neighbors(neighbors)
+
+    def stop(self):
+        if self.job:
+            self.job.cancel()
@@ -0,0 +1,65 @@
+import struct
+
+# Archivo append-only: cabecera mágica y luego registros
+#   <timestamp_ns: u64><len_canal: u16><len_datos: u32><canal><datos>
+MAGIC = b"RCAP1\n"
+RECORD_HEADER = struct.Struct("<QHI")
+
+
+class CaptureWriter:
+    """Escritor de capturas; agrega al final si el archivo ya existe"""
+
+    def __init__(self, path):
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        self.records = 0
+
+    def write(self, timestamp_ns, channel, data):
+        self.file.write(RECORD_HEADER.pack(timestamp_ns, len(channel), len(data)))
+        self.file.write(channel)
+        self.file.write(data)
+        self.records += 1
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read_capture(path):
+    """Iterar (timestamp_ns, canal, datos) de un archivo de captura"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} no es un archivo de captura")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                # Fin de archivo (o último registro truncado por un corte)
+                return
+            timestamp_ns, channel_len, data_len = RECORD_HEADER.unpack(header)
+            channel = f.read(channel_len)
+            data = f.read(data_len)
+            if len(data) < data_len:
+                return
+            yield timestamp_ns, channel, data
+
+
+def parse_renames(specs):
+    """Convertir ["viejo:nuevo", ...] en una lista de (bytes, bytes)"""
+    renames = []
+    for spec in specs or []:
+        old, sep, new = spec.partition(":")
+        if not sep:
+            raise ValueError(f"Renombre inválido (se espera viejo:nuevo): {spec}")
+        renames.append((old.encode(), new.encode()))
+    return renames
+
+
+def rename_channel(channel, renames):
+    """Reemplazar el primer prefijo que coincida"""
+    for old, new in renames:
+        if channel.startswith(old):
+            return new + channel[len(old):]
+    return channel
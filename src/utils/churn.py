@@ -0,0 +1,253 @@
+import asyncio
+import json
+import random
+import signal
+import subprocess
+import time
+
+from src.algorithms.dijkstra import shortest_path_tree
+from src.network.link_blocker import link_id
+from src.utils.stats import summarize
+
+# Falla -> acción que la revierte
+RESTORE = {"kill": "restart", "pause": "resume", "link_down": "link_up"}
+
+
+def links_of(config):
+    """Enlaces sin dirección de la topología ("a|b")"""
+    return sorted({link_id(a, b) for a, neighbors in config.items() for b in neighbors})
+
+
+def make_schedule(config, count, seed=None, kinds=("kill", "pause", "link_down")):
+    """
+    Lista reproducible de fallas con su restauración a continuación:
+    [{"kind": "link_down", "target": "a|b"}, {"kind": "link_up", ...}, ...]
+    """
+    rng = random.Random(seed)
+    nodes = sorted(config)
+    links = links_of(config)
+    schedule = []
+    for _ in range(count):
+        kind = rng.choice(kinds)
+        target = rng.choice(links) if kind == "link_down" else rng.choice(nodes)
+        schedule.append({"kind": kind, "target": target})
+        schedule.append({"kind": RESTORE[kind], "target": target})
+    return schedule
+
+
+def effective_graph(config, down_nodes, blocked_links):
+    """Topología que debería verse: sin nodos caídos/pausados ni enlaces cortados"""
+    graph = {}
+    for node, neighbors in config.items():
+        if node in down_nodes:
+            continue
+        graph[node] = {
+            neighbor: cost for neighbor, cost in neighbors.items()
+            if neighbor not in down_nodes and link_id(node, neighbor) not in blocked_links
+        }
+    return graph
+
+
+def expected_costs(graph, source):
+    """{destino: costo} esperado desde source (ground truth)"""
+    distances, _, _ = shortest_path_tree(graph, source)
+    return {dest: cost for dest, cost in distances.items() if dest != source}
+
+
+def reported_costs(routes):
+    """{destino: costo} de la tabla publicada por el nodo (sin rutas de área "x.*")"""
+    return {dest: route["cost"] for dest, route in routes.items() if not dest.endswith(".*")}
+
+
+def counter_delta(before, after):
+    """Diferencia de contadores; si el nodo reinició (bajó el contador) se toma el valor nuevo"""
+    return after - before if after >= before else after
+
+
+class ChurnHarness:
+    """
+    Inyecta fallas en una red lanzada con HeadlessLauncher y mide cuánto
+    tarda en reconverger.
+
+    Los nodos deben correr con --stats-interval y --link-blocker. Después de
+    cada evento se leen los hashes stats:<nodo> hasta que todos los nodos
+    vivos tengan los mismos costos que Dijkstra sobre la topología efectiva.
+    El tiempo de reconvergencia es el último cambio de rutas de algún nodo
+    después del evento; también se cuentan los mensajes de control y los
+    SPF que costó.
+    """
+
+    def __init__(self, redis_client, launcher, config, blocker_key="churn:blocked",
+                 stats_prefix="stats:", poll_interval=0.2):
+        self.redis = redis_client
+        self.launcher = launcher
+        self.config = config
+        self.blocker_key = blocker_key
+        self.stats_prefix = stats_prefix
+        self.poll_interval = poll_interval
+        self.dead = set()
+        self.paused = set()
+        self.blocked = set()
+
+    @property
+    def live_nodes(self):
+        return [n for n in self.config if n not in self.dead and n not in self.paused]
+
+    async def snapshot(self):
+        """Estado publicado por cada nodo: {nodo: {...}} (sin los que no tienen hash)"""
+        nodes = list(self.config)
+        pipe = self.redis.pipeline()
+        for node in nodes:
+            pipe.hgetall(self.stats_prefix + node)
+        replies = await pipe.execute()
+
+        stats = {}
+        for node, raw in zip(nodes, replies):
+            if not raw:
+                continue
+            raw = {
+                (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+                for k, v in raw.items()
+            }
+            stats[node] = {
+                "ts": float(raw["ts"]),
+                "started_at": float(raw["started_at"]),
+                "sent": json.loads(raw["sent"]),
+                "spf_runs": json.loads(raw["spf"])["runs"],
+                "routes": json.loads(raw["routes"]),
+                "last_route_change": float(raw["last_route_change"])
+            }
+        return stats
+
+    def mismatches(self, stats, since):
+        """Nodos vivos cuyas rutas no coinciden con la topología efectiva (o sin datos frescos)"""
+        graph = effective_graph(self.config, self.dead | self.paused, self.blocked)
+        wrong = []
+        for node in self.live_nodes:
+            state = stats.get(node)
+            if state is None or state["ts"] < since:
+                wrong.append(node)
+            elif reported_costs(state["routes"]) != expected_costs(graph, node):
+                wrong.append(node)
+        return wrong
+
+    async def wait_converged(self, since, timeout):
+        """(stats, nodos que no coinciden); lista vacía si convergió antes del timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            stats = await self.snapshot()
+            wrong = self.mismatches(stats, since)
+            if not wrong or time.monotonic() >= deadline:
+                return stats, wrong
+            await asyncio.sleep(self.poll_interval)
+
+    async def apply(self, kind, target):
+        process = self.launcher.processes.get(target)
+        if kind == "kill":
+            process.send_signal(signal.SIGKILL)
+            await asyncio.to_thread(process.wait)
+            await self.redis.delete(self.stats_prefix + target)
+            self.dead.add(target)
+        elif kind == "restart":
+            self.launcher.spawn(target, append=True)
+            self.dead.discard(target)
+        elif kind == "pause":
+            process.send_signal(signal.SIGSTOP)
+            self.paused.add(target)
+        elif kind == "resume":
+            process.send_signal(signal.SIGCONT)
+            self.paused.discard(target)
+        elif kind == "link_down":
+            await self.redis.sadd(self.blocker_key, target)
+            self.blocked.add(target)
+        elif kind == "link_up":
+            await self.redis.srem(self.blocker_key, target)
+            self.blocked.discard(target)
+        else:
+            raise ValueError(f"Evento desconocido: {kind}")
+
+    async def run_event(self, kind, target, timeout):
+        before = await self.snapshot()
+        started = time.time()
+        await self.apply(kind, target)
+        after, wrong = await self.wait_converged(started, timeout)
+
+        changes = [
+            state["last_route_change"] - started
+            for node, state in after.items()
+            if node in self.live_nodes and state["last_route_change"] >= started
+        ]
+
+        by_type = {}
+        spf_runs = 0
+        for node in self.live_nodes:
+            state = after.get(node)
+            if state is None:
+                continue
+            old = before.get(node)
+            if old is not None and old["started_at"] != state["started_at"]:
+                old = None  # reinició: todo lo contado es posterior al evento
+            for message_type, count in state["sent"].items():
+                previous = old["sent"].get(message_type, 0) if old else 0
+                by_type[message_type] = by_type.get(message_type, 0) + counter_delta(previous, count)
+            spf_runs += counter_delta(old["spf_runs"] if old else 0, state["spf_runs"])
+
+        return {
+            "kind": kind,
+            "target": target,
+            "converged": not wrong,
+            "reconvergence_s": None if wrong else round(max(changes, default=0.0), 3),
+            "not_converged": wrong,
+            "control_messages": sum(c for t, c in by_type.items() if t != "message"),
+            "sent_by_type": by_type,
+            "spf_runs": spf_runs
+        }
+
+    async def run(self, schedule, timeout=30.0, settle=1.0, report=None):
+        """Aplicar el calendario evento por evento; devuelve los resultados y un resumen"""
+        await self.redis.delete(self.blocker_key)
+        _, wrong = await self.wait_converged(0, timeout)
+        if wrong:
+            raise RuntimeError(f"La red no convergió antes de empezar: {wrong}")
+
+        results = []
+        for event in schedule:
+            result = await self.run_event(event["kind"], event["target"], timeout)
+            results.append(result)
+            if report:
+                report(result)
+            await asyncio.sleep(settle)
+        return {"events": results, "summary": self.summary(results)}
+
+    @staticmethod
+    def summary(results):
+        per_kind = {}
+        for result in results:
+            per_kind.setdefault(result["kind"], []).append(result)
+        return {
+            kind: {
+                "events": len(items),
+                "converged": sum(1 for r in items if r["converged"]),
+                "reconvergence_s": summarize([r["reconvergence_s"] for r in items if r["converged"]]),
+                "control_messages": summarize([r["control_messages"] for r in items]),
+                "spf_runs": summarize([r["spf_runs"] for r in items])
+            }
+            for kind, items in per_kind.items()
+        }
+
+    async def cleanup(self):
+        """Reanudar pausados y borrar los enlaces bloqueados y los hashes de stats"""
+        for node in list(self.paused):
+            self.launcher.processes[node].send_signal(signal.SIGCONT)
+        self.paused.clear()
+        await self.redis.delete(self.blocker_key, *(self.stats_prefix + n for n in self.config))
+
+
+def git_commit():
+    """Commit actual del repo (para comparar corridas), None si no hay git"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
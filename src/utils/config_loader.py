@@ -9,4 +9,15 @@ def get_node_addresses(names_config):
 
 def get_neighbors(topo_config, node_id):
     # Devuelve un diccionario de {vecino: costo}
-    return topo_config['config'].get(node_id, {})
\ No newline at end of file
+    return topo_config['config'].get(node_id, {})
+
+def get_hello_config(topo_config, node_id):
+    """
+    Configuración de hellos para un nodo. Sección opcional "hello" del topo:
+    {"interval": 3, "min_interval": 1, "max_interval": 6, "stable_after": 30,
+     "nodes": {node_id: {..., "links": {vecino: {...}}}}}
+    """
+    hello = topo_config.get('hello', {})
+    config = {k: v for k, v in hello.items() if k != 'nodes'}
+    config.update(hello.get('nodes', {}).get(node_id, {}))
+    return config
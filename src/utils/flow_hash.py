@@ -0,0 +1,26 @@
+import zlib
+
+
+def flow_key(message):
+    """
+    Clave estable de un flujo a partir de campos que no cambian entre saltos.
+    """
+    return f"{message.get('from', '')}|{message.get('to', '')}|{message.get('flow_id', '')}"
+
+
+def select_next_hop(next_hops, message, salt=""):
+    """
+    Elige un próximo salto entre varios de igual costo (ECMP).
+
+    Se usa crc32 en vez de hash() porque hash() cambia entre procesos. El
+    salt (normalmente el id del nodo) evita que todos los nodos elijan el
+    mismo índice y polaricen el tráfico.
+    """
+    if not next_hops:
+        return None
+    if len(next_hops) == 1:
+        return next_hops[0]
+
+    seed = zlib.crc32(salt.encode())
+    index = zlib.crc32(flow_key(message).encode(), seed) % len(next_hops)
+    return next_hops[index]
@@ -0,0 +1,125 @@
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from src.network.cluster import shard_channel
+from src.utils.stats import summarize
+
+
+class HeadlessLauncher:
+    """
+    Lanza todos los nodos como procesos sin terminal, cada uno con su log
+    en log_dir/<nodo>.log.
+
+    Un nodo está listo cuando su canal tiene un suscriptor (PUBSUB NUMSUB,
+    o SHARDNUMSUB en Redis Cluster). Como mucho max_concurrent nodos están
+    arrancando a la vez: un lugar se libera cuando el nodo queda listo.
+    """
+
+    def __init__(self, redis_client, algorithm="flooding", extra_args=(),
+                 log_dir="logs", max_concurrent=16, cluster=False, poll_interval=0.05):
+        self.redis = redis_client
+        self.algorithm = algorithm
+        self.extra_args = list(extra_args)
+        self.log_dir = log_dir
+        self.max_concurrent = max_concurrent
+        self.cluster = cluster
+        self.poll_interval = poll_interval
+        self.processes = {}
+        self.log_files = {}
+        self.ready_times = {}
+        self.failed = {}
+
+    def channel_for(self, node_id):
+        return shard_channel(node_id) if self.cluster else node_id
+
+    async def subscribers(self, node_id):
+        """Suscriptores del canal del nodo"""
+        channel = self.channel_for(node_id)
+        if self.cluster:
+            target = self.redis.get_node_from_key(channel)
+            reply = await self.redis.execute_command(
+                "PUBSUB", "SHARDNUMSUB", channel, target_nodes=target
+            )
+            return int(reply[1])
+        reply = await self.redis.pubsub_numsub(channel)
+        return int(reply[0][1])
+
+    def spawn(self, node_id, append=False):
+        """Lanzar el proceso del nodo; append=True para un reinicio (conserva el log)"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        if node_id in self.log_files:
+            self.log_files[node_id].close()
+        log_file = open(os.path.join(self.log_dir, f"{node_id}.log"), "a" if append else "w")
+        self.log_files[node_id] = log_file
+        self.processes[node_id] = subprocess.Popen(
+            [sys.executable, "main_redis.py", node_id, "--algorithm", self.algorithm, *self.extra_args],
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL
+        )
+
+    async def _launch(self, node_id, semaphore, started, timeout):
+        async with semaphore:
+            self.spawn(node_id)
+            deadline = time.monotonic() + timeout
+            process = self.processes[node_id]
+            while time.monotonic() < deadline:
+                if process.poll() is not None:
+                    self.failed[node_id] = f"terminó con código {process.returncode}"
+                    return
+                try:
+                    if await self.subscribers(node_id) > 0:
+                        self.ready_times[node_id] = time.monotonic() - started
+                        return
+                except Exception as e:
+                    self.failed[node_id] = f"error consultando Redis: {e}"
+                    return
+                await asyncio.sleep(self.poll_interval)
+            self.failed[node_id] = f"no se suscribió en {timeout} s"
+
+    async def start_all(self, node_ids, timeout=30.0):
+        """Lanzar todos los nodos y esperar a que estén suscritos; devuelve el reporte"""
+        busy = [n for n in node_ids if await self.subscribers(n) > 0]
+        if busy:
+            # Otro proceso ya escucha ese canal: la prueba de listo no sería confiable
+            raise RuntimeError(f"Canales ya suscritos (¿nodos de otra corrida?): {busy}")
+
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        await asyncio.gather(*(
+            self._launch(node_id, semaphore, started, timeout) for node_id in node_ids
+        ))
+        return self.report(time.monotonic() - started)
+
+    def report(self, elapsed):
+        return {
+            "nodes": len(self.processes),
+            "ready": len(self.ready_times),
+            "failed": dict(self.failed),
+            "all_ready_s": round(max(self.ready_times.values()), 3) if self.ready_times else None,
+            "elapsed_s": round(elapsed, 3),
+            "time_to_ready_s": summarize(list(self.ready_times.values()))
+        }
+
+    def stop_all(self, timeout=3.0):
+        """SIGTERM a todos a la vez, SIGKILL a los que no terminen a tiempo"""
+        for process in self.processes.values():
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+
+        deadline = time.monotonic() + timeout
+        for process in self.processes.values():
+            try:
+                process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+        for log_file in self.log_files.values():
+            log_file.close()
+        self.processes.clear()
+        self.log_files.clear()
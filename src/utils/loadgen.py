@@ -0,0 +1,198 @@
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from src.utils.stats import summarize
+
+
+def parse_schedule(text):
+    """ "100:10,200:10" -> [(100.0, 10.0), (200.0, 10.0)] (mensajes/s : segundos)"""
+    steps = []
+    for part in text.split(","):
+        rate, duration = part.split(":")
+        steps.append((float(rate), float(duration)))
+    return steps
+
+
+class LoadGenerator:
+    """
+    Generador de carga de lazo abierto.
+
+    Cada mensaje tiene una hora de envío prevista fija (tasa constante o
+    Poisson) que no depende de cuánto tardaron los anteriores. Si el
+    generador se atrasa, envía de inmediato pero la latencia se sigue
+    midiendo desde la hora prevista, así un sistema saturado no esconde su
+    cola (sin coordinated omission).
+
+    Los destinos publican un recibo en ack_channel al entregar; la latencia
+    es la hora de recepción en el destino menos la hora prevista de envío.
+    """
+
+    def __init__(self, publish, subscribe, nodes, payload_size=64, seed=None,
+                 poisson=False, ttl=15, proto="flooding", channel_for=None):
+        self.publish = publish          # corrutina (canal, datos)
+        self.subscribe = subscribe      # fábrica de suscripción (PubSub o ShardedSubscription)
+        self.nodes = list(nodes)
+        self.payload = "x" * payload_size
+        self.random = random.Random(seed)
+        self.poisson = poisson
+        self.ttl = ttl
+        self.proto = proto
+        self.channel_for = channel_for or (lambda node_id: node_id)
+        self.run_id = uuid.uuid4().hex[:8]
+        self.ack_channel = f"loadgen:{self.run_id}"
+
+        self.pending = {}      # id -> hora prevista (epoch)
+        self.latencies = []
+        self.duplicates = 0
+        self.send_errors = 0
+        self.in_flight = set()
+        self.collector = None
+        self.ready = asyncio.Event()
+
+    async def start(self):
+        self.collector = asyncio.create_task(self._collect())
+        await self.ready.wait()
+
+    async def stop(self):
+        if self.collector:
+            self.collector.cancel()
+            await asyncio.gather(self.collector, return_exceptions=True)
+
+    async def _collect(self):
+        async with self.subscribe() as pubsub:
+            await pubsub.subscribe(self.ack_channel)
+            self.ready.set()
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if not message or message["type"] != "message":
+                    continue
+                receipt = json.loads(message["data"])
+                intended = self.pending.pop(receipt["id"], None)
+                if intended is None:
+                    # Ya contado (entrega duplicada) o de un paso anterior
+                    self.duplicates += 1
+                    continue
+                self.latencies.append((receipt["rx"] - intended) * 1000)
+
+    def _pair(self):
+        source, destination = self.random.sample(self.nodes, 2)
+        return source, destination
+
+    async def _send(self, channel, data):
+        try:
+            await self.publish(channel, data)
+        except Exception:
+            self.send_errors += 1
+
+    async def run_step(self, rate, duration, drain=5.0, step=0):
+        """Enviar a `rate` mensajes/s durante `duration` s y esperar los recibos"""
+        self.pending.clear()
+        self.latencies = []
+        self.duplicates = 0
+        self.send_errors = 0
+
+        mono_start = time.monotonic()
+        wall_start = time.time()
+        offset = 0.0
+        sent = 0
+        max_behind = 0.0
+
+        while offset < duration:
+            delay = mono_start + offset - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                max_behind = max(max_behind, -delay)
+
+            source, destination = self._pair()
+            message_id = f"{self.run_id}-{step}-{sent}"
+            intended = wall_start + offset
+            self.pending[message_id] = intended
+            message = {
+                "proto": self.proto,
+                "type": "message",
+                "from": source,
+                "to": destination,
+                "ttl": self.ttl,
+                "headers": [],
+                "payload": self.payload,
+                "timestamp": intended,
+                "load_id": message_id,
+                "ack_channel": self.ack_channel
+            }
+            # Se inyecta en el canal del origen, igual que test_network.py
+            task = asyncio.create_task(self._send(self.channel_for(source), json.dumps(message)))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
+
+            sent += 1
+            offset += self.random.expovariate(rate) if self.poisson else 1.0 / rate
+
+        send_elapsed = time.monotonic() - mono_start
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight, return_exceptions=True)
+
+        drain_deadline = time.monotonic() + drain
+        while self.pending and time.monotonic() < drain_deadline:
+            await asyncio.sleep(0.05)
+
+        lost = len(self.pending)
+        self.pending.clear()
+        return {
+            "rate": rate,
+            "duration": duration,
+            "sent": sent,
+            "achieved_rate": round(sent / send_elapsed, 1) if send_elapsed else 0.0,
+            "max_sender_lag_ms": round(max_behind * 1000, 3),
+            "send_errors": self.send_errors,
+            "delivered": len(self.latencies),
+            "lost": lost,
+            "loss": round(lost / sent, 4) if sent else 0.0,
+            "duplicates": self.duplicates,
+            "latency_ms": summarize([round(v, 3) for v in self.latencies])
+        }
+
+    @staticmethod
+    def within_limits(result, p99_limit_ms, loss_limit):
+        p99 = result["latency_ms"].get("p99")
+        return p99 is not None and p99 <= p99_limit_ms and result["loss"] <= loss_limit
+
+    async def find_max_rate(self, start_rate, step_duration, p99_limit_ms, loss_limit,
+                            factor=2.0, refine=3, max_rate=100000, drain=5.0, report=None):
+        """
+        Tasa máxima sostenible: se multiplica la tasa por `factor` hasta
+        pasarse de los límites y luego se biseca `refine` veces entre la
+        última que pasó y la primera que falló.
+        """
+        results = []
+
+        async def attempt(rate):
+            result = await self.run_step(rate, step_duration, drain=drain, step=len(results))
+            result["ok"] = self.within_limits(result, p99_limit_ms, loss_limit)
+            results.append(result)
+            if report:
+                report(result)
+            return result["ok"]
+
+        good, bad = None, None
+        rate = start_rate
+        while rate <= max_rate:
+            if await attempt(rate):
+                good = rate
+                rate *= factor
+            else:
+                bad = rate
+                break
+
+        if good is not None and bad is not None:
+            for _ in range(refine):
+                middle = (good + bad) / 2
+                if await attempt(middle):
+                    good = middle
+                else:
+                    bad = middle
+
+        return {"max_rate": good, "first_failing_rate": bad, "steps": results}
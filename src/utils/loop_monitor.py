@@ -0,0 +1,39 @@
+import time
+
+
+class LoopLagMonitor:
+    """
+    Mide cuánto se atrasa el event loop: tick() se programa cada `interval`
+    y compara la hora real con la esperada. Un atraso grande significa que
+    algo bloqueó el loop (pub/sub, hellos y timers quedaron esperando).
+    """
+
+    def __init__(self, logger, interval=0.1, warn_ms=250):
+        self.logger = logger
+        self.interval = interval
+        self.warn_ms = warn_ms
+        self.expected = None
+        self.samples = 0
+        self.max_lag_ms = 0.0
+        self.total_lag_ms = 0.0
+        self.blocked_events = 0
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.expected is not None:
+            lag_ms = max(0.0, (now - self.expected) * 1000)
+
+            self.samples += 1
+            self.total_lag_ms += lag_ms
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            if lag_ms >= self.warn_ms:
+                self.blocked_events += 1
+                self.logger.warning(f"Event loop bloqueado {lag_ms:.0f} ms")
+        self.expected = now + self.interval
+
+    def stats(self):
+        return {
+            "avg_lag_ms": round(self.total_lag_ms / self.samples, 3) if self.samples else 0.0,
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "blocked_events": self.blocked_events
+        }
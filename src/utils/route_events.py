@@ -0,0 +1,87 @@
+import asyncio
+import json
+import time
+
+
+def diff_routes(old, new):
+    """
+    Diferencia entre dos tablas {destino: ruta}. Devuelve (added, removed,
+    changed) donde added/changed mapean destino -> ruta nueva y removed es
+    la lista de destinos que ya no tienen ruta.
+    """
+    added = {dest: route for dest, route in new.items() if dest not in old}
+    removed = [dest for dest in old if dest not in new]
+    changed = {
+        dest: route for dest, route in new.items()
+        if dest in old and old[dest] != route
+    }
+    return added, removed, changed
+
+
+class RouteEventPublisher:
+    """
+    Publica los cambios de rutas de un nodo como eventos compactos.
+
+    Cada algoritmo entrega su tabla nueva con publish(); se calcula la
+    diferencia con la anterior y, si hay cambios, se notifica a los
+    suscriptores locales (callbacks o asyncio.Queue) y opcionalmente se
+    agrega a un stream de Redis. El costo es proporcional al cambio, no al
+    tamaño de la tabla.
+    """
+
+    def __init__(self, node, stream=None, stream_maxlen=10000):
+        self.node = node
+        self.stream = stream
+        self.stream_maxlen = stream_maxlen
+        self.routes = {}
+        self.sequence = 0
+        self.subscribers = []
+
+    def subscribe(self, subscriber):
+        """Callback (evento) -> None o asyncio.Queue"""
+        self.subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.remove(subscriber)
+
+    def publish(self, routes):
+        """Registrar la tabla nueva y emitir el diff; devuelve el evento o None"""
+        added, removed, changed = diff_routes(self.routes, routes)
+        self.routes = routes
+        if not (added or removed or changed):
+            return None
+
+        self.sequence += 1
+        event = {
+            "node": self.node.node_id,
+            "seq": self.sequence,
+            "ts": time.time(),
+            "added": added,
+            "removed": removed,
+            "changed": changed
+        }
+
+        for subscriber in self.subscribers:
+            if isinstance(subscriber, asyncio.Queue):
+                subscriber.put_nowait(event)
+            else:
+                subscriber(event)
+
+        self.node.logger.info(
+            f"Rutas: +{len(added)} -{len(removed)} ~{len(changed)} (seq {self.sequence})"
+        )
+
+        if self.stream and getattr(self.node, "redis", None) is not None:
+            self.node.spawn(self._append_to_stream(event))
+        return event
+
+    async def _append_to_stream(self, event):
+        try:
+            await self.node.redis.xadd(
+                self.stream,
+                {"event": json.dumps(event, separators=(",", ":"))},
+                maxlen=self.stream_maxlen,
+                approximate=True
+            )
+        except Exception as e:
+            self.node.logger.error(f"Error publicando evento de rutas: {e}")
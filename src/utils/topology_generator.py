@@ -0,0 +1,243 @@
+import math
+import random
+import re
+
+# Formato de topology_11_nodes.txt: "N1-N2:20, N1-N3:14, ..."
+EDGE_PATTERN = re.compile(r"\s*([^\s,:-]+)\s*-\s*([^\s,:-]+)\s*:\s*(\d+(?:\.\d+)?)\s*")
+
+
+class WeightSampler:
+    """Distribución de pesos de los enlaces (siempre enteros >= 1)"""
+
+    def __init__(self, rng, distribution="uniform", low=1, high=20, mean=10.0, std=4.0):
+        self.rng = rng
+        self.distribution = distribution
+        self.low = low
+        self.high = high
+        self.mean = mean
+        self.std = std
+
+    def sample(self, distance=None):
+        if self.distribution == "constant":
+            return self.low
+        if self.distribution == "uniform":
+            return self.rng.randint(self.low, self.high)
+        if self.distribution == "normal":
+            value = self.rng.gauss(self.mean, self.std)
+        elif self.distribution == "exponential":
+            value = self.low + self.rng.expovariate(1.0 / self.mean)
+        elif self.distribution == "distance":
+            # Proporcional a la distancia (normalizada a [0, 1]) del modelo geométrico
+            value = self.low + (self.high - self.low) * (distance or 0.0)
+        else:
+            raise ValueError(f"Distribución de pesos desconocida: {self.distribution}")
+        return max(self.low, min(self.high, int(round(value))))
+
+
+def _add_edge(adjacency, a, b, weight):
+    if a == b or b in adjacency[a]:
+        return False
+    adjacency[a][b] = weight
+    adjacency[b][a] = weight
+    return True
+
+
+def _connect_components(adjacency, weights, rng):
+    """Unir componentes desconectados con un enlace entre cada par consecutivo"""
+    seen = set()
+    components = []
+    for start in adjacency:
+        if start in seen:
+            continue
+        stack = [start]
+        seen.add(start)
+        component = [start]
+        while stack:
+            current = stack.pop()
+            for neighbor in adjacency[current]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+                    component.append(neighbor)
+        components.append(component)
+
+    for previous, current in zip(components, components[1:]):
+        _add_edge(adjacency, rng.choice(previous), rng.choice(current), weights.sample(1.0))
+
+
+def node_names(count, prefix="sec30.grupo1.nodo"):
+    return [f"{prefix}{i}" for i in range(1, count + 1)]
+
+
+def random_geometric(names, rng, weights, radius=None):
+    """
+    Grafo geométrico aleatorio en el cuadrado unitario. Se usa una grilla de
+    celdas de tamaño `radius` para que sea O(n) y escale a 100k nodos.
+    """
+    n = len(names)
+    if radius is None:
+        # Grado medio ~8
+        radius = math.sqrt(8.0 / (math.pi * max(n, 1)))
+
+    positions = {name: (rng.random(), rng.random()) for name in names}
+    cells = {}
+    for name, (x, y) in positions.items():
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(name)
+
+    adjacency = {name: {} for name in names}
+    for (cx, cy), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for other in cells.get((cx + dx, cy + dy), ()):
+                    ox, oy = positions[other]
+                    for name in members:
+                        if name >= other:
+                            continue
+                        x, y = positions[name]
+                        distance = math.hypot(x - ox, y - oy)
+                        if distance <= radius:
+                            _add_edge(adjacency, name, other, weights.sample(distance / radius))
+
+    _connect_components(adjacency, weights, rng)
+    return adjacency
+
+
+def barabasi_albert(names, rng, weights, m=2):
+    """Grafo libre de escala por conexión preferencial (m enlaces por nodo nuevo)"""
+    adjacency = {name: {} for name in names}
+    m = max(1, min(m, len(names) - 1))
+
+    # Núcleo inicial completamente conectado
+    core = names[:m + 1]
+    for i, a in enumerate(core):
+        for b in core[i + 1:]:
+            _add_edge(adjacency, a, b, weights.sample())
+
+    # Cada extremo aparece una vez por enlace: elegir uniforme de esta lista
+    # equivale a elegir proporcional al grado
+    endpoints = [name for name in core for _ in range(m)]
+    for name in names[m + 1:]:
+        targets = set()
+        while len(targets) < m:
+            targets.add(rng.choice(endpoints))
+        for target in targets:
+            _add_edge(adjacency, name, target, weights.sample())
+            endpoints.extend((name, target))
+    return adjacency
+
+
+def grid(names, rng, weights, torus=False):
+    """Grilla (o toro) lo más cuadrada posible"""
+    n = len(names)
+    cols = max(1, int(math.ceil(math.sqrt(n))))
+    rows = int(math.ceil(n / cols))
+    adjacency = {name: {} for name in names}
+
+    for index, name in enumerate(names):
+        row, col = divmod(index, cols)
+        if col + 1 < cols and index + 1 < n:
+            _add_edge(adjacency, name, names[index + 1], weights.sample())
+        elif torus and cols > 2:
+            _add_edge(adjacency, name, names[row * cols], weights.sample())
+        if row + 1 < rows and index + cols < n:
+            _add_edge(adjacency, name, names[index + cols], weights.sample())
+        elif torus and rows > 2:
+            _add_edge(adjacency, name, names[col], weights.sample())
+    return adjacency
+
+
+def hierarchical(rng, weights, sections=1, groups=10, nodes_per_group=10,
+                 intra_degree=3, gateways=2):
+    """
+    Topología jerárquica con nombres secXX.grupoY.nodoZ: cada grupo es un
+    grafo aleatorio conexo y los grupos se unen entre sí por unos pocos
+    nodos frontera (en anillo más atajos aleatorios). nodes_per_group es
+    un tamaño para todos o una lista con uno por grupo (sección por sección).
+    """
+    if isinstance(nodes_per_group, int):
+        nodes_per_group = [nodes_per_group] * (sections * groups)
+    sizes = iter(nodes_per_group)
+
+    adjacency = {}
+    group_members = []
+    for sec in range(1, sections + 1):
+        for group in range(1, groups + 1):
+            members = [f"sec{sec:02d}.grupo{group}.nodo{i}" for i in range(1, next(sizes) + 1)]
+            for name in members:
+                adjacency[name] = {}
+            # Árbol aleatorio para garantizar conexidad + enlaces extra
+            for i in range(1, len(members)):
+                _add_edge(adjacency, members[i], members[rng.randrange(i)], weights.sample())
+            extra = max(0, (intra_degree * len(members)) // 2 - (len(members) - 1))
+            for _ in range(extra):
+                _add_edge(adjacency, rng.choice(members), rng.choice(members), weights.sample())
+            group_members.append(members)
+
+    border = [members[:max(1, gateways)] for members in group_members]
+    for i in range(len(border)):
+        if len(border) < 2:
+            break
+        _add_edge(adjacency, rng.choice(border[i]), rng.choice(border[(i + 1) % len(border)]), weights.sample())
+        _add_edge(adjacency, rng.choice(border[i]), rng.choice(rng.choice(border)), weights.sample())
+    return adjacency
+
+
+def parse_edge_list(text):
+    """Importar el formato "N1-N2:20, N1-N3:14" de topology_11_nodes.txt"""
+    adjacency = {}
+    for chunk in text.replace("\n", ",").split(","):
+        if not chunk.strip():
+            continue
+        match = EDGE_PATTERN.fullmatch(chunk)
+        if not match:
+            raise ValueError(f"Arista mal formada: {chunk.strip()!r}")
+        a, b, weight = match.groups()
+        adjacency.setdefault(a, {})
+        adjacency.setdefault(b, {})
+        weight = float(weight)
+        _add_edge(adjacency, a, b, int(weight) if weight.is_integer() else weight)
+    return adjacency
+
+
+def rename_nodes(adjacency, prefix):
+    """Anteponer un prefijo a cada nodo (ej: "sec30.grupo5.")"""
+    return {
+        prefix + node: {prefix + neighbor: w for neighbor, w in neighbors.items()}
+        for node, neighbors in adjacency.items()
+    }
+
+
+def to_topo_config(adjacency):
+    """Formato compatible con config_loader.load_config/get_neighbors"""
+    return {"type": "topo", "config": adjacency}
+
+
+def generate(model, nodes=100, seed=0, weight_distribution="uniform", weight_low=1,
+             weight_high=20, prefix="sec30.grupo1.nodo", **params):
+    """Generar una topología con el modelo indicado de forma reproducible"""
+    rng = random.Random(seed)
+    weights = WeightSampler(rng, weight_distribution, weight_low, weight_high,
+                            mean=params.pop("weight_mean", (weight_low + weight_high) / 2),
+                            std=params.pop("weight_std", (weight_high - weight_low) / 4))
+
+    if model == "geometric":
+        return random_geometric(node_names(nodes, prefix), rng, weights, radius=params.get("radius"))
+    if model == "ba":
+        return barabasi_albert(node_names(nodes, prefix), rng, weights, m=params.get("m", 2))
+    if model in ("grid", "torus"):
+        return grid(node_names(nodes, prefix), rng, weights, torus=(model == "torus"))
+    if model == "hierarchical":
+        groups = params.get("groups", 10)
+        sections = params.get("sections", 1)
+        total_groups = groups * sections
+        if nodes < total_groups:
+            raise ValueError(f"Se necesitan al menos {total_groups} nodos para {sections} secciones "
+                             f"de {groups} grupos (se pidieron {nodes})")
+        # El resto de la división se reparte de a un nodo en los primeros grupos
+        base, remainder = divmod(nodes, total_groups)
+        sizes = [base + (1 if i < remainder else 0) for i in range(total_groups)]
+        return hierarchical(rng, weights, sections=sections, groups=groups,
+                            nodes_per_group=sizes,
+                            intra_degree=params.get("intra_degree", 3),
+                            gateways=params.get("gateways", 2))
+    raise ValueError(f"Modelo desconocido: {model}")
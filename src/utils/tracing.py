@@ -0,0 +1,66 @@
+import json
+
+# Trazado opt-in de mensajes de datos: si el mensaje trae "trace": true cada
+# salto agrega a "headers" un registro compacto [nodo, rx_ms, tx_ms] con
+# tiempos de reloj de pared en milisegundos.
+
+TRACE_PREFIX = "TRACE "
+
+
+def is_traced(message):
+    return bool(message.get("trace"))
+
+
+def now_ms(ts):
+    return round(ts * 1000, 3)
+
+
+def record_receive(message, node_id, recv_ts):
+    """Copia del mensaje con un nuevo salto (tx todavía sin definir)"""
+    headers = list(message.get("headers") or [])
+    headers.append([node_id, now_ms(recv_ts), None])
+    return {**message, "headers": headers}
+
+
+def record_send(message, node_id, send_ts):
+    """Copia del mensaje con el tx del último salto si es de este nodo"""
+    headers = message.get("headers") or []
+    if not headers or headers[-1][0] != node_id or headers[-1][2] is not None:
+        return message
+    last = headers[-1]
+    return {**message, "headers": headers[:-1] + [[last[0], last[1], now_ms(send_ts)]]}
+
+
+def hop_breakdown(headers):
+    """
+    Por cada salto: tiempo dentro del nodo (queue_ms = tx - rx) y tiempo en
+    tránsito hasta el siguiente salto (transit_ms = rx siguiente - tx).
+    """
+    hops = []
+    for i, (node_id, rx, tx) in enumerate(headers):
+        hop = {"node": node_id, "queue_ms": None, "transit_ms": None}
+        if tx is not None:
+            hop["queue_ms"] = round(tx - rx, 3)
+            if i + 1 < len(headers):
+                hop["next"] = headers[i + 1][0]
+                hop["transit_ms"] = round(headers[i + 1][1] - tx, 3)
+        hops.append(hop)
+    return hops
+
+
+def trace_summary(message):
+    """Resumen para emitir en el destino"""
+    headers = message.get("headers") or []
+    total = round(headers[-1][1] - headers[0][1], 3) if len(headers) > 1 else 0.0
+    return {
+        "from": message.get("from"),
+        "to": message.get("to"),
+        "flow_id": message.get("flow_id"),
+        "total_ms": total,
+        "hops": hop_breakdown(headers)
+    }
+
+
+def format_trace(message):
+    """Línea de log con el resumen (la lee trace_report.py)"""
+    return TRACE_PREFIX + json.dumps(trace_summary(message), separators=(",", ":"))
@@ -22,6 +22,7 @@ class RedisNetworkManager:
         self.processes = {}
         self.running = False
         self.logs = {}
+        self.launcher = None
         
         # Cargar configuración
         self.topo_config = load_config('config/topo-redis-test.json')
@@ -42,6 +43,43 @@ class RedisNetworkManager:
         print("Todos los nodos iniciados. Usa el menú para enviar mensajes.")
         print("Presiona Ctrl+C para detener todos los nodos.")
     
+    async def start_all_nodes_headless(self, algorithm='flooding', max_concurrent=16, log_dir='logs'):
+        """Inicia todos los nodos a la vez, sin terminales, y espera a que estén suscritos"""
+        import redis.asyncio as redis
+        from src.utils.launcher import HeadlessLauncher
+
+        self.running = True
+        cluster = os.getenv("REDIS_CLUSTER", "").lower() in ("1", "true")
+        if cluster:
+            from redis.asyncio.cluster import RedisCluster
+            r = RedisCluster(
+                host=os.getenv("REDIS_HOST"),
+                port=int(os.getenv("REDIS_PORT")),
+                password=os.getenv("REDIS_PASSWORD")
+            )
+            await r.initialize()
+        else:
+            r = redis.Redis(
+                host=os.getenv("REDIS_HOST"),
+                port=int(os.getenv("REDIS_PORT")),
+                password=os.getenv("REDIS_PASSWORD")
+            )
+
+        print(f"Iniciando {len(self.all_nodes)} nodos con algoritmo {algorithm} (logs en {log_dir}/)")
+        self.launcher = HeadlessLauncher(
+            r, algorithm, log_dir=log_dir, max_concurrent=max_concurrent, cluster=cluster
+        )
+        try:
+            report = await self.launcher.start_all(self.all_nodes)
+        finally:
+            await r.close()
+
+        print(f"Listos {report['ready']}/{report['nodes']} en {report['all_ready_s']} s")
+        print(f"Tiempo hasta listo por nodo: {report['time_to_ready_s']}")
+        for node_id, reason in report["failed"].items():
+            print(f"  {node_id}: {reason}")
+        return report
+
     def start_node(self, node_id, algorithm='flooding'):
         """Inicia un nodo específico en una terminal separada"""
         try:
@@ -77,6 +115,12 @@ class RedisNetworkManager:
         """Detiene todos los nodos"""
         self.running = False
         print("\nDeteniendo todos los nodos...")
+
+        if self.launcher:
+            started = time.monotonic()
+            self.launcher.stop_all()
+            print(f"Nodos detenidos en {time.monotonic() - started:.2f} s")
+            return
         
         for node_id, process in self.processes.items():
             try:
@@ -92,7 +136,7 @@ class RedisNetworkManager:
             except Exception as e:
                 print(f"Error deteniendo nodo {node_id}: {e}")
     
-    async def send_test_message(self, from_node, to_node, message_text, proto="flooding"):
+    async def send_test_message(self, from_node, to_node, message_text, proto="flooding", trace=False):
         """Envía un mensaje de prueba usando Redis directamente"""
         try:
             import redis.asyncio as redis
@@ -114,10 +158,26 @@ class RedisNetworkManager:
                 "payload": message_text,
                 "timestamp": int(time.time())
             }
+            if trace:
+                # Cada salto agrega [nodo, rx_ms, tx_ms] a headers
+                message["trace"] = True
             
             # Publicar en el canal del nodo origen (para simular que este lo envia)
             target_channel = f"sec30.grupo5.{from_node}"
-            await r.publish(target_channel, json.dumps(message))
+            if os.getenv("REDIS_CLUSTER", "").lower() in ("1", "true"):
+                # Con Redis Cluster los nodos escuchan con SSUBSCRIBE en su shard
+                from redis.asyncio.cluster import RedisCluster
+                from src.network.cluster import ShardedPubSub, shard_channel
+                await r.close()
+                r = RedisCluster(
+                    host=os.getenv("REDIS_HOST"),
+                    port=int(os.getenv("REDIS_PORT")),
+                    password=os.getenv("REDIS_PASSWORD")
+                )
+                await r.initialize()
+                await ShardedPubSub(r).publish(shard_channel(target_channel), json.dumps(message))
+            else:
+                await r.publish(target_channel, json.dumps(message))
             await r.close()
             
             print(f"Mensaje enviado desde {from_node} a {to_node}: '{message_text}'")
@@ -145,6 +205,16 @@ async def main():
     parser.add_argument('--from-node', help='Nodo origen para envío rápido')
     parser.add_argument('--to-node', help='Nodo destino para envío rápido')
     parser.add_argument('--message', help='Mensaje para envío rápido')
+    parser.add_argument('--trace', action='store_true',
+                       help='Trazar los mensajes salto por salto (ver trace_report.py)')
+    parser.add_argument('--headless', action='store_true',
+                       help='Iniciar los nodos en paralelo sin terminales, con logs en --log-dir')
+    parser.add_argument('--max-concurrent', type=int, default=16,
+                       help='Nodos arrancando a la vez en modo headless')
+    parser.add_argument('--log-dir', default='logs',
+                       help='Directorio de logs por nodo en modo headless')
+    parser.add_argument('--ready-check', action='store_true',
+                       help='Con --headless: reportar el tiempo hasta listo y detener los nodos')
     
     args = parser.parse_args()
     
@@ -155,7 +225,7 @@ async def main():
             sys.exit(1)
         
         manager = RedisNetworkManager()
-        await manager.send_test_message(args.from_node, args.to_node, args.message, args.algorithm)
+        await manager.send_test_message(args.from_node, args.to_node, args.message, args.algorithm, trace=args.trace)
         return
     
     # Modo completo: iniciar todos los nodos
@@ -169,7 +239,20 @@ async def main():
     signal.signal(signal.SIGINT, signal_handler)
     
     # Iniciar todos los nodos con el algoritmo especificado
-    manager.start_all_nodes(args.algorithm)
+    if args.headless:
+        try:
+            report = await manager.start_all_nodes_headless(
+                args.algorithm, max_concurrent=args.max_concurrent, log_dir=args.log_dir
+            )
+        except Exception as e:
+            print(f"Error iniciando nodos: {e}")
+            manager.stop_all_nodes()
+            sys.exit(1)
+        if args.ready_check:
+            manager.stop_all_nodes()
+            sys.exit(0 if not report["failed"] else 1)
+    else:
+        manager.start_all_nodes(args.algorithm)
     
     # Menú interactivo
     try:
@@ -194,7 +277,7 @@ async def main():
                 message = input("Mensaje: ").strip()
                 
                 if from_node and to_node and message:
-                    await manager.send_test_message(from_node, to_node, message, args.algorithm)
+                    await manager.send_test_message(from_node, to_node, message, args.algorithm, trace=args.trace)
                     print("Mensaje enviado. Revisa las terminales de los nodos.")
                 else:
                     print("Error: Debes completar todos los campos")
@@ -211,7 +294,12 @@ async def main():
                     manager.stop_all_nodes()
                     args.algorithm = new_algorithm
                     manager = RedisNetworkManager()
-                    manager.start_all_nodes(args.algorithm)
+                    if args.headless:
+                        await manager.start_all_nodes_headless(
+                            args.algorithm, max_concurrent=args.max_concurrent, log_dir=args.log_dir
+                        )
+                    else:
+                        manager.start_all_nodes(args.algorithm)
                 else:
                     print("Algoritmo no válido")
                     
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Importar src/ desde la raíz del proyecto, igual que test_network.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
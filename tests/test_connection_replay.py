@@ -0,0 +1,70 @@
+import asyncio
+import logging
+
+import pytest
+
+pytest.importorskip("redis")
+
+from src.network.connection import ConnectionManager
+
+
+class FlakyNode:
+    """
+    Lo mínimo de RedisNode para el reenvío: _publish agrupa de a 3 mensajes
+    como el batcher y, si la conexión se cae en un PUBLISH, vuelve a
+    guardar todo el sobre con hold() igual que _publish_encoded.
+    """
+
+    def __init__(self, fail_at):
+        self.running = True
+        self.logger = logging.getLogger("replay")
+        self.connection = ConnectionManager(self)
+        self.fail_at = set(fail_at)   # números de PUBLISH que fallan
+        self.publishes = 0
+        self.pending = []
+        self.delivered = []
+
+    async def _publish(self, message, neighbor_id, batch=True):
+        if not self.connection.is_connected:
+            return self.connection.hold(message, neighbor_id)
+        self.pending.append(message)
+        if batch and len(self.pending) < 3:
+            return True
+        envelope, self.pending = self.pending, []
+        self.publishes += 1
+        await asyncio.sleep(0)
+        if self.publishes in self.fail_at:
+            self.connection.connected.clear()
+            return all([self.connection.hold(m, neighbor_id) for m in envelope])
+        self.delivered.extend(m["n"] for m in envelope)
+        return True
+
+
+def test_replay_keeps_order_when_the_connection_drops_twice():
+    async def scenario():
+        node = FlakyNode(fail_at={3, 6})
+        connection = node.connection
+        connection.connected.clear()
+        for n in range(10):
+            connection.hold({"type": "message", "n": n}, "b")
+
+        # Primer corte en el tercer PUBLISH; llega tráfico nuevo mientras tanto
+        connection.connected.set()
+        await connection._replay()
+        assert not connection.is_connected
+        connection.hold({"type": "message", "n": 10}, "b")
+
+        # Segundo corte
+        connection.connected.set()
+        await connection._replay()
+        assert not connection.is_connected
+        connection.hold({"type": "message", "n": 11}, "b")
+
+        connection.connected.set()
+        await connection._replay()
+
+        assert node.delivered == list(range(12))
+        assert not connection.buffer
+        assert connection.buffered == 12
+
+    asyncio.run(scenario())
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import logging
+import time
+
+from src.algorithms.flooding import Flooding
+from src.network.messages import parse
+from src.network.scheduler import Scheduler
+from src.utils.loadgen import LoadGenerator
+
+
+class FloodingNode:
+    """Lo mínimo de RedisNode para Flooding; los envíos van a una cola compartida"""
+
+    def __init__(self, node_id, neighbors, network, receipts):
+        self.node_id = node_id
+        self.neighbors = dict(neighbors)
+        self.network = network
+        self.receipts = receipts
+        self.logger = logging.getLogger(node_id)
+        self.scheduler = Scheduler(self.logger)
+        self.last_receive_ts = time.time()
+        self.routing_algorithm = Flooding()
+        self.routing_algorithm.set_node(self)
+
+    def spawn(self, coro, name=None):
+        return self.scheduler.spawn(coro, name)
+
+    def acknowledge(self, message):
+        self.receipts.put_nowait(json.dumps({
+            "id": message.get("load_id"), "node": self.node_id, "rx": self.last_receive_ts
+        }))
+
+    async def send_message(self, message, neighbor_id):
+        self.network.put_nowait((neighbor_id, json.dumps({**message, "via": self.node_id})))
+        return True
+
+    async def flood_message(self, message, exclude_neighbor=None, neighbors=None):
+        for neighbor_id in self.neighbors:
+            if neighbor_id != exclude_neighbor:
+                await self.send_message(message, neighbor_id)
+
+
+class ReceiptSubscription:
+    """Suscripción al canal de recibos del generador, servida desde una cola"""
+
+    def __init__(self, receipts):
+        self.receipts = receipts
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def subscribe(self, channel):
+        pass
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            data = await asyncio.wait_for(self.receipts.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return {"type": "message", "data": data}
+
+
+async def deliver(nodes, network):
+    while True:
+        target, data = await network.get()
+        node = nodes[target]
+        node.last_receive_ts = time.time()
+        node.routing_algorithm.handle_message(parse(data))
+
+
+def test_flooding_step_faster_than_pairs_has_no_false_loss():
+    async def scenario():
+        network = asyncio.Queue()
+        receipts = asyncio.Queue()
+        topology = {"a": {"b": 1, "c": 1}, "b": {"a": 1, "c": 1}, "c": {"a": 1, "b": 1}}
+        nodes = {n: FloodingNode(n, neighbors, network, receipts) for n, neighbors in topology.items()}
+        pump = asyncio.create_task(deliver(nodes, network))
+
+        async def publish(channel, data):
+            network.put_nowait((channel, data))
+
+        # 60 mensajes/s entre 6 pares: varios mensajes por par en el mismo segundo
+        generator = LoadGenerator(publish, lambda: ReceiptSubscription(receipts), topology, seed=1)
+        await generator.start()
+        result = await generator.run_step(60, 1.0, drain=2.0)
+        await generator.stop()
+        pump.cancel()
+        for node in nodes.values():
+            node.scheduler.shutdown()
+
+        assert result["sent"] == 60
+        assert result["lost"] == 0
+        assert sum(n.routing_algorithm.stats["duplicates"] for n in nodes.values()) > 0
+
+    asyncio.run(scenario())
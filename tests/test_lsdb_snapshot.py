@@ -0,0 +1,95 @@
+import asyncio
+import logging
+
+from src.algorithms.link_state import LinkStateRouter
+from src.network.scheduler import Scheduler
+
+
+class NoSPF:
+    """El test mira el LSDB, no las rutas"""
+
+    async def compute(self, topology, source):
+        return None
+
+
+class LSRNode:
+    """Lo mínimo de RedisNode para el intercambio de dbd/lsu de LinkStateRouter"""
+
+    def __init__(self, node_id, neighbors, network):
+        self.node_id = node_id
+        self.neighbors = dict(neighbors)
+        self.network = network
+        self.logger = logging.getLogger(node_id)
+        self.scheduler = Scheduler(self.logger)
+        self.spf_executor = NoSPF()
+        self.routing_table = {}
+        self.routing_algorithm = LinkStateRouter()
+        self.routing_algorithm.set_node(self)
+
+    def spawn(self, coro, name=None):
+        return self.scheduler.spawn(coro, name)
+
+    async def send_message(self, message, neighbor_id):
+        self.network.put_nowait((neighbor_id, {**message, "via": self.node_id}))
+        return True
+
+    async def flood_message(self, message, exclude_neighbor=None, neighbors=None):
+        for neighbor_id in self.neighbors if neighbors is None else neighbors:
+            if neighbor_id != exclude_neighbor:
+                await self.send_message(message, neighbor_id)
+
+
+async def deliver(nodes, network):
+    """Entregar mensajes hasta que la red quede en silencio"""
+    while True:
+        try:
+            target, message = await asyncio.wait_for(network.get(), 0.1)
+        except asyncio.TimeoutError:
+            return
+        if target in nodes:
+            await nodes[target].routing_algorithm.handle_message_async(message)
+
+
+def lsa(origin, neighbors, seq):
+    return {"type": "lsa", "from": origin, "neighbors": neighbors, "seq": seq, "id": f"{origin}_{seq}"}
+
+
+def test_restored_lsdb_is_revalidated_by_the_digest_exchange():
+    async def scenario():
+        network = asyncio.Queue()
+        b = LSRNode("b", {"a": 1, "c": 2}, network)
+        b.routing_algorithm.lsdb = {
+            "b": lsa("b", {"a": 1, "c": 2}, 4),   # cambió mientras "a" estaba caído
+            "c": lsa("c", {"b": 2}, 5),           # sin cambios
+        }
+
+        # Checkpoint de "a" antes de caerse
+        old = LSRNode("a", {"b": 1}, asyncio.Queue())
+        old.routing_algorithm.lsdb = {
+            "a": lsa("a", {"b": 1}, 1),
+            "b": lsa("b", {"a": 1}, 3),
+            "c": lsa("c", {"b": 2}, 5),
+        }
+        old.routing_algorithm.topology = {o: dict(l["neighbors"]) for o, l in old.routing_algorithm.lsdb.items()}
+        state = old.routing_algorithm.export_state()
+        assert "a" not in state["lsdb"]
+
+        a = LSRNode("a", {"b": 1}, network)
+        a.routing_algorithm.import_state(state)
+        assert a.routing_algorithm.stale_origins == {"b", "c"}
+
+        await a.routing_algorithm.send_dbd("b")
+        await deliver({"a": a, "b": b}, network)
+
+        router = a.routing_algorithm
+        assert router._lsa_seq(router.lsdb["b"]) == 4
+        assert router._lsa_seq(router.lsdb["c"]) == 5
+        assert router.stale_origins == set()
+
+        router.purge_stale()
+        assert set(router.lsdb) == {"b", "c"}
+
+        for node in (a, b, old):
+            node.scheduler.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,37 @@
+import asyncio
+
+from src.network.rate_limiter import NeighborSendQueue
+
+
+def test_queued_send_reports_the_publish_result():
+    async def scenario():
+        async def publish(message, neighbor_id):
+            return message["payload"] != "nadie escucha"
+
+        queue = NeighborSendQueue("b", publish, rate=1000, burst=10)
+        loop = asyncio.get_running_loop()
+        delivered, unreceived = loop.create_future(), loop.create_future()
+        assert queue.enqueue({"type": "message", "payload": "ok"}, delivered)
+        assert queue.enqueue({"type": "message", "payload": "nadie escucha"}, unreceived)
+
+        assert await asyncio.wait_for(delivered, 1) is True
+        assert await asyncio.wait_for(unreceived, 1) is False
+        queue.close()
+
+    asyncio.run(scenario())
+
+
+def test_closing_the_queue_fails_pending_sends():
+    async def scenario():
+        async def publish(message, neighbor_id):
+            return True
+
+        # Sin tokens: el mensaje queda en la cola hasta que se cierra
+        queue = NeighborSendQueue("b", publish, rate=0.001, burst=1)
+        queue.bucket.tokens = 0
+        pending = asyncio.get_running_loop().create_future()
+        queue.enqueue({"type": "message", "payload": "x"}, pending)
+        queue.close()
+        assert pending.result() is False
+
+    asyncio.run(scenario())
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+
+import pytest
+
+from src.algorithms.planb import SimpleLSR as PlanBLSR
+from src.algorithms.simple_slr import SimpleLSR
+from src.network.scheduler import Scheduler
+
+
+class ReloadNode:
+    """Lo mínimo de RedisNode para ver qué envía el algoritmo"""
+
+    def __init__(self, node_id, neighbors, routing_algorithm):
+        self.node_id = node_id
+        self.neighbors = dict(neighbors)
+        self.logger = logging.getLogger(node_id)
+        self.scheduler = Scheduler(self.logger)
+        self.routing_table = {node_id: {n: {"weight": c} for n, c in neighbors.items()}}
+        self.sent = []
+        self.routing_algorithm = routing_algorithm
+        routing_algorithm.set_node(self)
+
+    def spawn(self, coro, name=None):
+        return self.scheduler.spawn(coro, name)
+
+    def get_link_cost(self, neighbor_id):
+        return self.neighbors[neighbor_id]
+
+    async def send_message(self, message, neighbor_id):
+        self.sent.append((neighbor_id, message))
+        return True
+
+    async def flood_message(self, message, exclude_neighbor=None, neighbors=None):
+        for neighbor_id in self.neighbors:
+            if neighbor_id != exclude_neighbor:
+                await self.send_message(message, neighbor_id)
+
+
+@pytest.mark.parametrize("algorithm", [SimpleLSR, PlanBLSR])
+def test_hello_from_removed_neighbor_does_not_restore_the_edge(algorithm):
+    async def scenario():
+        node = ReloadNode("a", {"b": 1, "c": 2}, algorithm())
+
+        # Recarga en caliente que quita el enlace a-c (lo que hace RedisNode.apply_neighbors)
+        del node.neighbors["c"]
+        del node.routing_table["a"]["c"]
+        node.routing_algorithm.on_neighbors_changed({}, ["c"], {})
+        await asyncio.sleep(0)
+        node.sent.clear()
+
+        # "c" todavía no recargó su topología y manda un hello
+        node.routing_algorithm.handle_message({"type": "hello", "from": "c", "to": "a", "hops": 2})
+        await asyncio.sleep(0)
+
+        assert "c" not in node.routing_table["a"]
+        assert node.sent == []
+        node.scheduler.shutdown()
+
+    asyncio.run(scenario())
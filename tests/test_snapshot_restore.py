@@ -0,0 +1,56 @@
+import asyncio
+import logging
+
+from src.algorithms.link_state import LinkStateRouter
+from src.algorithms.simple_slr import SimpleLSR
+from src.network.scheduler import Scheduler
+from src.network.snapshot import SNAPSHOT_VERSION, SnapshotManager, algorithm_name, write_snapshot
+
+
+class SnapshotNode:
+    """Lo mínimo de RedisNode para SnapshotManager"""
+
+    def __init__(self, node_id, routing_algorithm):
+        self.node_id = node_id
+        self.neighbors = {"b": 1}
+        self.logger = logging.getLogger(node_id)
+        self.scheduler = Scheduler(self.logger)
+        self.routing_table = {node_id: {"b": {"weight": 1}}}
+        self.routing_algorithm = routing_algorithm
+        routing_algorithm.set_node(self)
+
+
+def test_snapshot_from_another_algorithm_starts_cold(tmp_path):
+    async def scenario():
+        writer = SnapshotNode("a", SimpleLSR())
+        writer.routing_table["b"] = {"c": {"weight": 2}}
+        await SnapshotManager(writer, str(tmp_path)).checkpoint()
+
+        # Mismo --snapshot-dir, otro -a
+        node = SnapshotNode("a", LinkStateRouter())
+        assert SnapshotManager(node, str(tmp_path)).restore() is False
+        assert "b" not in node.routing_algorithm.topology
+
+        # Mismo algoritmo: se restaura
+        same = SnapshotNode("a", SimpleLSR())
+        assert SnapshotManager(same, str(tmp_path)).restore() is True
+        assert same.routing_table["b"]["c"]["stale"]
+
+        for n in (writer, node, same):
+            n.scheduler.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_unreadable_routing_state_starts_cold(tmp_path):
+    node = SnapshotNode("a", SimpleLSR())
+    manager = SnapshotManager(node, str(tmp_path))
+    write_snapshot(manager.path, {
+        "version": SNAPSHOT_VERSION,
+        "node_id": "a",
+        "algorithm": algorithm_name(node.routing_algorithm),
+        "saved_at": 0,
+        "routing": {"routing_table": {"b": {"c": {"cost": 2}}}}
+    })
+    assert manager.restore() is False
+    assert not node.routing_table.get("b")
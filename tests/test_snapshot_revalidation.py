@@ -0,0 +1,77 @@
+import asyncio
+import logging
+
+from src.algorithms.simple_slr import SimpleLSR
+from src.network.scheduler import Scheduler
+
+
+class LoopbackNode:
+    """Lo mínimo de RedisNode para SimpleLSR; los envíos van a una cola compartida"""
+
+    def __init__(self, node_id, neighbors, network):
+        self.node_id = node_id
+        self.neighbors = dict(neighbors)
+        self.network = network
+        self.logger = logging.getLogger(node_id)
+        self.scheduler = Scheduler(self.logger)
+        self.routing_table = {node_id: {n: {"weight": c, "time": 15} for n, c in neighbors.items()}}
+        self.routing_algorithm = SimpleLSR()
+        self.routing_algorithm.set_node(self)
+
+    def spawn(self, coro, name=None):
+        return self.scheduler.spawn(coro, name)
+
+    def get_link_cost(self, neighbor_id):
+        return self.neighbors[neighbor_id]
+
+    async def send_message(self, message, neighbor_id):
+        self.network.put_nowait((neighbor_id, {**message, "via": self.node_id}))
+        return True
+
+    async def flood_message(self, message, exclude_neighbor=None, neighbors=None):
+        for neighbor_id in self.neighbors:
+            if neighbor_id != exclude_neighbor:
+                await self.send_message(message, neighbor_id)
+
+
+async def deliver(nodes, network):
+    """Entregar mensajes hasta que la red quede en silencio"""
+    while True:
+        try:
+            target, message = await asyncio.wait_for(network.get(), 0.1)
+        except asyncio.TimeoutError:
+            return
+        router = nodes[target].routing_algorithm
+        if message["via"] in nodes[target].neighbors:
+            router.on_neighbor_activity(message["via"])
+        router.handle_message(message)
+
+
+def test_restored_edges_revalidated_by_neighbors_are_not_purged():
+    async def scenario():
+        network = asyncio.Queue()
+        a = LoopbackNode("a", {"b": 1}, network)
+        b = LoopbackNode("b", {"a": 1, "c": 2}, network)
+        nodes = {"a": a, "b": b}
+        b.routing_table["c"] = {"b": {"weight": 2}}
+
+        # "a" reinicia con un snapshot: una arista real y una que ya no existe
+        a.routing_algorithm.import_state({"routing_table": {
+            "b": {"c": {"weight": 2}},
+            "x": {"y": {"weight": 7}}
+        }})
+        assert a.routing_table["b"]["c"].get("stale")
+
+        # Primer mensaje del vecino (ej. su hello) -> sync_request -> aristas de b
+        await b.send_message({"type": "hello", "from": "b", "to": "a", "hops": 1}, "a")
+        await deliver(nodes, network)
+
+        a.routing_algorithm.purge_stale()
+        assert a.routing_table["b"]["c"] == {"weight": 2}
+        assert a.routing_table["c"]["b"] == {"weight": 2}
+        assert "y" not in a.routing_table["x"]
+
+        for node in nodes.values():
+            node.scheduler.shutdown()
+
+    asyncio.run(scenario())
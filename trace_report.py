@@ -0,0 +1,69 @@
+import argparse
+import fileinput
+import json
+from collections import defaultdict
+
+from src.utils.stats import summarize
+from src.utils.tracing import TRACE_PREFIX
+
+
+def load_traces(files):
+    """Extraer los resúmenes TRACE de los logs de los nodos"""
+    traces = []
+    for line in fileinput.input(files or ['-']):
+        index = line.find(TRACE_PREFIX)
+        if index < 0:
+            continue
+        try:
+            traces.append(json.loads(line[index + len(TRACE_PREFIX):]))
+        except json.JSONDecodeError:
+            continue
+    return traces
+
+
+def aggregate(traces):
+    """Distribuciones de latencia por nodo (dentro del nodo) y por enlace (tránsito)"""
+    queue = defaultdict(list)
+    transit = defaultdict(list)
+    total = []
+    for trace in traces:
+        total.append(trace["total_ms"])
+        for hop in trace["hops"]:
+            if hop.get("queue_ms") is not None:
+                queue[hop["node"]].append(hop["queue_ms"])
+            if hop.get("transit_ms") is not None:
+                transit[f"{hop['node']} -> {hop['next']}"].append(hop["transit_ms"])
+    return {
+        "messages": len(traces),
+        "end_to_end_ms": summarize(total),
+        "queue_ms": {node: summarize(values) for node, values in queue.items()},
+        "transit_ms": {link: summarize(values) for link, values in transit.items()}
+    }
+
+
+def print_table(title, rows):
+    print(f"\n{title}")
+    print(f"{'':40} {'n':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for name, s in sorted(rows.items(), key=lambda item: -(item[1].get("p99") or 0)):
+        print(f"{name:40} {s['count']:>6} {s['p50']:>9.3f} {s['p90']:>9.3f} {s['p99']:>9.3f} {s['max']:>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resumen de latencia por salto de mensajes trazados')
+    parser.add_argument('logs', nargs='*', help='Logs de los nodos (stdin por defecto)')
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    report = aggregate(load_traces(args.logs))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Mensajes trazados: {report['messages']}")
+    print(f"Extremo a extremo: {report['end_to_end_ms']}")
+    print_table("Tiempo dentro de cada nodo (ms)", report["queue_ms"])
+    print_table("Tránsito por enlace (ms)", report["transit_ms"])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+import argparse
+import asyncio
+import fnmatch
+import os
+import time
+
+import redis.asyncio as redis
+from redis.asyncio.cluster import RedisCluster
+from dotenv import load_dotenv
+
+from src.network.cluster import ShardedPubSub, shard_channel, ssubscribe_channels
+from src.utils.capture import CaptureWriter, read_capture, parse_renames, rename_channel
+from src.utils.config_loader import load_config
+
+load_dotenv()
+
+
+def connect():
+    return redis.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        password=os.getenv("REDIS_PASSWORD")
+    )
+
+
+async def connect_cluster():
+    cluster = RedisCluster(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        password=os.getenv("REDIS_PASSWORD")
+    )
+    await cluster.initialize()
+    return cluster
+
+
+async def pattern_messages(r, patterns):
+    """(canal, datos) de lo publicado con PUBLISH; None cada segundo sin tráfico"""
+    async with r.pubsub() as pubsub:
+        await pubsub.psubscribe(*patterns)
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if message and message["type"] == "pmessage":
+                yield message["channel"], message["data"]
+            else:
+                yield None
+
+
+async def shard_messages(cluster, channels, password):
+    """
+    (canal, datos) de lo publicado con SPUBLISH. PSUBSCRIBE no ve los
+    mensajes por shard, así que se hace SSUBSCRIBE a cada canal explícito.
+    """
+    subscriptions = await ssubscribe_channels(cluster, channels, password)
+    queue = asyncio.Queue()
+
+    async def read(pubsub):
+        while True:
+            response = await pubsub.parse_response(block=False, timeout=1.0)
+            if response and response[0] in (b"smessage", "smessage"):
+                queue.put_nowait((response[1], response[2]))
+
+    readers = [asyncio.create_task(read(pubsub)) for _, pubsub in subscriptions]
+    try:
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                yield None
+    finally:
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+        for client, pubsub in subscriptions:
+            await pubsub.aclose() if hasattr(pubsub, "aclose") else await pubsub.close()
+            await client.close()
+
+
+async def capture(args):
+    """Grabar todo lo publicado en los canales que coinciden con el patrón"""
+    if args.cluster:
+        # En cluster los canales llevan hash tag: se sacan de los nodos de la topología
+        nodes = [
+            node for node in load_config(args.config)["config"]
+            if any(fnmatch.fnmatchcase(node, pattern) for pattern in args.pattern)
+        ]
+        if not nodes:
+            print(f"Ningún nodo de {args.config} coincide con {args.pattern}")
+            return
+        r = await connect_cluster()
+        messages = shard_messages(r, [shard_channel(node) for node in nodes], os.getenv("REDIS_PASSWORD"))
+        target = f"{len(nodes)} canales por shard"
+    else:
+        r = connect()
+        messages = pattern_messages(r, args.pattern)
+        target = str(args.pattern)
+
+    writer = CaptureWriter(args.file)
+    deadline = time.monotonic() + args.duration if args.duration else None
+    last_flush = time.monotonic()
+
+    print(f"Capturando {target} en {args.file} (Ctrl+C para terminar)")
+    try:
+        async for message in messages:
+            if message:
+                writer.write(time.time_ns(), *message)
+
+            if time.monotonic() - last_flush >= 1.0:
+                writer.flush()
+                last_flush = time.monotonic()
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        await messages.aclose()
+        writer.close()
+        await r.close()
+
+    print(f"{writer.records} mensajes capturados")
+
+
+async def replay(args):
+    """Publicar una captura a 1x, Nx o a máxima velocidad (--speed 0)"""
+    if args.cluster:
+        # En cluster cada mensaje va con SPUBLISH a su shard, sin pipeline
+        r = await connect_cluster()
+        publish = ShardedPubSub(r, os.getenv("REDIS_PASSWORD")).publish
+        pipe = None
+    else:
+        r = connect()
+        publish = r.publish
+        pipe = r.pipeline(transaction=False)
+    renames = parse_renames(args.rename)
+    records = read_capture(args.file)
+
+    sent = 0
+    max_lag = 0.0
+    first_ts = None
+    started = time.monotonic()
+
+    for timestamp_ns, channel, data in records:
+        channel = rename_channel(channel, renames)
+
+        if args.speed > 0:
+            if first_ts is None:
+                first_ts = timestamp_ns
+            target = started + (timestamp_ns - first_ts) / 1e9 / args.speed
+            delay = target - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+            await publish(channel, data)
+        elif pipe is None:
+            await publish(channel, data)
+        else:
+            # Máxima velocidad: publicar en lotes por pipeline
+            pipe.publish(channel, data)
+            if len(pipe) >= args.batch:
+                await pipe.execute()
+        sent += 1
+
+    if pipe is not None and len(pipe):
+        await pipe.execute()
+    await r.close()
+
+    elapsed = time.monotonic() - started
+    rate = sent / elapsed if elapsed > 0 else 0.0
+    print(f"{sent} mensajes reproducidos en {elapsed:.2f}s ({rate:.0f} msg/s, retraso máximo {max_lag * 1000:.1f} ms)")
+
+
+def info(args):
+    """Resumen de una captura: mensajes, duración y mensajes por canal"""
+    count = 0
+    first = last = None
+    per_channel = {}
+    for timestamp_ns, channel, data in read_capture(args.file):
+        count += 1
+        first = timestamp_ns if first is None else first
+        last = timestamp_ns
+        per_channel[channel] = per_channel.get(channel, 0) + 1
+
+    duration = (last - first) / 1e9 if count else 0.0
+    print(f"{count} mensajes en {duration:.3f}s")
+    for channel, n in sorted(per_channel.items(), key=lambda item: -item[1]):
+        print(f"  {channel.decode(errors='replace')}: {n}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Captura y reproducción de tráfico Redis')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    cap = sub.add_parser('capture', help='Grabar mensajes publicados')
+    cap.add_argument('file', help='Archivo de captura (se agrega al final)')
+    cap.add_argument('--pattern', '-p', nargs='+', default=['sec30.*'], help='Patrones de PSUBSCRIBE')
+    cap.add_argument('--duration', '-d', type=float, default=None, help='Segundos a capturar')
+    cap.add_argument('--cluster', action='store_true',
+                     default=os.getenv("REDIS_CLUSTER", "").lower() in ("1", "true"),
+                     help='Redis Cluster: SSUBSCRIBE a los canales de los nodos de --config que coinciden con --pattern')
+    cap.add_argument('--config', default='config/topo-redis-test.json',
+                     help='Topología con los nodos a capturar en modo cluster')
+
+    rep = sub.add_parser('replay', help='Reproducir una captura')
+    rep.add_argument('file', help='Archivo de captura')
+    rep.add_argument('--speed', '-s', type=float, default=1.0,
+                     help='Multiplicador de velocidad (1 = tiempo real, 0 = máxima velocidad)')
+    rep.add_argument('--rename', '-r', nargs='*', default=[],
+                     help='Renombrar canales por prefijo, ej: sec30.grupo5.:test.grupo5.')
+    rep.add_argument('--batch', type=int, default=500, help='Tamaño de lote del pipeline a máxima velocidad')
+    rep.add_argument('--cluster', action='store_true',
+                     default=os.getenv("REDIS_CLUSTER", "").lower() in ("1", "true"),
+                     help='Redis Cluster: publicar con SPUBLISH en el shard de cada canal')
+
+    inf = sub.add_parser('info', help='Resumen de una captura')
+    inf.add_argument('file', help='Archivo de captura')
+
+    args = parser.parse_args()
+    if args.command == 'capture':
+        asyncio.run(capture(args))
+    elif args.command == 'replay':
+        asyncio.run(replay(args))
+    else:
+        info(args)
+
+
+if __name__ == '__main__':
+    main()